@@ -62,13 +62,12 @@ async def _load_rule_pack(config: CompanyConfig) -> str | None:
             group = resp.json()
             group_id = group["id"]
 
-            # Add each rule
-            for rule in pack["rules"]:
-                resp = await client.post(
-                    f"{config.rule_engine_url}/v1/groups/{group_id}/rules",
-                    json=rule,
-                )
-                resp.raise_for_status()
+            # Add every rule in one atomic bulk request
+            resp = await client.post(
+                f"{config.rule_engine_url}/v1/groups/{group_id}/rules:bulk",
+                json=pack["rules"],
+            )
+            resp.raise_for_status()
 
             logger.info("Loaded rule pack '%s' as group %s with %d rules", pack["name"], group_id, len(pack["rules"]))
             return group_id
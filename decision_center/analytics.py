@@ -0,0 +1,181 @@
+"""Decision analytics rolled up into hourly buckets as decisions are logged.
+
+Each rollup counts one measure per hour and per key:
+
+* ``outcomes``: atomic log decisions by group and agent.
+* ``rules``: rule hits (``matched_details`` of EVALUATION events) by group,
+  rule and hit type (``rule_logic`` or ``edge_case``).
+* ``approvals``: APPROVAL_STATUS results by approver.
+
+Queries sum the hourly counters, so their cost depends on the number of
+buckets and keys in the range, not on the size of the log.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator
+
+from .models import AtomicLogEntry, ChainEvent
+
+# Hourly buckets older than this (relative to the newest) are dropped.
+ANALYTICS_RETENTION_HOURS = int(os.getenv("ANALYTICS_RETENTION_HOURS", "2160"))
+BUCKET_SECONDS = 3600
+# Rollup name -> (key dimensions, measure).  Keys are stored padded to two
+# dimensions so every backend can use the same columns.
+ROLLUPS: dict[str, tuple[tuple[str, ...], str]] = {
+    "outcomes": (("group_id", "agent_id"), "decision"),
+    "rules": (("group_id", "rule_id"), "hit_type"),
+    "approvals": (("approver",), "status"),
+}
+# A decision evaluated against several groups counts once in "outcomes",
+# under its first group, and once per further group in this companion
+# rollup.  Queries by or filtered on group_id read both, so each group sees
+# all of its decisions; any other query still counts a decision once.
+EXTRA_GROUP_ROLLUPS = {"outcomes": "outcomes_extra_groups"}
+GRANULARITIES = {"hour": BUCKET_SECONDS, "day": 86400, "total": None}
+
+RollupKey = tuple[Any, Any, Any]
+
+
+def bucket_of(timestamp: datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    seconds = int(timestamp.timestamp())
+    return seconds - seconds % BUCKET_SECONDS
+
+
+def atomic_rollups(entry: AtomicLogEntry) -> Iterator[tuple[str, int, RollupKey]]:
+    bucket = bucket_of(entry.timestamp)
+    decision = entry.decision.value
+    yield "outcomes", bucket, (entry.effective_group_id, entry.agent_id, decision)
+    for group_id in dict.fromkeys(entry.effective_group_ids or []):
+        if group_id != entry.effective_group_id:
+            yield EXTRA_GROUP_ROLLUPS["outcomes"], bucket, (group_id, entry.agent_id, decision)
+
+
+def event_rollups(event: ChainEvent) -> Iterator[tuple[str, int, RollupKey]]:
+    details = event.details
+    if event.event_type == "EVALUATION":
+        bucket = bucket_of(event.timestamp)
+        for detail in details.get("matched_details") or []:
+            yield "rules", bucket, (detail.get("group_id"), detail.get("rule_id"), detail.get("hit_type"))
+    elif event.event_type == "APPROVAL_STATUS":
+        yield "approvals", bucket_of(event.timestamp), (details.get("approver"), None, details.get("status"))
+
+
+def bucket_range(since: datetime | None, until: datetime | None) -> tuple[int | None, int | None]:
+    """Buckets overlapping ``[since, until]``; either end may be open."""
+    return (
+        bucket_of(since) if since is not None else None,
+        bucket_of(until) if until is not None else None,
+    )
+
+
+def check_query(rollup: str, by: Iterable[str] | None, granularity: str, filters: dict[str, Any]) -> list[str]:
+    """Validate a rollup query and return the dimensions to group by."""
+    if rollup not in ROLLUPS:
+        raise ValueError(f"Unknown rollup {rollup!r}; expected one of {', '.join(ROLLUPS)}")
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity {granularity!r}; expected one of {', '.join(GRANULARITIES)}")
+    dims = ROLLUPS[rollup][0]
+    by = list(dims if by is None else by)
+    unknown = (set(by) | {field for field, value in filters.items() if value is not None}) - set(dims)
+    if unknown:
+        raise ValueError(f"Unsupported dimension(s) for {rollup}: {', '.join(sorted(unknown))}")
+    return by
+
+
+def rollup_sources(rollup: str, by: list[str], filters: dict[str, Any]) -> list[str]:
+    """Stored rollups a query reads; see ``EXTRA_GROUP_ROLLUPS``."""
+    extra = EXTRA_GROUP_ROLLUPS.get(rollup)
+    if extra is not None and ("group_id" in by or filters.get("group_id") is not None):
+        return [rollup, extra]
+    return [rollup]
+
+
+def summarize(
+    rollup: str,
+    rows: Iterable[tuple[int, RollupKey, int]],
+    by: list[str],
+    granularity: str,
+    filters: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Fold hourly ``(bucket, key, count)`` rows into one row per period and key."""
+    dims = ROLLUPS[rollup][0]
+    positions = {dim: i for i, dim in enumerate(dims)}
+    filters = {positions[field]: value for field, value in filters.items() if value is not None}
+    period = GRANULARITIES[granularity]
+    totals: dict[tuple, dict[Any, int]] = defaultdict(lambda: defaultdict(int))
+    for bucket, key, count in rows:
+        if any(key[i] != value for i, value in filters.items()):
+            continue
+        start = bucket - bucket % period if period else None
+        totals[(start, *(key[positions[dim]] for dim in by))][key[2]] += count
+
+    def order(item):
+        return tuple((value is not None, value if value is not None else 0) for value in item[0])
+
+    result = []
+    for group, counts in sorted(totals.items(), key=order):
+        start, values = group[0], group[1:]
+        result.append({
+            "bucket": datetime.fromtimestamp(start, timezone.utc).isoformat() if start is not None else None,
+            **dict(zip(by, values)),
+            "counts": {str(value): count for value, count in counts.items()},
+            "total": sum(counts.values()),
+        })
+    return result
+
+
+class Rollups:
+    """In-memory hourly counters for ``DecisionStore``."""
+
+    def __init__(self, retention_hours: int = ANALYTICS_RETENTION_HOURS):
+        self.retention_hours = retention_hours
+        self.buckets: dict[str, dict[int, dict[RollupKey, int]]] = {
+            name: {} for name in (*ROLLUPS, *EXTRA_GROUP_ROLLUPS.values())
+        }
+        self._newest: int | None = None
+
+    def add(self, rollups: Iterable[tuple[str, int, RollupKey]]) -> None:
+        for name, bucket, key in rollups:
+            if self._newest is None or bucket > self._newest:
+                self._newest = bucket
+                self._prune()
+            elif self.retention_hours > 0 and bucket < self._newest - self.retention_hours * BUCKET_SECONDS:
+                continue
+            counters = self.buckets[name].setdefault(bucket, {})
+            counters[key] = counters.get(key, 0) + 1
+
+    def _prune(self) -> None:
+        if self.retention_hours <= 0:
+            return
+        cutoff = self._newest - self.retention_hours * BUCKET_SECONDS
+        for buckets in self.buckets.values():
+            for bucket in [bucket for bucket in buckets if bucket < cutoff]:
+                del buckets[bucket]
+
+    def rows(self, rollup: str, first: int | None, last: int | None) -> Iterator[tuple[int, RollupKey, int]]:
+        for bucket, counters in self.buckets[rollup].items():
+            if (first is None or bucket >= first) and (last is None or bucket <= last):
+                for key, count in counters.items():
+                    yield bucket, key, count
+
+    def to_json(self) -> dict[str, list]:
+        return {
+            name: [[bucket, list(key), count] for bucket, counters in buckets.items() for key, count in counters.items()]
+            for name, buckets in self.buckets.items()
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict[str, list], retention_hours: int = ANALYTICS_RETENTION_HOURS) -> Rollups:
+        rollups = cls(retention_hours)
+        for name, rows in payload.items():
+            for bucket, key, count in rows:
+                counters = rollups.buckets[name].setdefault(bucket, {})
+                counters[tuple(key)] = count
+                rollups._newest = bucket if rollups._newest is None else max(rollups._newest, bucket)
+        return rollups
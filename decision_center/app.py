@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import os
+import re
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
 import json
 
 from slowapi import Limiter
@@ -14,11 +16,14 @@ from slowapi.errors import RateLimitExceeded
 
 from .models import (
     DecisionOutcome, DecisionState, EvaluateRequest, DecisionResult,
-    ApprovalSubmission, AtomicLogEntry, DecisionChain, LLMConnectionRequest, RuleTranslationRequest,
+    BatchEvaluateRequest, BatchDecisionItem, BatchDecisionResult,
+    ApprovalSubmission, BatchApprovalSubmission, BatchApprovalItem, BatchApprovalResult, AtomicLogEntry, ChainEvent, DecisionChain, LLMConnectionRequest, RuleTranslationRequest,
     SchemaGenerationRequest, SchemaSaveRequest,
 )
-from .store import DecisionStore
-from .evaluator import evaluate_request, close_http_client
+from .store import create_decision_store
+from .export import stream_export
+from .events import ApprovalWaiters, EventBroker, sse_stream
+from .evaluator import evaluate_loaded_groups, group_versions, load_compiled_group, close_http_client
 from .translator import check_llm_connection_async, translate_rule_async, SchemaConceptMismatchError
 from .schema_generator import generate_schema, list_schemas, save_schema, SchemaProposal, SchemaExistsError
 from shared.middleware import InternalAuthMiddleware, check_production_api_key
@@ -41,6 +46,7 @@ limiter = Limiter(key_func=_get_real_client_ip, enabled=os.getenv("ENVIRONMENT")
 @asynccontextmanager
 async def _lifespan(app: FastAPI):
     yield
+    await store.aclose()
     await close_http_client()
 
 
@@ -58,10 +64,21 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 app.add_middleware(InternalAuthMiddleware)
 
-store = DecisionStore()
+store = create_decision_store()
+events = EventBroker()
+approval_waiters = ApprovalWaiters()
+
+MAX_DECIDE_BATCH_SIZE = int(os.getenv("MAX_DECIDE_BATCH_SIZE", "100"))
+MAX_APPROVAL_BATCH_SIZE = int(os.getenv("MAX_APPROVAL_BATCH_SIZE", "1000"))
+MAX_LOG_PAGE_SIZE = int(os.getenv("MAX_LOG_PAGE_SIZE", "1000"))
+MAX_APPROVAL_WAIT_SECONDS = float(os.getenv("MAX_APPROVAL_WAIT_SECONDS", "120"))
+# How often a waiter re-checks the store, so approvals submitted to another
+# worker (shared SQLite backend) are noticed too.
+APPROVAL_WAIT_POLL_SECONDS = float(os.getenv("APPROVAL_WAIT_POLL_SECONDS", "1"))
 
 
 def _outcome_to_state(outcome: DecisionOutcome) -> DecisionState:
@@ -73,13 +90,93 @@ def _outcome_to_state(outcome: DecisionOutcome) -> DecisionState:
 
 
 async def _evaluate_and_log(req: EvaluateRequest) -> DecisionResult:
-    outcome, matched_rules, matched_details = await evaluate_request(req.context, req.group_id, req.rule_id)
+    loaded = await asyncio.gather(*(load_compiled_group(group_id) for group_id in req.resolved_group_ids()))
+    result = _decide_loaded(req, loaded)
+    await store.commit()
+    return result
+
+
+def _decide_loaded(req: EvaluateRequest, loaded: list) -> DecisionResult:
+    """Evaluate and log *req* against its ``load_compiled_group`` results."""
+    if not loaded:
+        # Default behavior: execute without rules
+        return _log_decision(req, DecisionOutcome.APPROVE, [], [], [])
+    outcome, matched_rules, matched_details = evaluate_loaded_groups(req.context, loaded, req.rule_id)
+    return _log_decision(req, outcome, matched_rules, matched_details, group_versions(loaded))
+
+
+def _log_atomic(entry: AtomicLogEntry) -> None:
+    store.log_atomic(entry)
+    events.publish("atomic_log", entry)
+
+
+def _log_chain_event(request_id: str, event_type: str, details: dict) -> ChainEvent:
+    event = store.log_chain_event(request_id, event_type, details=details)
+    events.publish("chain_event", DecisionChain(request_id=request_id, events=[event]))
+    return event
+
+
+def _add_pending(request_id: str, context: dict) -> None:
+    store.add_pending(request_id, context)
+    events.publish("pending_added", {"request_id": request_id, **context})
+    _sweep_pending()
+
+
+def _record_resolution(request_id: str, pending: dict, status: str, approver: str | None, **extra) -> ChainEvent:
+    """Log the outcome of a pending approval and wake anyone waiting on it."""
+    events.publish("pending_resolved", {"request_id": request_id, "status": status})
+    identity = {
+        "agent_id": pending.get("agent_id"),
+        "credential_id": pending.get("credential_id"),
+        "user_id": pending.get("user_id"),
+        "effective_group_id": pending.get("effective_group_id"),
+        "effective_group_ids": pending.get("effective_group_ids"),
+    }
+    approval_event = _log_chain_event(request_id, "APPROVAL_STATUS", details={
+        "status": status,
+        "approver": approver,
+        **extra,
+        **identity,
+    })
+    _log_atomic(AtomicLogEntry(
+        request_id=request_id,
+        request_description=pending.get("description", ""),
+        context=pending.get("context", {}),
+        decision=DecisionState.APPROVED if status == "APPROVED" else DecisionState.REJECTED,
+        **identity,
+    ))
+    approval_waiters.resolve(request_id, approval_event)
+    return approval_event
+
+
+def _sweep_pending() -> None:
+    """Expire (fail closed) and escalate pending approvals that are due."""
+    expired, escalated = store.sweep_pending()
+    for pending in expired:
+        _record_resolution(pending["request_id"], pending, "EXPIRED", None, reason=pending["expiry_reason"])
+    for pending in escalated:
+        _log_chain_event(pending["request_id"], "ESCALATED", details={
+            "escalated_at": pending["escalated_at"],
+            "agent_id": pending.get("agent_id"),
+            "user_id": pending.get("user_id"),
+            "effective_group_id": pending.get("effective_group_id"),
+        })
+        events.publish("pending_escalated", pending)
+
+
+def _log_decision(
+    req: EvaluateRequest,
+    outcome: DecisionOutcome,
+    matched_rules: list[str],
+    matched_details: list[dict],
+    versions: list[dict],
+) -> DecisionResult:
     req_id = str(uuid.uuid4())
     state = _outcome_to_state(outcome)
 
     identity = req.identity_dict()
 
-    store.log_atomic(AtomicLogEntry(
+    _log_atomic(AtomicLogEntry(
         request_id=req_id,
         request_description=req.request_description,
         context=req.context,
@@ -87,22 +184,24 @@ async def _evaluate_and_log(req: EvaluateRequest) -> DecisionResult:
         **identity,
     ))
 
-    store.log_chain_event(req_id, "REQUEST", details={
+    _log_chain_event(req_id, "REQUEST", details={
         "description": req.request_description,
         "context": req.context,
         **identity,
     })
-    store.log_chain_event(req_id, "EVALUATION", details={
+    _log_chain_event(req_id, "EVALUATION", details={
         "outcome": outcome.value,
         "matched_rules": matched_rules,
         "matched_details": matched_details,
+        "group_versions": versions,
         **identity,
     })
 
     if state == DecisionState.APPROVAL_REQUIRED:
-        store.add_pending(req_id, {
+        _add_pending(req_id, {
             "description": req.request_description,
             "context": req.context,
+            "created_at": datetime.now(timezone.utc).isoformat(),
             **identity,
         })
 
@@ -111,6 +210,7 @@ async def _evaluate_and_log(req: EvaluateRequest) -> DecisionResult:
         outcome=outcome,
         matched_rules=matched_rules,
         matched_details=matched_details,
+        group_versions=versions,
         **identity,
     )
 
@@ -118,6 +218,10 @@ async def _evaluate_and_log(req: EvaluateRequest) -> DecisionResult:
 async def health():
     return {"status": "ok", "service": "decision_center"}
 
+@app.get("/v1/metrics/persistence")
+async def persistence_metrics():
+    return store.flush_stats()
+
 @app.get("/v1/decide", response_model=DecisionResult)
 @limiter.limit("60/minute")
 async def evaluate(request: Request, request_description: str, context: str, group_id: str = None, rule_id: str = None):
@@ -138,59 +242,242 @@ async def evaluate(request: Request, request_description: str, context: str, gro
 async def evaluate_post(request: Request, req: EvaluateRequest):
     return await _evaluate_and_log(req)
 
+async def _load_group_for_batch(group_id: str):
+    try:
+        return await load_compiled_group(group_id)
+    except ValueError as exc:
+        return exc
+
+
+def _evaluate_batch_item(req: EvaluateRequest, groups: dict) -> DecisionResult:
+    loaded = [groups[group_id] for group_id in req.resolved_group_ids()]
+    for entry in loaded:
+        if isinstance(entry, Exception):
+            raise entry
+    return _decide_loaded(req, loaded)
+
+
+@app.post("/v1/decide/batch", response_model=BatchDecisionResult)
+@limiter.limit("60/minute")
+async def evaluate_batch(request: Request, batch: BatchEvaluateRequest):
+    """Evaluate several requests with one group fetch per group and one store flush."""
+    if len(batch.items) > MAX_DECIDE_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch exceeds maximum size of {MAX_DECIDE_BATCH_SIZE} items",
+        )
+
+    group_ids = sorted({group_id for item in batch.items for group_id in item.resolved_group_ids()})
+    loaded = await asyncio.gather(*(_load_group_for_batch(group_id) for group_id in group_ids))
+    groups = dict(zip(group_ids, loaded))
+
+    results = []
+    with store.batch():
+        for index, item in enumerate(batch.items):
+            try:
+                results.append(BatchDecisionItem(index=index, result=_evaluate_batch_item(item, groups)))
+            except ValueError as exc:
+                results.append(BatchDecisionItem(index=index, error=str(exc)))
+            except Exception:
+                logger.exception("Batch decide item %d failed", index)
+                results.append(BatchDecisionItem(index=index, error="Internal processing error"))
+    await store.commit()
+    return BatchDecisionResult(results=results)
+
 @app.get("/v1/pending", response_model=List[dict])
-async def get_pending():
-    return store.get_pending()
+async def get_pending(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LOG_PAGE_SIZE),
+    agent_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+):
+    _sweep_pending()
+    await store.commit()
+    if not any((cursor, limit, agent_id, user_id, group_id)):
+        return store.get_pending()
+    try:
+        items, next_cursor = store.query_pending(
+            cursor=cursor, limit=limit, agent_id=agent_id, user_id=user_id, group_id=group_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
-@app.post("/v1/decide/{request_id}/approve")
-async def submit_approval(request_id: str, submission: ApprovalSubmission):
-    import re
-    if not re.match(r'^[a-zA-Z0-9_-]+$', request_id):
-        raise HTTPException(status_code=400, detail="Invalid request_id format")
-    if submission.approver and len(submission.approver) > 200:
+_REQUEST_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+def _check_approver(approver: str | None) -> None:
+    if approver and len(approver) > 200:
         raise HTTPException(status_code=400, detail="Approver name too long")
+
+def _resolve_approval(request_id: str, approved: bool, approver: str) -> str:
+    """Resolve one pending approval; raises HTTPException when it cannot be."""
+    if not _REQUEST_ID_PATTERN.match(request_id):
+        raise HTTPException(status_code=400, detail="Invalid request_id format")
     chain = store.get_chain(request_id)
     if not chain:
         raise HTTPException(status_code=404, detail="Decision chain not found")
     
     # Guard against double-approval: pending is removed on first resolution.
     # If it's gone, the request was already approved or rejected.
-    if not store.is_pending(request_id):
+    # resolve_pending is atomic, so with several workers only one of two
+    # concurrent submissions gets the pending entry back.
+    pending = store.resolve_pending(request_id)
+    if pending is None:
         raise HTTPException(status_code=409, detail="Decision already resolved")
 
-    status = "APPROVED" if submission.approved else "REJECTED"
-    pending = store.resolve_pending(request_id) or {}
+    status = "APPROVED" if approved else "REJECTED"
+    _record_resolution(request_id, pending, status, approver)
+    return status
 
-    store.log_chain_event(request_id, "APPROVAL_STATUS", details={
-        "status": status,
-        "approver": submission.approver,
-        "agent_id": pending.get("agent_id"),
-        "credential_id": pending.get("credential_id"),
-        "user_id": pending.get("user_id"),
-        "effective_group_id": pending.get("effective_group_id"),
-    })
-
-    final_decision = DecisionState.APPROVED if submission.approved else DecisionState.REJECTED
-    store.log_atomic(AtomicLogEntry(
-        request_id=request_id,
-        request_description=pending.get("description", ""),
-        context=pending.get("context", {}),
-        decision=final_decision,
-        agent_id=pending.get("agent_id"),
-        credential_id=pending.get("credential_id"),
-        user_id=pending.get("user_id"),
-        effective_group_id=pending.get("effective_group_id"),
-    ))
+@app.post("/v1/decide/{request_id}/approve")
+async def submit_approval(request_id: str, submission: ApprovalSubmission):
+    _check_approver(submission.approver)
+    status = _resolve_approval(request_id, submission.approved, submission.approver)
+    await store.commit()
 
     return {"status": "success", "request_id": request_id, "final_state": status}
 
+@app.post("/v1/pending/approve", response_model=BatchApprovalResult)
+async def submit_batch_approval(submission: BatchApprovalSubmission):
+    """Approve or reject many pending items in one store transaction and flush.
+
+    Items are given as ``request_ids`` or selected by the agent/user/group
+    filters; one of the two is required so an empty body never clears the
+    whole queue.
+    """
+    _check_approver(submission.approver)
+    filters = {"agent_id": submission.agent_id, "user_id": submission.user_id, "group_id": submission.group_id}
+    has_filters = any(value is not None for value in filters.values())
+    if (submission.request_ids is None) == (not has_filters):
+        raise HTTPException(status_code=400, detail="Provide either request_ids or at least one filter")
+
+    _sweep_pending()
+    if submission.request_ids is not None:
+        request_ids = submission.request_ids
+    else:
+        pending, _ = store.query_pending(limit=MAX_APPROVAL_BATCH_SIZE, **filters)
+        request_ids = [item["request_id"] for item in pending]
+    if len(request_ids) > MAX_APPROVAL_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch exceeds maximum size of {MAX_APPROVAL_BATCH_SIZE} items",
+        )
+
+    results = []
+    with store.batch():
+        for request_id in request_ids:
+            try:
+                status = _resolve_approval(request_id, submission.approved, submission.approver)
+            except HTTPException as exc:
+                results.append(BatchApprovalItem(request_id=request_id, status_code=exc.status_code, error=exc.detail))
+                continue
+            results.append(BatchApprovalItem(request_id=request_id, status_code=200, final_state=status))
+    await store.commit()
+    return BatchApprovalResult(results=results)
+
+def _approval_status(request_id: str, chain: DecisionChain) -> dict:
+    for event in reversed(chain.events):
+        if event.event_type == "APPROVAL_STATUS":
+            return {"request_id": request_id, "status": event.details.get("status"), "event": event}
+    return {"request_id": request_id, "status": "PENDING", "event": None}
+
+@app.get("/v1/decide/{request_id}/wait")
+async def wait_for_approval(
+    request_id: str,
+    timeout: float = Query(30, ge=0, le=MAX_APPROVAL_WAIT_SECONDS),
+):
+    """Long-poll until a pending decision is approved or rejected.
+
+    Returns the APPROVAL_STATUS event as soon as ``submit_approval`` records
+    it, or ``status: PENDING`` once *timeout* seconds pass.
+    """
+    if not _REQUEST_ID_PATTERN.match(request_id):
+        raise HTTPException(status_code=400, detail="Invalid request_id format")
+    chain = store.get_chain(request_id)
+    if not chain:
+        raise HTTPException(status_code=404, detail="Decision chain not found")
+    _sweep_pending()
+    await store.commit()
+    if not store.is_pending(request_id):
+        result = _approval_status(request_id, chain)
+        if result["event"] is None:
+            raise HTTPException(status_code=409, detail="Decision does not require approval")
+        return result
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    future = approval_waiters.register(request_id)
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return {"request_id": request_id, "status": "PENDING", "event": None}
+            try:
+                event = await asyncio.wait_for(
+                    asyncio.shield(future), min(remaining, APPROVAL_WAIT_POLL_SECONDS)
+                )
+                # The resolving handler may still be waiting on its commit.
+                await store.commit()
+                return {"request_id": request_id, "status": event.details.get("status"), "event": event}
+            except asyncio.TimeoutError:
+                _sweep_pending()
+                await store.commit()
+                if not store.is_pending(request_id):
+                    return _approval_status(request_id, store.get_chain(request_id) or chain)
+    finally:
+        approval_waiters.discard(request_id, future)
+
+def _paged(response: Response, query, cursor, limit, since, until, **filters):
+    """Run a paginated store query; the next cursor goes in ``X-Next-Cursor``."""
+    try:
+        items, next_cursor = query(cursor=cursor, limit=limit, since=since, until=until, **filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
 @app.get("/v1/logs/atomic", response_model=List[AtomicLogEntry])
-async def get_atomic_logs():
-    return store.get_atomic_logs()
+async def get_atomic_logs(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LOG_PAGE_SIZE),
+    agent_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    effective_group_id: Optional[str] = None,
+    decision: Optional[DecisionState] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    if not any((cursor, limit, agent_id, user_id, effective_group_id, decision, since, until)):
+        return store.get_atomic_logs()
+    return _paged(
+        response, store.query_atomic_logs, cursor, limit, since, until,
+        agent_id=agent_id, user_id=user_id, effective_group_id=effective_group_id,
+        decision=decision.value if decision else None,
+    )
 
 @app.get("/v1/logs/chains", response_model=List[DecisionChain])
-async def get_all_chains():
-    return store.get_all_chains()
+async def get_all_chains(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LOG_PAGE_SIZE),
+    agent_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    effective_group_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    if not any((cursor, limit, agent_id, user_id, effective_group_id, since, until)):
+        return store.get_all_chains()
+    return _paged(
+        response, store.query_chains, cursor, limit, since, until,
+        agent_id=agent_id, user_id=user_id, effective_group_id=effective_group_id,
+    )
 
 @app.get("/v1/logs/chains/{request_id}", response_model=DecisionChain)
 async def get_chain(request_id: str):
@@ -199,12 +486,85 @@ async def get_chain(request_id: str):
         raise HTTPException(status_code=404, detail="Chain not found")
     return chain
 
+def _analytics(rollup: str, by, granularity, since, until, **filters):
+    try:
+        return store.analytics(rollup, by=by, granularity=granularity, since=since, until=until, **filters)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@app.get("/v1/analytics/outcomes", response_model=List[dict])
+async def outcome_analytics(
+    by: Optional[List[str]] = Query(None),
+    granularity: str = Query("hour", pattern="^(hour|day|total)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    group_id: Optional[str] = None,
+    agent_id: Optional[str] = None,
+):
+    """Atomic log decisions per period, counted by group and/or agent (``by``)."""
+    return _analytics("outcomes", by, granularity, since, until, group_id=group_id, agent_id=agent_id)
+
+@app.get("/v1/analytics/rules", response_model=List[dict])
+async def rule_analytics(
+    by: Optional[List[str]] = Query(None),
+    granularity: str = Query("hour", pattern="^(hour|day|total)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    group_id: Optional[str] = None,
+    rule_id: Optional[str] = None,
+):
+    """Rule hits per period, counted by hit type."""
+    return _analytics("rules", by, granularity, since, until, group_id=group_id, rule_id=rule_id)
+
+@app.get("/v1/analytics/approvals", response_model=List[dict])
+async def approval_analytics(
+    granularity: str = Query("hour", pattern="^(hour|day|total)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    approver: Optional[str] = None,
+):
+    """Approval results (APPROVED, REJECTED, EXPIRED) per period and approver."""
+    return _analytics("approvals", None, granularity, since, until, approver=approver)
+
+@app.get("/v1/events/stream")
+async def event_stream(request: Request, last_event_id: Optional[int] = None):
+    """Server-Sent Events feed of atomic logs, chain events and pending-queue changes.
+
+    Resumes after the ``Last-Event-ID`` header (or ``last_event_id`` query
+    parameter) when the missed events are still in the broker's history.
+    """
+    header = request.headers.get("last-event-id")
+    if header is not None:
+        try:
+            last_event_id = int(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    return StreamingResponse(
+        sse_stream(events, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/v1/logs/export")
-async def export_logs():
-    payload = store.data.model_dump(mode="json")
-    filename = f"decision_log_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
-    return JSONResponse(
-        content=payload,
+async def export_logs(
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    gzip: bool = False,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Stream the decision log as one JSON document or as NDJSON records.
+
+    ``gzip=true`` returns a ``.gz`` file rather than a transfer encoding, so
+    downloads stay compressed on disk.
+    """
+    filename = f"decision_log_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.{format}"
+    media_type = "application/json" if format == "json" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        stream_export(store, format, gzip=gzip, since=since, until=until),
+        media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
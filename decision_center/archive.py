@@ -0,0 +1,241 @@
+"""On-disk archive of atomic log entries and chains evicted from memory.
+
+Each kind ("atomic", "chains") is a series of gzip-compressed NDJSON segment
+files, ``<kind>-<n>.ndjson.gz``, appended one gzip member per flush and
+rotated every ``segment_records`` records.  Next to each segment,
+``<kind>-<n>.index.json`` records its size, record count, time range and a
+Bloom filter of its request ids, so lookups only decompress the segments
+that can contain what they are looking for.
+
+Records are buffered and flushed every ``flush_records`` records; reads
+include the buffered ones.  A segment index is written after its data, so
+on open any bytes past the size it records are a torn write and are
+truncated.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from shared.persistence import atomic_write_json
+
+ARCHIVE_KINDS = ("atomic", "chains")
+ARCHIVE_CURSOR_PREFIX = "a"
+_SEGMENT_NAME = re.compile(r"^(atomic|chains)-(\d+)\.ndjson\.gz$")
+_CURSOR = re.compile(rf"^{ARCHIVE_CURSOR_PREFIX}(\d+)\.(\d+)$")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on BLAKE2b)."""
+
+    def __init__(self, bits: int, hashes: int = 7, data: bytes | None = None):
+        self.bits = max(8, bits)
+        self.hashes = hashes
+        self._data = bytearray(data) if data is not None else bytearray((self.bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._data[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_json(self) -> dict[str, Any]:
+        return {"bits": self.bits, "hashes": self.hashes, "data": base64.b64encode(self._data).decode("ascii")}
+
+    @classmethod
+    def from_json(cls, payload: dict[str, Any]) -> BloomFilter:
+        return cls(payload["bits"], payload["hashes"], base64.b64decode(payload["data"]))
+
+
+@dataclass
+class Segment:
+    kind: str
+    number: int
+    path: Path
+    bloom: BloomFilter
+    size: int = 0
+    count: int = 0
+    first_ts: str | None = None
+    last_ts: str | None = None
+    buffer: list[str] = field(default_factory=list)
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(f"{self.kind}-{self.number:08d}.index.json")
+
+    def index_payload(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "count": self.count,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "bloom": self.bloom.to_json(),
+        }
+
+    def overlaps(self, since: datetime | None, until: datetime | None) -> bool:
+        if self.first_ts is None:
+            return False
+        if since is not None and datetime.fromisoformat(self.last_ts) < since:
+            return False
+        return until is None or datetime.fromisoformat(self.first_ts) <= until
+
+    def records(self) -> Iterator[dict[str, Any]]:
+        if self.size:
+            with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+                for line in fh:
+                    yield json.loads(line)
+        for line in self.buffer:
+            yield json.loads(line)
+
+
+def archive_cursor(segment: int, offset: int) -> str:
+    return f"{ARCHIVE_CURSOR_PREFIX}{segment}.{offset}"
+
+
+def parse_archive_cursor(cursor: str | None) -> tuple[int, int] | None:
+    """``(segment, offset)`` for an archive cursor, None for any other cursor."""
+    if cursor is None or not cursor.startswith(ARCHIVE_CURSOR_PREFIX):
+        return None
+    match = _CURSOR.match(cursor)
+    if match is None:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+class SegmentArchive:
+    def __init__(
+        self,
+        directory: str | Path,
+        segment_records: int = 10000,
+        flush_records: int = 256,
+        fsync: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.segment_records = max(1, segment_records)
+        self.flush_records = max(1, flush_records)
+        self.fsync = fsync
+        self.segments: dict[str, list[Segment]] = {kind: [] for kind in ARCHIVE_KINDS}
+        self._counts = dict.fromkeys(ARCHIVE_KINDS, 0)
+        self._open()
+
+    def _open(self) -> None:
+        if not self.directory.exists():
+            return
+        for path in sorted(self.directory.iterdir()):
+            match = _SEGMENT_NAME.match(path.name)
+            if match is None:
+                continue
+            kind, number = match.group(1), int(match.group(2))
+            segment = self._new_segment(kind, number)
+            if segment.index_path.exists():
+                index = json.loads(segment.index_path.read_text(encoding="utf-8"))
+                segment.size, segment.count = index["size"], index["count"]
+                segment.first_ts, segment.last_ts = index["first_ts"], index["last_ts"]
+                segment.bloom = BloomFilter.from_json(index["bloom"])
+            if path.stat().st_size > segment.size:
+                with path.open("r+b") as fh:
+                    fh.truncate(segment.size)
+            self.segments[kind].append(segment)
+            self._counts[kind] += segment.count
+
+    def _new_segment(self, kind: str, number: int) -> Segment:
+        return Segment(
+            kind=kind,
+            number=number,
+            path=self.directory / f"{kind}-{number:08d}.ndjson.gz",
+            bloom=BloomFilter(self.segment_records * 10),
+        )
+
+    def archived(self, kind: str) -> int:
+        """Records archived so far, including those not yet flushed."""
+        return self._counts[kind]
+
+    def append(self, kind: str, request_id: str, timestamp: datetime, record: dict[str, Any]) -> None:
+        segments = self.segments[kind]
+        current = segments[-1] if segments else None
+        if current is None or current.count + len(current.buffer) >= self.segment_records:
+            if current is not None:
+                self._flush_segment(current)
+            current = self._new_segment(kind, current.number + 1 if current else 1)
+            segments.append(current)
+        current.buffer.append(json.dumps(record, separators=(",", ":")))
+        self._counts[kind] += 1
+        current.bloom.add(request_id)
+        stamp = timestamp.isoformat()
+        current.first_ts = current.first_ts or stamp
+        current.last_ts = stamp
+        if len(current.buffer) >= self.flush_records:
+            self._flush_segment(current)
+
+    def flush(self) -> None:
+        for segments in self.segments.values():
+            if segments and segments[-1].buffer:
+                self._flush_segment(segments[-1])
+
+    def _flush_segment(self, segment: Segment) -> None:
+        if not segment.buffer:
+            return
+        data = gzip.compress(("\n".join(segment.buffer) + "\n").encode("utf-8"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with segment.path.open("ab") as fh:
+            fh.write(data)
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+        segment.size += len(data)
+        segment.count += len(segment.buffer)
+        segment.buffer = []
+        atomic_write_json(segment.index_path, segment.index_payload())
+
+    def find(self, kind: str, request_id: str) -> dict[str, Any] | None:
+        """The most recently archived record for *request_id*, if any."""
+        for segment in reversed(self.segments[kind]):
+            if request_id not in segment.bloom:
+                continue
+            found = None
+            for record in segment.records():
+                if record.get("request_id") == request_id:
+                    found = record
+            if found is not None:
+                return found
+        return None
+
+    def scan(
+        self,
+        kind: str,
+        after: tuple[int, int] | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Yield ``(cursor, record)`` after position *after*, oldest first.
+
+        Segments entirely outside ``[since, until]`` are skipped; records in
+        the remaining segments are not filtered by time.
+        """
+        start_segment, start_offset = after or (0, 0)
+        for segment in self.segments[kind]:
+            if segment.number < start_segment:
+                continue
+            if not segment.overlaps(since, until):
+                continue
+            skip = start_offset if segment.number == start_segment else 0
+            for offset, record in enumerate(segment.records(), start=1):
+                if offset > skip:
+                    yield archive_cursor(segment.number, offset), record
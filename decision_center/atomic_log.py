@@ -0,0 +1,166 @@
+"""Column-oriented ring buffer backing the in-memory atomic audit log.
+
+Each entry is spread over parallel columns instead of being kept as an
+``AtomicLogEntry``: timestamps as 64-bit microseconds, decisions as one-byte
+codes, canonical UUID request ids as 16 packed bytes, the low-cardinality
+identity strings (agent, credential, user and group ids) interned, and the
+context held by reference (the interned canonical dict).  Free-form request
+descriptions are stored as given: they are mostly unique, so interning them
+would only pin them in memory.  Appending overwrites the oldest slot once
+the buffer is full, so both append and eviction are O(1).  Entries are
+materialized as pydantic models only when read.
+"""
+
+from __future__ import annotations
+
+import sys
+import uuid
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+from .models import AtomicLogEntry, DecisionState
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_DECISIONS = tuple(DecisionState)
+_DECISION_CODES = {state: code for code, state in enumerate(_DECISIONS)}
+_ID_BYTES = 16
+
+
+def _micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+def _pack_id(request_id: str) -> bytes | None:
+    """16 bytes for a canonical (lower-case, hyphenated) UUID, else None."""
+    try:
+        value = uuid.UUID(request_id)
+    except ValueError:
+        return None
+    return value.bytes if str(value) == request_id else None
+
+
+class AtomicLog:
+    """Fixed-capacity log of atomic entries; sequence numbers start at zero."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        # Sequence numbers of the oldest live entry and of the next append.
+        self.first_seq = 0
+        self.next_seq = 0
+        self._timestamps = array("q")
+        self._decisions = bytearray()
+        self._request_ids = bytearray()
+        # Slot -> request id that is not a canonical UUID (its packed bytes are zero).
+        self._odd_ids: dict[int, str] = {}
+        self._descriptions: list[str] = []
+        self._contexts: list[dict[str, Any]] = []
+        self._agent_ids: list[str | None] = []
+        self._credential_ids: list[str | None] = []
+        self._user_ids: list[str | None] = []
+        self._group_ids: list[str | None] = []
+        self._group_lists: list[tuple[str, ...] | None] = []
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    def __iter__(self) -> Iterator[AtomicLogEntry]:
+        for seq in range(self.first_seq, self.next_seq):
+            yield self.get(seq)
+
+    def append(self, entry: AtomicLogEntry) -> tuple[int, dict[str, Any] | None]:
+        """Store *entry*; return its sequence number and the evicted entry's context."""
+        seq = self.next_seq
+        packed = _pack_id(entry.request_id)
+        group_ids = entry.effective_group_ids
+        row = (
+            _micros(entry.timestamp),
+            _DECISION_CODES[entry.decision],
+            entry.request_description,
+            entry.context,
+            _intern(entry.agent_id),
+            _intern(entry.credential_id),
+            _intern(entry.user_id),
+            _intern(entry.effective_group_id),
+            tuple(sys.intern(group_id) for group_id in group_ids) if group_ids is not None else None,
+        )
+        evicted = None
+        if seq - self.first_seq < self.capacity:
+            slot = len(self._timestamps)
+            self._timestamps.append(row[0])
+            self._decisions.append(row[1])
+            self._request_ids += packed or bytes(_ID_BYTES)
+            for column, value in zip(self._object_columns(), row[2:]):
+                column.append(value)
+        else:
+            slot = seq % self.capacity
+            evicted = self._contexts[slot]
+            self._odd_ids.pop(slot, None)
+            self._timestamps[slot] = row[0]
+            self._decisions[slot] = row[1]
+            offset = slot * _ID_BYTES
+            self._request_ids[offset:offset + _ID_BYTES] = packed or bytes(_ID_BYTES)
+            for column, value in zip(self._object_columns(), row[2:]):
+                column[slot] = value
+            self.first_seq += 1
+        if packed is None:
+            self._odd_ids[slot] = sys.intern(entry.request_id)
+        self.next_seq = seq + 1
+        return seq, evicted
+
+    def _object_columns(self) -> tuple[list, ...]:
+        return (
+            self._descriptions,
+            self._contexts,
+            self._agent_ids,
+            self._credential_ids,
+            self._user_ids,
+            self._group_ids,
+            self._group_lists,
+        )
+
+    def _slot(self, seq: int) -> int:
+        if not self.first_seq <= seq < self.next_seq:
+            raise IndexError(f"sequence number {seq} is not in the log")
+        return seq % self.capacity
+
+    def _request_id(self, slot: int) -> str:
+        odd = self._odd_ids.get(slot)
+        if odd is not None:
+            return odd
+        offset = slot * _ID_BYTES
+        return str(uuid.UUID(bytes=bytes(self._request_ids[offset:offset + _ID_BYTES])))
+
+    def get(self, seq: int) -> AtomicLogEntry:
+        slot = self._slot(seq)
+        group_ids = self._group_lists[slot]
+        # Every column was validated on append; skip validating it again.
+        return AtomicLogEntry.model_construct(
+            request_id=self._request_id(slot),
+            timestamp=_EPOCH + self._timestamps[slot] * _MICROSECOND,
+            request_description=self._descriptions[slot],
+            context=self._contexts[slot],
+            decision=_DECISIONS[self._decisions[slot]],
+            agent_id=self._agent_ids[slot],
+            credential_id=self._credential_ids[slot],
+            user_id=self._user_ids[slot],
+            effective_group_id=self._group_ids[slot],
+            effective_group_ids=list(group_ids) if group_ids is not None else None,
+        )
+
+    def bisect(self, since: datetime) -> int:
+        """Sequence number of the first entry at or after *since*.
+
+        Entries are appended in timestamp order.
+        """
+        timestamps, capacity = self._timestamps, self.capacity
+        seqs = range(self.first_seq, self.next_seq)
+        return self.first_seq + bisect_left(seqs, _micros(since), key=lambda seq: timestamps[seq % capacity])
@@ -18,16 +18,28 @@ from decision_center.translator import (
 DECISION_CENTER_BASE_URL = os.getenv("DECISION_CENTER_BASE_URL", "http://127.0.0.1:8002")
 
 
-def download_decision_log(output_path: str | None = None, base_url: str = DECISION_CENTER_BASE_URL) -> str:
-    """Fetch the full in-memory decision log from the Decision Center and save it to disk."""
+def download_decision_log(
+    output_path: str | None = None,
+    base_url: str = DECISION_CENTER_BASE_URL,
+    export_format: str = "json",
+    gzip: bool = False,
+) -> str:
+    """Stream the decision log from the Decision Center to disk.
+
+    The response is written chunk by chunk, so large logs never sit in memory.
+    """
     normalized_base_url = base_url.rstrip("/")
-    resp = httpx.get(f"{normalized_base_url}/v1/logs/export", timeout=30)
-    resp.raise_for_status()
     if not output_path:
         ts = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
-        output_path = f"decision_log_{ts}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(resp.text)
+        output_path = f"decision_log_{ts}.{export_format}" + (".gz" if gzip else "")
+    params = {"format": export_format}
+    if gzip:
+        params["gzip"] = "true"
+    with httpx.stream("GET", f"{normalized_base_url}/v1/logs/export", params=params, timeout=30) as resp:
+        resp.raise_for_status()
+        with open(output_path, "wb") as f:
+            for chunk in resp.iter_bytes():
+                f.write(chunk)
     print(f"Saved decision log to {output_path}")
     return output_path
 
@@ -0,0 +1,112 @@
+"""Context value coercion shared by every rule of a decide request.
+
+Agents and UIs send context values as strings ("500", "true") while JSON Logic
+rules use native types (500, true).  Rather than failing closed on every
+type mismatch, we attempt safe coercion before evaluation so that the rule
+can be evaluated correctly.
+
+Coercion only depends on the value, so it is done once per request by a
+normalizer compiled from the group's ``datapoint_definitions`` and the
+result is handed to every rule as a read-only view.
+"""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping
+
+
+def _try_coerce_numeric(s: str):
+    """Attempt to parse a string as int or float.  Returns the original string on failure."""
+    try:
+        return int(s) if "." not in s else float(s)
+    except (ValueError, OverflowError):
+        return s
+
+
+def _coerce_bool_strings(context: Dict[str, Any]) -> None:
+    """Coerce string 'true'/'false' values to actual booleans.
+
+    JSON Logic rules use real booleans, but callers (UI, agents) sometimes
+    send string representations.  Without coercion, strict_eq raises a type
+    mismatch and the rule fail-closes instead of evaluating correctly.
+    """
+    for k, v in context.items():
+        if isinstance(v, str):
+            low = v.lower()
+            if low == "true":
+                context[k] = True
+            elif low == "false":
+                context[k] = False
+
+
+def _coerce_numeric_strings(context: Dict[str, Any]) -> None:
+    """Coerce string values that look numeric to int/float.
+
+    Applied pre-evaluation so that operators like ``in`` and arithmetic
+    see native numbers, not just the strict comparison operators that use
+    ``_coerce_pair``.
+    """
+    for k, v in context.items():
+        if isinstance(v, str) and not isinstance(context[k], bool):
+            coerced = _try_coerce_numeric(v)
+            if coerced is not v:
+                context[k] = coerced
+
+
+def coerce_string(value: str) -> Any:
+    """Single-value equivalent of ``_coerce_bool_strings`` + ``_coerce_numeric_strings``."""
+    low = value.lower()
+    if low == "true":
+        return True
+    if low == "false":
+        return False
+    return _try_coerce_numeric(value)
+
+
+def _coerce_number_string(value: str) -> Any:
+    # Numeric strings and "true"/"false" are disjoint, so trying the declared
+    # type first yields exactly what coerce_string() would.
+    coerced = _try_coerce_numeric(value)
+    if coerced is not value:
+        return coerced
+    low = value.lower()
+    if low == "true":
+        return True
+    if low == "false":
+        return False
+    return value
+
+
+_COERCERS_BY_TYPE: dict[str, Callable[[str], Any]] = {
+    "number": _coerce_number_string,
+    "boolean": coerce_string,
+    "enum": coerce_string,
+    "text": coerce_string,
+}
+
+
+class ContextNormalizer:
+    """Coerces a request context once into a read-only view for all rules.
+
+    Declared datapoints get a coercer for their type; undeclared keys use
+    the generic one.  Outcomes are identical to running the in-place
+    ``_coerce_bool_strings`` / ``_coerce_numeric_strings`` passes on a copy.
+    """
+
+    def __init__(self, datapoint_definitions: Iterable[Mapping[str, Any]] = ()):
+        self._coercers: dict[str, Callable[[str], Any]] = {}
+        for definition in datapoint_definitions or ():
+            name = definition.get("name")
+            coercer = _COERCERS_BY_TYPE.get(definition.get("type"))
+            if name and coercer is not None:
+                self._coercers[name] = coercer
+
+    def __call__(self, context: Mapping[str, Any]) -> Mapping[str, Any]:
+        coercers = self._coercers
+        normalized = {}
+        for k, v in context.items():
+            if isinstance(v, str):
+                v = coercers.get(k, coerce_string)(v)
+            normalized[k] = v
+        return MappingProxyType(normalized)
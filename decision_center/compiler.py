@@ -0,0 +1,328 @@
+"""Compile JSON Logic rules into cached Python evaluation plans.
+
+``jsonLogic()`` walks the raw rule dict and re-dispatches every operator
+through the json_logic registry on every call.  The compiler does that walk
+once per rule and returns a tree of closures that only has to be *called*
+at decide time.
+
+Semantics are those of ``jsonLogic()`` with the strict operators registered
+in ``evaluator.py``: operator implementations are resolved from the same
+registry at compile time, so ``strict_eq`` / ``strict_gt`` & co. still raise
+on missing data or type mismatches and the caller still fails closed.
+Scoped operators (``map``, ``filter``, …) and anything the compiler does not
+recognise are delegated to ``jsonLogic()`` unchanged.
+
+Compiled groups are cached by group id plus revision.  A new revision (any
+rule mutation in the Rule Engine bumps it) replaces the cached plan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+import json_logic
+from json_logic import jsonLogic
+
+from .coercion import ContextNormalizer
+from .rule_index import RuleIndex
+
+Evaluator = Callable[[Any], Any]
+
+# Operators that manage their own data scope or argument handling; these are
+# rare in stored rules and are left to the interpreter.
+_DELEGATED_OPERATORS = {"filter", "map", "reduce", "all", "none", "some", "missing", "missing_some"}
+
+
+def extract_vars_from_jsonlogic(logic: Any, vars_set: set):
+    """Recursively finds all requested variables in a JSON Logic dict."""
+    if isinstance(logic, dict):
+        if "var" in logic:
+            var_val = logic["var"]
+            if isinstance(var_val, str):
+                vars_set.add(var_val)
+            elif isinstance(var_val, list) and len(var_val) > 0 and isinstance(var_val[0], str):
+                vars_set.add(var_val[0])
+        else:
+            for v in logic.values():
+                extract_vars_from_jsonlogic(v, vars_set)
+    elif isinstance(logic, list):
+        for item in logic:
+            extract_vars_from_jsonlogic(item, vars_set)
+
+
+def required_vars(logic: Any) -> frozenset[str]:
+    """Return the variables *logic* reads, computed once at compile time."""
+    vars_set: set = set()
+    extract_vars_from_jsonlogic(logic, vars_set)
+    return frozenset(vars_set)
+
+
+def _is_logic(node: Any) -> bool:
+    return isinstance(node, dict) and len(node) == 1
+
+
+def _constant(value: Any) -> Evaluator:
+    return lambda data: value
+
+
+def _delegate(node: dict) -> Evaluator:
+    """Fallback: let the interpreter handle nodes we do not compile."""
+    return lambda data: jsonLogic(node, data)
+
+
+def _lookup(data: Any, parts: tuple[str, ...], default: Any) -> Any:
+    """Mirror of json_logic's ``_var`` with the dotted path pre-split."""
+    try:
+        for key in parts:
+            try:
+                data = data[key]
+            except TypeError:
+                data = data[int(key)]
+    except (KeyError, TypeError, ValueError):
+        return default
+    return data
+
+
+def _compile_var(values: list) -> Evaluator:
+    if values and all(not isinstance(v, (dict, list)) for v in values):
+        name = values[0]
+        default = values[1] if len(values) > 1 else None
+        if name is None or name == "":
+            return lambda data: data
+        parts = tuple(str(name).split("."))
+        return lambda data: _lookup(data, parts, default)
+
+    # Dynamic variable names: evaluate the arguments first, like jsonLogic().
+    arg_fns = [_compile_node(v) for v in values]
+
+    def _dynamic_var(data):
+        args = [fn(data) for fn in arg_fns]
+        name = args[0] if args else None
+        default = args[1] if len(args) > 1 else None
+        if name is None or name == "":
+            return data
+        return _lookup(data, tuple(str(name).split(".")), default)
+
+    return _dynamic_var
+
+
+def _compile_if(values: list) -> Evaluator:
+    fns = [_compile_node(v) for v in values]
+    pairs = [(fns[i], fns[i + 1]) for i in range(0, len(fns) - 1, 2)]
+    otherwise = fns[-1] if len(fns) % 2 else None
+
+    def _if(data):
+        for cond, then in pairs:
+            if cond(data):
+                return then(data)
+        if otherwise is not None:
+            return otherwise(data)
+        return None
+
+    return _if
+
+
+def _compile_and(values: list) -> Evaluator:
+    fns = [_compile_node(v) for v in values]
+
+    def _and(data):
+        current = False
+        for fn in fns:
+            current = fn(data)
+            if not current:
+                return current
+        return current
+
+    return _and
+
+
+def _compile_or(values: list) -> Evaluator:
+    fns = [_compile_node(v) for v in values]
+
+    def _or(data):
+        current = False
+        for fn in fns:
+            current = fn(data)
+            if current:
+                return current
+        return current
+
+    return _or
+
+
+def _compile_operation(node: dict, operator: str, values: list) -> Evaluator:
+    op = json_logic.operations.get(operator)
+    if op is None or operator == "count":
+        # Unknown / dotted operators raise inside jsonLogic() at evaluation
+        # time, and ``count`` emits a deprecation warning there; delegating
+        # keeps that behaviour.
+        return _delegate(node)
+
+    arg_fns = [_compile_node(v) for v in values]
+    if len(arg_fns) == 1:
+        (a,) = arg_fns
+        return lambda data: op(a(data))
+    if len(arg_fns) == 2:
+        a, b = arg_fns
+        return lambda data: op(a(data), b(data))
+    return lambda data: op(*[fn(data) for fn in arg_fns])
+
+
+def _compile_node(node: Any) -> Evaluator:
+    if isinstance(node, (list, tuple)):
+        fns = [_compile_node(item) for item in node]
+        return lambda data: [fn(data) for fn in fns]
+
+    if not _is_logic(node):
+        return _constant(node)
+
+    operator = str(next(iter(node)))
+    values = node[operator]
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+
+    if operator == "if":
+        return _compile_if(list(values))
+    if operator == "?:":
+        # jsonLogic's ternary takes exactly three arguments and raises
+        # TypeError otherwise; delegating keeps that fail-closed behaviour.
+        return _compile_if(list(values)) if len(values) == 3 else _delegate(node)
+    if operator == "and":
+        return _compile_and(list(values))
+    if operator == "or":
+        return _compile_or(list(values))
+    if operator in _DELEGATED_OPERATORS:
+        return _delegate(node)
+    if operator == "var":
+        return _compile_var(list(values))
+    return _compile_operation(node, operator, list(values))
+
+
+def compile_logic(logic: Any) -> Evaluator:
+    """Compile a JSON Logic expression into a callable taking the data dict."""
+    fn = _compile_node(logic)
+
+    def _evaluate(data):
+        # jsonLogic() substitutes an empty dict for falsy data.
+        return fn(data or {})
+
+    return _evaluate
+
+
+@dataclass(frozen=True)
+class CompiledEdgeCase:
+    expression: str
+    logic_json: dict
+    evaluate: Evaluator | None
+    required_vars: frozenset[str]
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    id: str
+    name: str
+    active: bool
+    rule_logic: str
+    rule_logic_json: dict
+    evaluate: Evaluator | None
+    required_vars: frozenset[str]
+    edge_cases: tuple[CompiledEdgeCase, ...]
+
+
+@dataclass(frozen=True)
+class CompiledGroup:
+    group_id: str
+    revision: Any
+    rules: tuple[CompiledRule, ...]
+    normalize_context: ContextNormalizer
+    index: RuleIndex
+    # Seconds since the Rule Engine last confirmed this revision, when it is
+    # served anyway because revalidating it failed.
+    stale_seconds: float | None = None
+
+
+def compile_rule(rule: Mapping[str, Any]) -> CompiledRule:
+    edge_cases = rule.get("edge_cases", []) or []
+    edge_cases_json = rule.get("edge_cases_json", []) or []
+    compiled_edge_cases = []
+    for i, ec_str in enumerate(edge_cases):
+        ec_json = edge_cases_json[i] if i < len(edge_cases_json) else {}
+        compiled_edge_cases.append(CompiledEdgeCase(
+            expression=ec_str,
+            logic_json=ec_json,
+            evaluate=compile_logic(ec_json) if ec_json else None,
+            required_vars=required_vars(ec_json),
+        ))
+
+    rule_json = rule.get("rule_logic_json", {}) or {}
+    return CompiledRule(
+        id=rule["id"],
+        name=rule.get("name", "Unknown Rule"),
+        active=rule.get("active", True) is not False,
+        rule_logic=rule.get("rule_logic", "Unknown Logic"),
+        rule_logic_json=rule_json,
+        evaluate=compile_logic(rule_json) if rule_json else None,
+        required_vars=required_vars(rule_json),
+        edge_cases=tuple(compiled_edge_cases),
+    )
+
+
+def group_revision(group_data: Mapping[str, Any]) -> Any:
+    """Return the group's revision, or a content fingerprint if it has none."""
+    revision = group_data.get("revision")
+    if revision is not None:
+        return revision
+    payload = json.dumps(group_data.get("rules", []), sort_keys=True, default=str)
+    return "sha1:" + hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class CompiledGroupCache:
+    """Bounded LRU of compiled groups keyed by group id, validated by revision."""
+
+    def __init__(self, max_groups: int = 256):
+        self.max_groups = max_groups
+        self._groups: OrderedDict[str, CompiledGroup] = OrderedDict()
+
+    def get(self, group_id: str, group_data: Mapping[str, Any]) -> CompiledGroup:
+        revision = group_revision(group_data)
+        cached = self._groups.get(group_id)
+        if cached is not None and cached.revision == revision:
+            self._groups.move_to_end(group_id)
+            return cached
+
+        rules = tuple(compile_rule(r) for r in group_data.get("rules", []))
+        compiled = CompiledGroup(
+            group_id=group_id,
+            revision=revision,
+            rules=rules,
+            normalize_context=ContextNormalizer(group_data.get("datapoint_definitions", [])),
+            index=RuleIndex(rules),
+        )
+        self._groups[group_id] = compiled
+        self._groups.move_to_end(group_id)
+        while len(self._groups) > self.max_groups:
+            self._groups.popitem(last=False)
+        return compiled
+
+    def peek(self, group_id: str) -> CompiledGroup | None:
+        """The cached plan for *group_id*, whatever its revision."""
+        compiled = self._groups.get(group_id)
+        if compiled is not None:
+            self._groups.move_to_end(group_id)
+        return compiled
+
+    def invalidate(self, group_id: str | None = None) -> None:
+        if group_id is None:
+            self._groups.clear()
+        else:
+            self._groups.pop(group_id, None)
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self._groups
+
+    def __len__(self) -> int:
+        return len(self._groups)
@@ -0,0 +1,108 @@
+"""Content-addressed interning of decision contexts.
+
+One decision's context shows up in its atomic log entry, its REQUEST chain
+event, its pending entry and the atomic entry recording the approval.  The
+stores keep one canonical dict per distinct context, keyed by the SHA-256 of
+its canonical JSON, and persist ``{"$context": <digest>}`` references in
+place of the full JSON.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+CONTEXT_REF_KEY = "$context"
+
+
+def canonical_json(context: dict[str, Any]) -> str:
+    return json.dumps(context, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def context_digest(canonical: str) -> str:
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def context_ref(digest: str) -> dict[str, str]:
+    return {CONTEXT_REF_KEY: digest}
+
+
+def ref_digest(value: Any) -> str | None:
+    """The digest if *value* is a context reference, else None."""
+    if isinstance(value, dict) and len(value) == 1:
+        digest = value.get(CONTEXT_REF_KEY)
+        if isinstance(digest, str):
+            return digest
+    return None
+
+
+def _same_values(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    # Identity, not equality: 1, 1.0 and True compare equal but serialize
+    # differently.  Shallow copies of one context (pydantic copies the top
+    # level on validation) still match.
+    return len(a) == len(b) and all(key in b and b[key] is value for key, value in a.items())
+
+
+class ContextTable:
+    """Reference-counted canonical contexts, keyed by digest."""
+
+    def __init__(self):
+        self.blobs: dict[str, dict[str, Any]] = {}
+        self._refs: dict[str, int] = {}
+        self._digest_of: dict[int, str] = {}
+        # The most recently interned context, so the copies logged for one
+        # decision are matched without hashing them again.
+        self._last: tuple[dict[str, Any], str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.blobs)
+
+    def digest_of(self, canonical: dict[str, Any]) -> str | None:
+        digest = self._digest_of.get(id(canonical))
+        return digest if digest is not None and self.blobs.get(digest) is canonical else None
+
+    def intern(
+        self, context: dict[str, Any], known: dict[str, dict[str, Any]] | None = None
+    ) -> tuple[dict[str, Any], str, bool]:
+        """Return ``(canonical, digest, created)`` and take a reference.
+
+        References are only resolved while loading, i.e. when the *known*
+        blobs read from disk are passed; they are looked up in the table,
+        then in *known*.  Otherwise *context* is a live payload, and one
+        that merely looks like ``{"$context": digest}`` is interned as is.
+        """
+        digest = self.digest_of(context)
+        if digest is None:
+            digest = ref_digest(context) if known is not None else None
+            if digest is not None:
+                if digest not in self.blobs:
+                    if digest not in known:
+                        raise KeyError(f"unknown context digest {digest}")
+                    context = known[digest]
+            elif self._last is not None and _same_values(context, self._last[0]):
+                digest = self._last[1]
+            else:
+                digest = context_digest(canonical_json(context))
+
+        canonical = self.blobs.get(digest)
+        created = canonical is None
+        if created:
+            canonical = self.blobs[digest] = context
+            self._digest_of[id(canonical)] = digest
+            self._refs[digest] = 0
+        self._refs[digest] += 1
+        self._last = (canonical, digest)
+        return canonical, digest, created
+
+    def release(self, canonical: Any) -> None:
+        digest = self.digest_of(canonical) if isinstance(canonical, dict) else None
+        if digest is None:
+            return
+        self._refs[digest] -= 1
+        if self._refs[digest] == 0:
+            del self._refs[digest]
+            del self._digest_of[id(canonical)]
+            del self.blobs[digest]
+            if self._last is not None and self._last[0] is canonical:
+                self._last = None
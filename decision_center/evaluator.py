@@ -1,35 +1,134 @@
+import asyncio
+import dataclasses
 import os
 import re
+import time
 
 import difflib
 import httpx
-from typing import List, Dict, Any
+from collections import ChainMap
+from functools import lru_cache
+from typing import List, Dict, Any, Mapping, Sequence
 from .models import DecisionOutcome
-from json_logic import jsonLogic, add_operation
+from .coercion import (  # noqa: F401  coercion helpers are re-exported
+    ContextNormalizer,
+    _coerce_bool_strings,
+    _coerce_numeric_strings,
+    _try_coerce_numeric,
+)
+from .rule_index import RULE_LOGIC
+from .compiler import (
+    CompiledGroup,
+    CompiledGroupCache,
+    Evaluator,
+    compile_logic,
+    extract_vars_from_jsonlogic,  # noqa: F401  re-exported for callers
+    required_vars,
+)
+from json_logic import add_operation
 
 from shared.middleware import internal_headers
 
-def extract_vars_from_jsonlogic(logic: Any, vars_set: set):
-    """Recursively finds all requested variables in a JSON Logic dict."""
-    if isinstance(logic, dict):
-        if "var" in logic:
-            var_val = logic["var"]
-            if isinstance(var_val, str):
-                vars_set.add(var_val)
-            elif isinstance(var_val, list) and len(var_val) > 0 and isinstance(var_val[0], str):
-                vars_set.add(var_val[0])
-        else:
-            for v in logic.values():
-                extract_vars_from_jsonlogic(v, vars_set)
-    elif isinstance(logic, list):
-        for item in logic:
-            extract_vars_from_jsonlogic(item, vars_set)
-
 def _split_var_parts(name: str) -> set[str]:
     """Split a variable name into semantic parts (by underscore)."""
     return {p for p in name.lower().split("_") if p}
 
 
+# Common suffixes that should NOT be sufficient for a match on their own
+_GENERIC_PARTS = {"score", "amount", "days", "rate", "pct", "count", "id", "value", "time", "kg", "km"}
+
+_ALIAS_CACHE_SIZE = int(os.getenv("ALIAS_CACHE_SIZE", "1024"))
+
+
+def _resolve_alias(req_var: str, available_keys: list[str]) -> str | None:
+    """Return the context key *req_var* should be aliased to, if any."""
+    req_parts = _split_var_parts(req_var)
+
+    # 1. Containment match with semantic overlap check
+    substring_matches = [k for k in available_keys if req_var in k or k in req_var]
+    if substring_matches:
+        best_match = None
+        for candidate in substring_matches:
+            cand_parts = _split_var_parts(candidate)
+            shared = req_parts & cand_parts
+            # Single-part variable names (e.g. "amount") that are fully
+            # contained in a context key are always valid matches.
+            # For multi-part names, require a shared part beyond generic
+            # suffixes to prevent e.g. aml_score → credit_score.
+            if len(req_parts) <= 1:
+                ok = bool(shared)
+            else:
+                ok = bool(shared - _GENERIC_PARTS)
+            if ok:
+                if best_match is None or len(candidate) < len(best_match):
+                    best_match = candidate
+        if best_match is not None:
+            return best_match
+
+    # 2. Fuzzy match backup (stricter cutoff + semantic check)
+    matches = difflib.get_close_matches(req_var, available_keys, n=1, cutoff=0.7)
+    if matches:
+        alias = matches[0]
+        # Apply same semantic check: multi-part names must share
+        # a meaningful (non-generic) part to prevent false positives.
+        alias_parts = _split_var_parts(alias)
+        shared = req_parts & alias_parts
+        if len(req_parts) <= 1 or bool(shared - _GENERIC_PARTS):
+            return alias
+    return None
+
+
+@lru_cache(maxsize=_ALIAS_CACHE_SIZE)
+def resolve_variable_aliases(
+    rule_vars: frozenset[str],
+    context_keys: frozenset[str],
+) -> tuple[tuple[str, str], ...]:
+    """Map each required variable missing from *context_keys* to a context key.
+
+    Aliasing only depends on variable *names*, so the result is cached per
+    (rule var set, context key set): agents that keep sending the same
+    context shape skip the substring scans and difflib entirely.  Keys are
+    scanned in sorted order so equal-length containment ties resolve the
+    same way regardless of the order the agent sent them in.
+    """
+    available_keys = sorted(context_keys)
+    aliases = []
+    for req_var in sorted(rule_vars - context_keys):
+        alias = _resolve_alias(req_var, available_keys)
+        if alias is not None:
+            aliases.append((req_var, alias))
+    return tuple(aliases)
+
+
+def alias_cache_stats() -> dict[str, int]:
+    """Hit/miss counters for the variable alias cache."""
+    info = resolve_variable_aliases.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def apply_variable_aliases(rule_vars: frozenset[str], context: Dict[str, Any]) -> None:
+    """Alias required variables missing from *context* in place."""
+    if not rule_vars or rule_vars.issubset(context.keys()):
+        return
+    for req_var, alias in resolve_variable_aliases(rule_vars, frozenset(context)):
+        context[req_var] = context[alias]
+
+
+def with_variable_aliases(rule_vars: frozenset[str], context: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Return *context*, or an overlay of it with missing rule variables aliased."""
+    if not rule_vars or rule_vars.issubset(context.keys()):
+        return context
+    aliases = resolve_variable_aliases(rule_vars, frozenset(context))
+    if not aliases:
+        return context
+    return ChainMap({req_var: context[alias] for req_var, alias in aliases}, context)
+
+
 def map_missing_variables(rule_json: dict, context: Dict[str, Any]):
     """
     Finds required variables in rule_json. If missing from context,
@@ -44,50 +143,7 @@ def map_missing_variables(rule_json: dict, context: Dict[str, Any]):
     """
     if not rule_json:
         return
-
-    required_vars = set()
-    extract_vars_from_jsonlogic(rule_json, required_vars)
-
-    available_keys = list(context.keys())
-    # Common suffixes that should NOT be sufficient for a match on their own
-    _GENERIC_PARTS = {"score", "amount", "days", "rate", "pct", "count", "id", "value", "time", "kg", "km"}
-
-    for req_var in required_vars:
-        if req_var not in context:
-            req_parts = _split_var_parts(req_var)
-
-            # 1. Containment match with semantic overlap check
-            substring_matches = [k for k in available_keys if req_var in k or k in req_var]
-            if substring_matches:
-                best_match = None
-                for candidate in substring_matches:
-                    cand_parts = _split_var_parts(candidate)
-                    shared = req_parts & cand_parts
-                    # Single-part variable names (e.g. "amount") that are fully
-                    # contained in a context key are always valid matches.
-                    # For multi-part names, require a shared part beyond generic
-                    # suffixes to prevent e.g. aml_score → credit_score.
-                    if len(req_parts) <= 1:
-                        ok = bool(shared)
-                    else:
-                        ok = bool(shared - _GENERIC_PARTS)
-                    if ok:
-                        if best_match is None or len(candidate) < len(best_match):
-                            best_match = candidate
-                if best_match is not None:
-                    context[req_var] = context[best_match]
-                    continue
-
-            # 2. Fuzzy match backup (stricter cutoff + semantic check)
-            matches = difflib.get_close_matches(req_var, available_keys, n=1, cutoff=0.7)
-            if matches:
-                alias = matches[0]
-                # Apply same semantic check: multi-part names must share
-                # a meaningful (non-generic) part to prevent false positives.
-                alias_parts = _split_var_parts(alias)
-                shared = req_parts & alias_parts
-                if len(req_parts) <= 1 or bool(shared - _GENERIC_PARTS):
-                    context[req_var] = context[alias]
+    apply_variable_aliases(required_vars(rule_json), context)
 
 # ── Type coercion helpers ──
 # Agents and UIs send context values as strings ("500", "true") while JSON Logic
@@ -95,14 +151,6 @@ def map_missing_variables(rule_json: dict, context: Dict[str, Any]):
 # type mismatch, we attempt safe coercion at the operator level so that the
 # rule can be evaluated correctly.
 
-def _try_coerce_numeric(s: str):
-    """Attempt to parse a string as int or float.  Returns the original string on failure."""
-    try:
-        return int(s) if "." not in s else float(s)
-    except (ValueError, OverflowError):
-        return s
-
-
 def _coerce_pair(a, b):
     """If one side is a string and the other a number, try to coerce the string.
 
@@ -202,52 +250,33 @@ def legacy_evaluate_rule(rule_logic: str, context: Dict[str, Any]) -> str | None
         
     return None
 
-def _coerce_bool_strings(context: Dict[str, Any]) -> None:
-    """Coerce string 'true'/'false' values to actual booleans.
-
-    JSON Logic rules use real booleans, but callers (UI, agents) sometimes
-    send string representations.  Without coercion, strict_eq raises a type
-    mismatch and the rule fail-closes instead of evaluating correctly.
-    """
-    for k, v in context.items():
-        if isinstance(v, str):
-            low = v.lower()
-            if low == "true":
-                context[k] = True
-            elif low == "false":
-                context[k] = False
-
-
-def _coerce_numeric_strings(context: Dict[str, Any]) -> None:
-    """Coerce string values that look numeric to int/float.
-
-    Applied pre-evaluation so that operators like ``in`` and arithmetic
-    see native numbers, not just the strict comparison operators that use
-    ``_coerce_pair``.
+def evaluate_compiled_rule(
+    compiled: Evaluator | None,
+    rule_vars: frozenset[str],
+    rule_logic: str,
+    context: Dict[str, Any],
+    normalized_context: Mapping[str, Any] | None = None,
+) -> str | None:
+    """Evaluate a rule whose JSON Logic has already been compiled.
+
+    *compiled* is ``compile_logic(rule_json)`` (``None`` for legacy string
+    rules) and *rule_vars* the variables it reads, used for aliasing.
+    *normalized_context* is the request's coerced, read-only context view;
+    it is shared by all rules of a request and computed here if omitted.
+    Legacy string rules always see the raw *context*.
     """
-    for k, v in context.items():
-        if isinstance(v, str) and not isinstance(context[k], bool):
-            coerced = _try_coerce_numeric(v)
-            if coerced is not v:
-                context[k] = coerced
-
-
-def evaluate_rule(rule_json: dict | None, rule_logic: str, context: Dict[str, Any]) -> str | None:
-    """Evaluates rules using JSON Logic if available, falling back to legacy string parsing."""
-    if not rule_json:
+    if compiled is None:
         return legacy_evaluate_rule(rule_logic, context)
 
     try:
-        # Work on a shallow copy to prevent cross-rule context pollution
-        ctx = dict(context)
-        # Coerce string booleans and numeric strings before evaluation
-        _coerce_bool_strings(ctx)
-        _coerce_numeric_strings(ctx)
-        # Map missing variables via fuzzy matching before evaluating
-        map_missing_variables(rule_json, ctx)
+        if normalized_context is None:
+            normalized_context = _default_normalizer(context)
+        # Aliases are layered over the shared view per rule so that they
+        # never leak into other rules.
+        ctx = with_variable_aliases(rule_vars, normalized_context)
 
         # Evaluate safely
-        result = jsonLogic(rule_json, ctx)
+        result = compiled(ctx)
         if result in ["APPROVE", "REJECT", "ASK_FOR_APPROVAL"]:
             return result
         # If False/None, the condition wasn't met
@@ -259,19 +288,62 @@ def evaluate_rule(rule_json: dict | None, rule_logic: str, context: Dict[str, An
         # escalate to human review.
         return "ASK_FOR_APPROVAL"
 
+
+def evaluate_rule(rule_json: dict | None, rule_logic: str, context: Dict[str, Any]) -> str | None:
+    """Evaluates rules using JSON Logic if available, falling back to legacy string parsing."""
+    if not rule_json:
+        return legacy_evaluate_rule(rule_logic, context)
+    return evaluate_compiled_rule(compile_logic(rule_json), required_vars(rule_json), rule_logic, context)
+
+_default_normalizer = ContextNormalizer()
+
 _RULE_ENGINE_URL = os.getenv("RULE_ENGINE_URL", "http://127.0.0.1:8001")
 
 _http_client: httpx.AsyncClient | None = None
 
+# Compiled evaluation plans, keyed by group id and validated by revision.
+_compiled_groups = CompiledGroupCache(
+    max_groups=int(os.getenv("COMPILED_GROUP_CACHE_SIZE", "256")),
+)
+
+# Split deployments: a cached group is used without asking the Rule Engine for
+# GROUP_CACHE_TTL_SECONDS after it was last fetched or revalidated (0 always
+# revalidates, with If-None-Match), and is still served for up to
+# GROUP_CACHE_MAX_STALE_SECONDS when revalidation fails (0 fails closed).
+GROUP_CACHE_TTL_SECONDS = float(os.getenv("GROUP_CACHE_TTL_SECONDS", "0"))
+GROUP_CACHE_MAX_STALE_SECONDS = float(os.getenv("GROUP_CACHE_MAX_STALE_SECONDS", "0"))
+
+# Group id -> (ETag, monotonic time the Rule Engine last confirmed it).
+_group_validators: dict[str, tuple[str | None, float]] = {}
+
 # When set, the evaluator reads directly from this store instead of making
 # HTTP calls.  Used by the combined backend app to avoid internal networking.
 _local_rule_store = None
 
 
 def use_local_rule_store(store) -> None:
-    """Wire the evaluator to read rules from *store* directly (no HTTP)."""
+    """Wire the evaluator to read rules from *store* directly (no HTTP).
+
+    Compiled plans are then trusted until *store* reports a change to their
+    group, so decides neither serialize nor re-read the group.
+    """
     global _local_rule_store
     _local_rule_store = store
+    invalidate_compiled_groups()
+    store.add_listener(_on_rule_change)
+
+
+def _on_rule_change(change) -> None:
+    invalidate_compiled_groups(change.group_id)
+
+
+def invalidate_compiled_groups(group_id: str | None = None) -> None:
+    """Drop cached evaluation plans for *group_id* (or all groups)."""
+    _compiled_groups.invalidate(group_id)
+    if group_id is None:
+        _group_validators.clear()
+    else:
+        _group_validators.pop(group_id, None)
 
 
 def _get_http_client() -> httpx.AsyncClient:
@@ -289,98 +361,240 @@ async def close_http_client() -> None:
     if client is not None and not client.is_closed:
         await client.aclose()
 
-async def _fetch_group(group_id: str):
-    """Extracted to allow clean mocking in tests without patching all of httpx."""
-    if not re.match(r'^[a-zA-Z0-9_-]+$', group_id):
+_GROUP_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+
+def _check_group_id(group_id: str) -> None:
+    if not _GROUP_ID_PATTERN.match(group_id):
         raise ValueError(f"Invalid group_id format: {group_id!r}")
 
-    # Fast path: direct store access when running in the combined backend.
-    if _local_rule_store is not None:
+
+async def _fetch_group(group_id: str, etag: str | None = None):
+    """Extracted to allow clean mocking in tests without patching all of httpx.
+
+    With *etag*, the Rule Engine answers 304 if the group is unchanged.
+    """
+    _check_group_id(group_id)
+    client = _get_http_client()
+    headers = {"If-None-Match": etag} if etag else None
+    return await client.get(f"{_RULE_ENGINE_URL}/v1/groups/{group_id}", headers=headers)
+
+async def load_compiled_group(group_id: str) -> tuple[CompiledGroup | None, list[str]]:
+    """Fetch *group_id* and return its compiled plan.
+
+    On failure returns ``(None, reasons)`` with the fail-closed reason codes
+    that ``evaluate_request`` reports as matched rules.
+    """
+    if _local_rule_store is None:
+        return await _load_remote_group(group_id)
+    _check_group_id(group_id)
+
+    # Combined backend: the plan stays valid until the store reports a change.
+    compiled = _compiled_groups.peek(group_id)
+    if compiled is None:
         group = _local_rule_store.get_group(group_id)
         if group is None:
-            # Mimic an HTTP 404 response object
-            class _NotFound:
-                status_code = 404
-            return _NotFound()
-        # Mimic an HTTP 200 response object
-        class _Ok:
-            status_code = 200
-            def json(self_inner):
-                return group.model_dump(mode="json")
-        return _Ok()
+            return None, ["unreachable_or_missing_group"]
+        # Compiled once per revision; the plan keeps no reference to the model.
+        compiled = _compiled_groups.get(group_id, group.model_dump())
+    return compiled, []
+
+
+async def _load_remote_group(group_id: str) -> tuple[CompiledGroup | None, list[str]]:
+    """``load_compiled_group`` over HTTP: revalidate the cached plan, serve it stale on errors."""
+    cached = _compiled_groups.peek(group_id)
+    etag, validated_at = _group_validators.get(group_id, (None, None)) if cached else (None, None)
+    if validated_at is not None and time.monotonic() - validated_at < GROUP_CACHE_TTL_SECONDS:
+        return cached, []
+
+    try:
+        resp = await (_fetch_group(group_id, etag) if etag else _fetch_group(group_id))
+        if resp.status_code == 304 and cached is not None:
+            _group_validators[group_id] = (etag, time.monotonic())
+            return cached, []
+        if resp.status_code == 200:
+            compiled = _compiled_groups.get(group_id, resp.json())
+            _remember_validator(group_id, resp.headers.get("etag"))
+            return compiled, []
+        if resp.status_code < 500:
+            # Gone (or never existed): a cached copy must not outlive it.
+            invalidate_compiled_groups(group_id)
+            return None, ["unreachable_or_missing_group"]
+        reasons = ["unreachable_or_missing_group"]
+    except httpx.RequestError:
+        reasons = ["rule_engine_unreachable"]
+
+    if validated_at is not None:
+        age = time.monotonic() - validated_at
+        if age <= GROUP_CACHE_MAX_STALE_SECONDS:
+            return dataclasses.replace(cached, stale_seconds=round(age, 3)), []
+    return None, reasons
+
+
+def _remember_validator(group_id: str, etag: Any) -> None:
+    _group_validators[group_id] = (etag if isinstance(etag, str) else None, time.monotonic())
+    if len(_group_validators) > _compiled_groups.max_groups:
+        # Forget validators of plans the LRU has evicted.
+        for stale_id in [gid for gid in _group_validators if gid not in _compiled_groups]:
+            del _group_validators[stale_id]
 
-    client = _get_http_client()
-    return await client.get(f"{_RULE_ENGINE_URL}/v1/groups/{group_id}")
 
 async def evaluate_request(
     context: Dict[str, Any],
-    group_id: str | None,
+    group_id: str | Sequence[str] | None,
     rule_id: str | None = None,
 ) -> tuple[DecisionOutcome, list[str], list[dict]]:
-    if not group_id:
+    """Evaluate *context* against one group id or a list of group ids.
+
+    Several groups are fetched concurrently and merged by
+    ``evaluate_loaded_groups``.
+    """
+    if group_id is None or isinstance(group_id, str):
+        group_ids = [group_id] if group_id else []
+    else:
+        group_ids = list(dict.fromkeys(gid for gid in group_id if gid))
+
+    if not group_ids:
         # Default behavior: execute without rules
         return DecisionOutcome.APPROVE, [], []
 
     # Fetch rules from rule engine
-    try:
-        resp = await _fetch_group(group_id)
-        if resp.status_code != 200:
-            return DecisionOutcome.ASK_FOR_APPROVAL, ["unreachable_or_missing_group"], []
-        group_data = resp.json()
-        rules = group_data.get("rules", [])
-    except httpx.RequestError:
-        return DecisionOutcome.ASK_FOR_APPROVAL, ["rule_engine_unreachable"], []
+    loaded = await asyncio.gather(*(load_compiled_group(gid) for gid in group_ids))
+    return evaluate_loaded_groups(context, loaded, rule_id)
+
+
+def evaluate_loaded_groups(
+    context: Dict[str, Any],
+    loaded: Sequence[tuple[CompiledGroup | None, list[str]]],
+    rule_id: str | None = None,
+) -> tuple[DecisionOutcome, list[str], list[dict]]:
+    """Evaluate *context* against ``load_compiled_group`` results, most-restrictive-wins.
+
+    A group that could not be loaded fails closed on its own (ASK_FOR_APPROVAL
+    with its reason codes) without hiding a REJECT from the others.  With
+    *rule_id*, only groups containing that rule are evaluated.
+    """
+    outcomes = []
+    matched = []
+    matched_details = []
+    for compiled_group, reasons in loaded:
+        if compiled_group is None:
+            outcomes.append(DecisionOutcome.ASK_FOR_APPROVAL)
+            matched.extend(reasons)
+            continue
+        if rule_id and not any(r.id == rule_id for r in compiled_group.rules):
+            continue
+        outcome, group_matched, group_details = evaluate_compiled_group(context, compiled_group, rule_id)
+        outcomes.append(outcome)
+        matched.extend(group_matched)
+        matched_details.extend(group_details)
+
+    if rule_id and not outcomes:
+        return DecisionOutcome.ASK_FOR_APPROVAL, ["rule_not_found"], []
+    return most_restrictive(outcomes), matched, matched_details
+
+
+def group_versions(loaded: Sequence[tuple[CompiledGroup | None, list[str]]]) -> list[dict]:
+    """``{group_id, revision, stale_seconds}`` of each group that was loaded.
+
+    Recorded for every decision, matched rules or not, so the audit trail
+    shows which revision decided it and whether it came from a stale cache.
+    """
+    return [
+        {"group_id": group.group_id, "revision": group.revision, "stale_seconds": group.stale_seconds}
+        for group, _ in loaded
+        if group is not None
+    ]
+
+
+def most_restrictive(outcomes: Sequence[DecisionOutcome]) -> DecisionOutcome:
+    """REJECT > ASK_FOR_APPROVAL > APPROVE; no outcomes means APPROVE."""
+    if DecisionOutcome.REJECT in outcomes:
+        return DecisionOutcome.REJECT
+    if DecisionOutcome.ASK_FOR_APPROVAL in outcomes:
+        return DecisionOutcome.ASK_FOR_APPROVAL
+    return DecisionOutcome.APPROVE
+
+
+def evaluate_compiled_group(
+    context: Dict[str, Any],
+    compiled_group: CompiledGroup,
+    rule_id: str | None = None,
+) -> tuple[DecisionOutcome, list[str], list[dict]]:
+    """Evaluate *context* against an already fetched and compiled group."""
+    # Coerce the context once; every rule reads the same read-only view.
+    normalized_context = compiled_group.normalize_context(context)
 
     if rule_id:
-        rules = [rule for rule in rules if rule.get("id") == rule_id]
+        rules = [(i, rule) for i, rule in enumerate(compiled_group.rules) if rule.id == rule_id]
         if not rules:
             return DecisionOutcome.ASK_FOR_APPROVAL, ["rule_not_found"], []
+        candidate_units = None
+    else:
+        # Only visit rules whose leading guards can match this context.
+        candidate_units = compiled_group.index.candidate_units(normalized_context)
+        positions = sorted({position for position, _ in candidate_units})
+        rules = [(position, compiled_group.rules[position]) for position in positions]
+
+    def _is_candidate(rule_position: int, unit: int) -> bool:
+        return candidate_units is None or (rule_position, unit) in candidate_units
+
+    # Which revision each hit came from, and how stale it was if the Rule
+    # Engine could not confirm it.
+    group_info = {"group_revision": compiled_group.revision}
+    if compiled_group.stale_seconds is not None:
+        group_info["stale_seconds"] = compiled_group.stale_seconds
 
     # Evaluate rules
     outcomes = []
     matched = []
     matched_details = []
     
-    for r in rules:
-        if r.get("active", True) is False:
+    for position, r in rules:
+        if not r.active:
             continue
 
         # Evaluate edge cases first
-        edge_cases = r.get("edge_cases", [])
-        edge_cases_json = r.get("edge_cases_json", [])
         edge_case_matched = False
-        if edge_cases:
-            for i, ec_str in enumerate(edge_cases):
-                ec_json = edge_cases_json[i] if i < len(edge_cases_json) else {}
-                ec_res = evaluate_rule(ec_json, ec_str, context)
-                if ec_res:
-                    edge_case_matched = True
-                    matched.append(r["id"])
-                    matched_details.append({
-                        "rule_id": r["id"],
-                        "rule_name": r.get("name", "Unknown Rule"),
-                        "hit_type": "edge_case",
-                        "trigger_expression": ec_str
-                    })
-                    if ec_res == "REJECT":
-                        outcomes.append(DecisionOutcome.REJECT)
-                    elif ec_res == "ASK_FOR_APPROVAL":
-                        outcomes.append(DecisionOutcome.ASK_FOR_APPROVAL)
-                    elif ec_res == "APPROVE":
-                        outcomes.append(DecisionOutcome.APPROVE)
-                    break # Only one edge case needs to match to branch logic
+        for i, ec in enumerate(r.edge_cases):
+            if not _is_candidate(position, i):
+                continue
+            ec_res = evaluate_compiled_rule(
+                ec.evaluate, ec.required_vars, ec.expression, context, normalized_context,
+            )
+            if ec_res:
+                edge_case_matched = True
+                matched.append(r.id)
+                matched_details.append({
+                    "rule_id": r.id,
+                    "rule_name": r.name,
+                    "hit_type": "edge_case",
+                    "trigger_expression": ec.expression,
+                    "group_id": compiled_group.group_id,
+                    **group_info,
+                })
+                if ec_res == "REJECT":
+                    outcomes.append(DecisionOutcome.REJECT)
+                elif ec_res == "ASK_FOR_APPROVAL":
+                    outcomes.append(DecisionOutcome.ASK_FOR_APPROVAL)
+                elif ec_res == "APPROVE":
+                    outcomes.append(DecisionOutcome.APPROVE)
+                break # Only one edge case needs to match to branch logic
         
         # Only evaluate rule_logic if no edge case overrode it
-        if not edge_case_matched:
-            r_json = r.get("rule_logic_json", {})
-            res = evaluate_rule(r_json, r["rule_logic"], context)
+        if not edge_case_matched and _is_candidate(position, RULE_LOGIC):
+            res = evaluate_compiled_rule(
+                r.evaluate, r.required_vars, r.rule_logic, context, normalized_context,
+            )
             if res:
-                matched.append(r["id"])
+                matched.append(r.id)
                 matched_details.append({
-                    "rule_id": r["id"],
-                    "rule_name": r.get("name", "Unknown Rule"),
+                    "rule_id": r.id,
+                    "rule_name": r.name,
                     "hit_type": "rule_logic",
-                    "trigger_expression": r.get("rule_logic", "Unknown Logic")
+                    "trigger_expression": r.rule_logic,
+                    "group_id": compiled_group.group_id,
+                    **group_info,
                 })
                 if res == "REJECT":
                     outcomes.append(DecisionOutcome.REJECT)
@@ -389,11 +603,6 @@ async def evaluate_request(
                 elif res == "APPROVE":
                     outcomes.append(DecisionOutcome.APPROVE)
 
-    # Apply most restrictive wins
-    if DecisionOutcome.REJECT in outcomes:
-        return DecisionOutcome.REJECT, matched, matched_details
-    if DecisionOutcome.ASK_FOR_APPROVAL in outcomes:
-        return DecisionOutcome.ASK_FOR_APPROVAL, matched, matched_details
-    
-    # Either all approved or no matching rules (default to APPROVE per spec)
-    return DecisionOutcome.APPROVE, matched, matched_details
+    # Apply most restrictive wins; either all approved or no matching rules
+    # defaults to APPROVE per spec.
+    return most_restrictive(outcomes), matched, matched_details
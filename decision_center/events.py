@@ -0,0 +1,154 @@
+"""In-process pub/sub for live decision events, served as Server-Sent Events.
+
+Each subscriber gets a bounded queue; when a slow client falls behind, the
+oldest undelivered events are dropped and the client is told how many it
+missed.  A short history lets reconnecting clients resume from
+``Last-Event-ID``.  Events are only seen by subscribers of the same process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from pydantic import BaseModel
+
+EVENT_HISTORY_SIZE = int(os.getenv("DECISION_EVENT_HISTORY_SIZE", "1000"))
+EVENT_QUEUE_SIZE = int(os.getenv("DECISION_EVENT_QUEUE_SIZE", "256"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("DECISION_EVENT_HEARTBEAT_SECONDS", "15"))
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    # Serialized lazily, so publishing without subscribers stays cheap.
+    data: BaseModel | dict[str, Any]
+
+    def encode(self) -> str:
+        data = self.data.model_dump_json() if isinstance(self.data, BaseModel) else json.dumps(self.data)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {data}\n\n"
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: deque[Event] = deque(maxlen=queue_size)
+        self.dropped = 0
+        self._wake = asyncio.Event()
+
+    def push(self, event: Event) -> None:
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(event)
+        self._wake.set()
+
+    async def next_batch(self, timeout: float) -> tuple[list[Event], int]:
+        """Wait up to *timeout* for events; return them with the drop count since last call."""
+        if not self.queue:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._wake.clear()
+        events = list(self.queue)
+        self.queue.clear()
+        dropped, self.dropped = self.dropped, 0
+        return events, dropped
+
+
+class EventBroker:
+    def __init__(self, history_size: int = EVENT_HISTORY_SIZE, queue_size: int = EVENT_QUEUE_SIZE):
+        self.history: deque[Event] = deque(maxlen=history_size)
+        self.queue_size = queue_size
+        self.subscribers: set[Subscription] = set()
+        self.last_id = 0
+
+    def publish(self, event_type: str, data: BaseModel | dict[str, Any]) -> Event:
+        self.last_id += 1
+        event = Event(self.last_id, event_type, data)
+        self.history.append(event)
+        for subscription in self.subscribers:
+            subscription.push(event)
+        return event
+
+    def subscribe(self, last_event_id: int | None = None) -> tuple[Subscription, bool]:
+        """Register a subscriber, replaying history after *last_event_id*.
+
+        The second value is False when events after *last_event_id* have
+        already left the history, so the client must reload its state.
+        """
+        subscription = Subscription(self.queue_size)
+        complete = True
+        if last_event_id is not None:
+            oldest = self.history[0].id if self.history else self.last_id + 1
+            complete = last_event_id >= oldest - 1 and last_event_id <= self.last_id
+            if complete:
+                for event in self.history:
+                    if event.id > last_event_id:
+                        subscription.push(event)
+        self.subscribers.add(subscription)
+        return subscription, complete
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+
+
+def _control(event_type: str, data: dict[str, Any], event_id: int | None = None) -> str:
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_stream(
+    broker: EventBroker,
+    last_event_id: int | None = None,
+    heartbeat_seconds: float = EVENT_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for *broker* until the client disconnects.
+
+    ``reset`` tells the client its Last-Event-ID could not be resumed and
+    ``overflow`` that events were dropped; either way it should reload.
+    """
+    subscription, complete = broker.subscribe(last_event_id)
+    try:
+        yield "retry: 3000\n\n"
+        if not complete:
+            yield _control("reset", {"last_event_id": broker.last_id}, broker.last_id)
+        while True:
+            events, dropped = await subscription.next_batch(heartbeat_seconds)
+            if dropped:
+                yield _control("overflow", {"dropped": dropped})
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            yield "".join(event.encode() for event in events)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+class ApprovalWaiters:
+    """Futures for callers long-polling on a pending approval."""
+
+    def __init__(self):
+        self._waiters: dict[str, set[asyncio.Future]] = {}
+
+    def register(self, request_id: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(request_id, set()).add(future)
+        return future
+
+    def discard(self, request_id: str, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(request_id)
+        if waiters is None:
+            return
+        waiters.discard(future)
+        if not waiters:
+            del self._waiters[request_id]
+
+    def resolve(self, request_id: str, result: Any) -> None:
+        for future in self._waiters.pop(request_id, ()):
+            if not future.done():
+                future.set_result(result)
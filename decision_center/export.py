@@ -0,0 +1,110 @@
+"""Streaming export of the decision store.
+
+Records are read page by page through the store's cursor queries and
+serialized as they go, so memory stays flat regardless of store size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Iterator
+
+from .models import AtomicLogEntry, DecisionChain
+from .store import DecisionStorage
+
+EXPORT_FORMATS = ("json", "ndjson")
+EXPORT_PAGE_SIZE = 500
+# Bytes of serialized output buffered before a chunk is sent.
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _pages(query, since: datetime | None, until: datetime | None, page_size: int) -> Iterator[list]:
+    cursor = None
+    while True:
+        items, cursor = query(cursor=cursor, limit=page_size, since=since, until=until)
+        if items:
+            yield items
+        if cursor is None:
+            return
+
+
+def iter_atomic_logs(
+    store: DecisionStorage,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[AtomicLogEntry]:
+    for page in _pages(store.query_atomic_logs, since, until, page_size):
+        yield from page
+
+
+def iter_chains(
+    store: DecisionStorage,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[DecisionChain]:
+    for page in _pages(store.query_chains, since, until, page_size):
+        yield from page
+
+
+def _json_document(store: DecisionStorage, since: datetime | None, until: datetime | None) -> Iterator[str]:
+    # Same shape as DecisionStoreData; pending entries ignore the time range.
+    yield '{"atomic_logs":['
+    for i, entry in enumerate(iter_atomic_logs(store, since, until)):
+        yield ("," if i else "") + entry.model_dump_json()
+    yield '],"chains":{'
+    for i, chain in enumerate(iter_chains(store, since, until)):
+        yield f'{"," if i else ""}{json.dumps(chain.request_id)}:{chain.model_dump_json()}'
+    yield '},"pending":{'
+    for i, pending in enumerate(store.get_pending()):
+        context = {key: value for key, value in pending.items() if key != "request_id"}
+        yield f'{"," if i else ""}{json.dumps(pending["request_id"])}:{json.dumps(context)}'
+    yield "}}"
+
+
+def _ndjson_lines(store: DecisionStorage, since: datetime | None, until: datetime | None) -> Iterator[str]:
+    for entry in iter_atomic_logs(store, since, until):
+        yield json.dumps({"type": "atomic_log", **entry.model_dump(mode="json")}) + "\n"
+    for chain in iter_chains(store, since, until):
+        for event in chain.events:
+            yield json.dumps({"type": "chain_event", "request_id": chain.request_id, **event.model_dump(mode="json")}) + "\n"
+    for pending in store.get_pending():
+        yield json.dumps({"type": "pending", **pending}) + "\n"
+
+
+async def stream_export(
+    store: DecisionStorage,
+    export_format: str = "json",
+    gzip: bool = False,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> AsyncIterator[bytes]:
+    """Serialize the store as *export_format*, optionally gzip-compressed, in chunks."""
+    serialize = _json_document if export_format == "json" else _ndjson_lines
+    parts = serialize(store, since, until)
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+
+    buffer: list[str] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size < EXPORT_CHUNK_SIZE:
+            continue
+        chunk = "".join(buffer).encode("utf-8")
+        buffer, size = [], 0
+        chunk = compressor.compress(chunk) if compressor else chunk
+        if chunk:
+            yield chunk
+        # Let other requests run between chunks of a large export.
+        await asyncio.sleep(0)
+
+    tail = "".join(buffer).encode("utf-8")
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,78 @@
+"""Secondary indexes over the Decision Center's append-only logs.
+
+Entries get a monotonically increasing sequence number when appended and are
+only ever evicted from the oldest end, so each posting list stays sorted and
+a cursor is simply the sequence number of the last entry returned.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from itertools import islice
+from typing import Any, Iterable, Mapping
+
+
+class LogIndex:
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self.postings: dict[str, dict[Any, list[int]]] = {field: {} for field in self.fields}
+        # Lowest live sequence number; postings below it are stale.
+        self.base = 0
+        self._pruned_base = 0
+
+    def add(self, seq: int, values: Mapping[str, Any]) -> None:
+        """Index *seq* under *values*; a list value is indexed under each item."""
+        for field in self.fields:
+            value = values.get(field)
+            for item in value if isinstance(value, list) else (value,):
+                if item is not None:
+                    self.postings[field].setdefault(item, []).append(seq)
+
+    def advance(self, base: int, live: int) -> None:
+        """Record that every entry below *base* has been evicted.
+
+        Stale postings are dropped in bulk once at least half of *live* worth
+        of entries has been evicted, keeping eviction amortized O(1).
+        """
+        self.base = base
+        if base - self._pruned_base < max(1, live // 2):
+            return
+        for postings in self.postings.values():
+            for value in list(postings):
+                seqs = postings[value]
+                cut = bisect_left(seqs, base)
+                if cut == len(seqs):
+                    del postings[value]
+                elif cut:
+                    del seqs[:cut]
+        self._pruned_base = base
+
+    def candidates(self, filters: Mapping[str, Any], start: int) -> Iterable[int]:
+        """Sequence numbers >= *start* that match the most selective filter.
+
+        Only one posting list is walked; callers must still check the other
+        filters against each entry.
+        """
+        seqs = min((self.postings[field].get(value, []) for field, value in filters.items()), key=len)
+        return islice(seqs, bisect_left(seqs, max(start, self.base)), None)
+
+
+def matches(values: Mapping[str, Any], filters: Mapping[str, Any]) -> bool:
+    """Whether index *values* satisfy every filter; list values match any item."""
+    for field, wanted in filters.items():
+        value = values.get(field)
+        if value != wanted and not (isinstance(value, list) and wanted in value):
+            return False
+    return True
+
+
+def parse_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        value = int(cursor)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if value < 0:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return value
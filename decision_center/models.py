@@ -2,7 +2,7 @@ from enum import Enum
 from pydantic import BaseModel, Field
 from datetime import datetime, timezone
 import uuid
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 
 def generate_id():
     return str(uuid.uuid4())
@@ -21,41 +21,93 @@ class EvaluateRequest(BaseModel):
     request_description: str
     context: Dict[str, Any]
     group_id: Optional[str] = None
+    group_ids: Optional[List[str]] = None
     rule_id: Optional[str] = None
     agent_id: Optional[str] = None
     credential_id: Optional[str] = None
     user_id: Optional[str] = None
 
+    def resolved_group_ids(self) -> List[str]:
+        """``group_id`` followed by ``group_ids``, de-duplicated in order."""
+        ids = ([self.group_id] if self.group_id else []) + list(self.group_ids or [])
+        return list(dict.fromkeys(gid for gid in ids if gid))
+
     def identity_dict(self) -> Dict[str, Any]:
         """Return a dict of identity fields for logging, suitable for ** unpacking."""
-        return {
+        group_ids = self.resolved_group_ids()
+        identity = {
             "agent_id": self.agent_id,
             "credential_id": self.credential_id,
             "user_id": self.user_id,
-            "effective_group_id": self.group_id,
+            "effective_group_id": group_ids[0] if group_ids else None,
         }
+        if len(group_ids) > 1:
+            identity["effective_group_ids"] = group_ids
+        return identity
 
 class MatchedRuleInfo(BaseModel):
     rule_id: str
     rule_name: str
     hit_type: str
     trigger_expression: str
+    group_id: Optional[str] = None
+    group_revision: Optional[Union[int, str]] = None
+    stale_seconds: Optional[float] = None
+
+class GroupVersion(BaseModel):
+    """The revision of a group a decision was evaluated against."""
+    group_id: str
+    revision: Optional[Union[int, str]] = None
+    stale_seconds: Optional[float] = None
 
 class DecisionResult(BaseModel):
     request_id: str
     outcome: DecisionOutcome
     matched_rules: List[str]
     matched_details: List[MatchedRuleInfo] = Field(default_factory=list)
+    group_versions: List[GroupVersion] = Field(default_factory=list)
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     agent_id: Optional[str] = None
     credential_id: Optional[str] = None
     user_id: Optional[str] = None
     effective_group_id: Optional[str] = None
+    effective_group_ids: Optional[List[str]] = None
+
+class BatchEvaluateRequest(BaseModel):
+    items: List[EvaluateRequest]
+
+class BatchDecisionItem(BaseModel):
+    """One batch entry: either a ``result`` or an ``error``, never both."""
+    index: int
+    result: Optional[DecisionResult] = None
+    error: Optional[str] = None
+
+class BatchDecisionResult(BaseModel):
+    results: List[BatchDecisionItem]
 
 class ApprovalSubmission(BaseModel):
     approved: bool
     approver: str
 
+class BatchApprovalSubmission(BaseModel):
+    """Resolve the listed ``request_ids``, or every pending item matching the filters."""
+    approved: bool
+    approver: str
+    request_ids: Optional[List[str]] = None
+    agent_id: Optional[str] = None
+    user_id: Optional[str] = None
+    group_id: Optional[str] = None
+
+class BatchApprovalItem(BaseModel):
+    """One resolved item: ``final_state`` on success, otherwise ``error``."""
+    request_id: str
+    status_code: int
+    final_state: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchApprovalResult(BaseModel):
+    results: List[BatchApprovalItem]
+
 class AtomicLogEntry(BaseModel):
     request_id: str = Field(default_factory=generate_id)
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -66,6 +118,7 @@ class AtomicLogEntry(BaseModel):
     credential_id: Optional[str] = None
     user_id: Optional[str] = None
     effective_group_id: Optional[str] = None
+    effective_group_ids: Optional[List[str]] = None
 
 class ChainEvent(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
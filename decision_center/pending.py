@@ -0,0 +1,163 @@
+"""In-memory queue of decisions awaiting human approval.
+
+Entries keep arrival order, so the oldest (next to expire) sit at the front.
+Approvals resolve entries from anywhere in the queue; their sequence numbers
+are left in the postings and skipped on read until they outnumber the live
+entries, at which point the postings are rebuilt.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from .log_index import parse_cursor
+
+PENDING_INDEX_FIELDS = ("agent_id", "user_id", "group_id")
+
+
+def pending_index_values(context: dict[str, Any]) -> dict[str, list[Any]]:
+    """Index values of a pending entry; ``group_id`` covers every effective group."""
+    groups = context.get("effective_group_ids") or [context.get("effective_group_id")]
+    return {
+        "agent_id": [context.get("agent_id")],
+        "user_id": [context.get("user_id")],
+        "group_id": list(dict.fromkeys(groups)),
+    }
+
+
+def pending_created_at(context: dict[str, Any], default: datetime) -> datetime:
+    value = context.get("created_at")
+    if not value:
+        return default
+    created = datetime.fromisoformat(value)
+    return created if created.tzinfo else created.replace(tzinfo=timezone.utc)
+
+
+class PendingQueue:
+    def __init__(self, entries: dict[str, dict[str, Any]]):
+        # Shared with DecisionStoreData.pending, so snapshots see every change.
+        self.entries = entries
+        self._seq_of: dict[str, int] = {}
+        self._ids: dict[int, str] = {}
+        self._created: dict[str, datetime] = {}
+        self._order: list[int] = []
+        self._postings: dict[str, dict[Any, list[int]]] = {field: {} for field in PENDING_INDEX_FIELDS}
+        self._next_seq = 0
+        self._head = 0
+        # Entries up to this sequence number have been checked for escalation.
+        self._escalated_through = -1
+        now = datetime.now(timezone.utc)
+        for request_id, context in list(entries.items()):
+            self._index(request_id, context, pending_created_at(context, now))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _index(self, request_id: str, context: dict[str, Any], created: datetime) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq_of[request_id] = seq
+        self._ids[seq] = request_id
+        self._created[request_id] = created
+        self._order.append(seq)
+        for field, values in pending_index_values(context).items():
+            for value in values:
+                if value is not None:
+                    self._postings[field].setdefault(value, []).append(seq)
+
+    def add(self, request_id: str, context: dict[str, Any], created: datetime) -> None:
+        if request_id in self.entries:
+            self.remove(request_id)
+        self.entries[request_id] = context
+        self._index(request_id, context, created)
+
+    def remove(self, request_id: str) -> dict[str, Any] | None:
+        context = self.entries.pop(request_id, None)
+        if context is None:
+            return None
+        del self._ids[self._seq_of.pop(request_id)]
+        del self._created[request_id]
+        if len(self._order) - self._head > 2 * len(self._ids) + 64:
+            self._compact()
+        return context
+
+    def _compact(self) -> None:
+        self._order = [seq for seq in self._order[self._head:] if seq in self._ids]
+        self._head = 0
+        for postings in self._postings.values():
+            for value in list(postings):
+                live = [seq for seq in postings[value] if seq in self._ids]
+                if live:
+                    postings[value] = live
+                else:
+                    del postings[value]
+
+    def _live_from(self, position: int) -> Iterator[int]:
+        order = self._order
+        for i in range(position, len(order)):
+            if order[i] in self._ids:
+                yield order[i]
+
+    def oldest(self) -> str | None:
+        while self._head < len(self._order) and self._order[self._head] not in self._ids:
+            self._head += 1
+        return self._ids[self._order[self._head]] if self._head < len(self._order) else None
+
+    def created_at(self, request_id: str) -> datetime:
+        return self._created[request_id]
+
+    def created_before(self, cutoff: datetime) -> list[str]:
+        """Request ids created at or before *cutoff*, oldest first."""
+        self.oldest()
+        expired = []
+        for seq in self._live_from(self._head):
+            request_id = self._ids[seq]
+            if self._created[request_id] > cutoff:
+                break
+            expired.append(request_id)
+        return expired
+
+    def due_for_escalation(self, cutoff: datetime) -> list[str]:
+        """Request ids created at or before *cutoff* not returned by a previous call."""
+        position = bisect_right(self._order, self._escalated_through, lo=self._head)
+        due = []
+        for seq in self._live_from(position):
+            request_id = self._ids[seq]
+            if self._created[request_id] > cutoff:
+                break
+            due.append(request_id)
+            self._escalated_through = seq
+        return due
+
+    def page(
+        self, cursor: str | None, limit: int | None, filters: dict[str, Any]
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        filters = {field: value for field, value in filters.items() if value is not None}
+        unknown = set(filters) - set(PENDING_INDEX_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported filter(s): {', '.join(sorted(unknown))}")
+        after = parse_cursor(cursor)
+        start = -1 if after is None else after
+        if filters:
+            seqs = min((self._postings[field].get(value, []) for field, value in filters.items()), key=len)
+        else:
+            seqs = self._order
+        items: list[dict[str, Any]] = []
+        last_seq = None
+        for i in range(bisect_left(seqs, start + 1), len(seqs)):
+            seq = seqs[i]
+            request_id = self._ids.get(seq)
+            if request_id is None:
+                continue
+            context = self.entries[request_id]
+            if filters:
+                values = pending_index_values(context)
+                if any(value not in values[field] for field, value in filters.items()):
+                    continue
+            if limit is not None and len(items) == limit:
+                return items, str(last_seq)
+            items.append({"request_id": request_id, **context})
+            last_seq = seq
+        return items, None
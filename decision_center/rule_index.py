@@ -0,0 +1,161 @@
+"""Discrimination index over a compiled group's rules.
+
+Most rules open with a guard on a single variable, e.g.
+``{"if": [{"and": [{"==": [{"var": "case_type"}, "refund_request"]}, ...]}, "ASK_FOR_APPROVAL", null]}``.
+When the guard is evaluated first and fails *cleanly* (no exception), the
+rule's condition is falsy and the ``if`` falls through to a non-outcome
+else branch — the rule cannot fire.  The index uses that to find the small
+set of evaluation units (edge cases and rule logic) that can possibly match
+a context without visiting the others:
+
+* string equality guards are hashed by their lower-cased constant, matching
+  ``strict_eq``'s case-insensitive comparison;
+* numeric comparison guards keep their thresholds in sorted arrays and are
+  resolved with ``bisect``.
+
+Anything that could make the guard raise (missing variable, wrong type) —
+and with it the fail-closed ASK_FOR_APPROVAL path — marks every unit guarded
+on that variable as a candidate, so skipping never changes an outcome.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Any, Mapping, Sequence
+
+# Unit position of a rule's main ``rule_logic``; edge cases use their index.
+RULE_LOGIC = -1
+
+_OUTCOMES = {"APPROVE", "REJECT", "ASK_FOR_APPROVAL"}
+_EQUALITY_OPERATORS = {"==", "="}
+# Normalised to "<var> <op> <threshold>".
+_THRESHOLD_OPERATORS = {">", ">=", "<", "<="}
+_FLIPPED = {">": "<", ">=": "<=", "<": ">", "<=": ">="}
+
+Unit = tuple[int, int]
+
+
+def _guard_var(node: Any) -> str | None:
+    if not (isinstance(node, dict) and len(node) == 1 and "var" in node):
+        return None
+    name = node["var"]
+    if isinstance(name, list):
+        if len(name) != 1:
+            return None
+        name = name[0]
+    if not isinstance(name, str) or not name or "." in name:
+        return None
+    return name
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _leading_guard(logic: Any) -> tuple[str, str, Any] | None:
+    """Return ``(var, operator, constant)`` if *logic* is skippable on a guard."""
+    if not (isinstance(logic, dict) and len(logic) == 1 and "if" in logic):
+        return None
+    branches = logic["if"]
+    if not isinstance(branches, list) or len(branches) not in (2, 3):
+        return None
+    if len(branches) == 3:
+        otherwise = branches[2]
+        # The else branch must be a constant that is not itself an outcome.
+        if isinstance(otherwise, (dict, list)) or otherwise in _OUTCOMES:
+            return None
+
+    condition = branches[0]
+    if isinstance(condition, dict) and len(condition) == 1 and "and" in condition:
+        conjuncts = condition["and"]
+        if not isinstance(conjuncts, list):
+            conjuncts = [conjuncts]
+        if not conjuncts:
+            return None
+        # Only the first conjunct is evaluated unconditionally.
+        condition = conjuncts[0]
+
+    if not (isinstance(condition, dict) and len(condition) == 1):
+        return None
+    operator, args = next(iter(condition.items()))
+    if not isinstance(args, list) or len(args) != 2:
+        return None
+
+    left, right = args
+    var = _guard_var(left)
+    constant = right
+    if var is None:
+        var = _guard_var(right)
+        constant = left
+        operator = _FLIPPED.get(operator, operator)
+    if var is None or isinstance(constant, (dict, list)):
+        return None
+
+    if operator in _EQUALITY_OPERATORS and isinstance(constant, str):
+        return var, "==", constant.lower()
+    if operator in _THRESHOLD_OPERATORS and _is_number(constant):
+        return var, operator, constant
+    return None
+
+
+class _Thresholds:
+    def __init__(self, entries: list[tuple[Any, Unit]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.values = [value for value, _ in entries]
+        self.units = [unit for _, unit in entries]
+
+    def matching(self, operator: str, value: Any) -> Sequence[Unit]:
+        # Units whose guard ``value <operator> threshold`` can hold.
+        if operator == ">":
+            return self.units[:bisect_left(self.values, value)]
+        if operator == ">=":
+            return self.units[:bisect_right(self.values, value)]
+        if operator == "<":
+            return self.units[bisect_right(self.values, value):]
+        return self.units[bisect_left(self.values, value):]
+
+
+class RuleIndex:
+    """Candidate lookup for the evaluation units of a group's active rules."""
+
+    def __init__(self, rules: Sequence[Any]):
+        self.always: list[Unit] = []
+        self._equality: dict[str, dict[str, list[Unit]]] = defaultdict(lambda: defaultdict(list))
+        threshold_entries: dict[tuple[str, str], list[tuple[Any, Unit]]] = defaultdict(list)
+
+        for position, rule in enumerate(rules):
+            if not rule.active:
+                continue
+            units = [((position, i), ec.logic_json if ec.evaluate else None) for i, ec in enumerate(rule.edge_cases)]
+            units.append(((position, RULE_LOGIC), rule.rule_logic_json if rule.evaluate else None))
+            for unit, logic in units:
+                guard = _leading_guard(logic) if logic else None
+                if guard is None:
+                    self.always.append(unit)
+                    continue
+                var, operator, constant = guard
+                if operator == "==":
+                    self._equality[var][constant].append(unit)
+                else:
+                    threshold_entries[(var, operator)].append((constant, unit))
+
+        self._thresholds = {key: _Thresholds(entries) for key, entries in threshold_entries.items()}
+        self._equality = {var: dict(buckets) for var, buckets in self._equality.items()}
+
+    def candidate_units(self, context: Mapping[str, Any]) -> set[Unit]:
+        """Units that may return an outcome (or fail closed) for *context*."""
+        candidates = set(self.always)
+        for var, buckets in self._equality.items():
+            value = context.get(var)
+            if isinstance(value, str):
+                candidates.update(buckets.get(value.lower(), ()))
+            else:
+                candidates.update(unit for units in buckets.values() for unit in units)
+        for (var, operator), thresholds in self._thresholds.items():
+            value = context.get(var)
+            if _is_number(value) and value == value:  # NaN cannot be bisected
+                candidates.update(thresholds.matching(operator, value))
+            else:
+                candidates.update(thresholds.units)
+        return candidates
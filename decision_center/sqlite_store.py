@@ -0,0 +1,709 @@
+"""SQLite (WAL mode) storage backend for the Decision Center.
+
+Every uvicorn worker opens its own connection to the same database file, so
+audit logs, chains and pending approvals are shared across processes.  WAL
+mode lets readers proceed while one writer commits.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from .analytics import (
+    ANALYTICS_RETENTION_HOURS,
+    BUCKET_SECONDS,
+    atomic_rollups,
+    bucket_range,
+    check_query,
+    event_rollups,
+    rollup_sources,
+    summarize,
+)
+from .contexts import _same_values, canonical_json, context_digest, context_ref
+from .models import AtomicLogEntry, ChainEvent, DecisionChain
+from .log_index import parse_cursor
+from .pending import PENDING_INDEX_FIELDS, pending_created_at, pending_index_values
+from .store import (
+    ATOMIC_INDEX_FIELDS,
+    CHAIN_INDEX_FIELDS,
+    MAX_ATOMIC_LOGS,
+    MAX_CHAINS,
+    MAX_PENDING,
+    PENDING_ESCALATE_AFTER_SECONDS,
+    PENDING_TTL_SECONDS,
+    INTERN_CONTEXTS,
+    _as_utc,
+    _chain_index_values,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS atomic_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id TEXT NOT NULL,
+    agent_id TEXT,
+    user_id TEXT,
+    effective_group_id TEXT,
+    decision TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    context_digest TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_atomic_logs_context_digest ON atomic_logs (context_digest);
+CREATE INDEX IF NOT EXISTS ix_atomic_logs_request_id ON atomic_logs (request_id);
+CREATE INDEX IF NOT EXISTS ix_atomic_logs_agent_id ON atomic_logs (agent_id);
+CREATE INDEX IF NOT EXISTS ix_atomic_logs_user_id ON atomic_logs (user_id);
+CREATE INDEX IF NOT EXISTS ix_atomic_logs_effective_group_id ON atomic_logs (effective_group_id);
+CREATE INDEX IF NOT EXISTS ix_atomic_logs_decision ON atomic_logs (decision);
+CREATE INDEX IF NOT EXISTS ix_atomic_logs_timestamp ON atomic_logs (timestamp);
+
+-- Groups after the first (effective_group_id) of multi-group decisions.
+CREATE TABLE IF NOT EXISTS atomic_log_groups (
+    log_id INTEGER NOT NULL,
+    group_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_atomic_log_groups_group_id ON atomic_log_groups (group_id, log_id);
+CREATE INDEX IF NOT EXISTS ix_atomic_log_groups_log_id ON atomic_log_groups (log_id);
+
+CREATE TABLE IF NOT EXISTS chains (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id TEXT NOT NULL UNIQUE,
+    agent_id TEXT,
+    user_id TEXT,
+    effective_group_id TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_chains_agent_id ON chains (agent_id);
+CREATE INDEX IF NOT EXISTS ix_chains_user_id ON chains (user_id);
+CREATE INDEX IF NOT EXISTS ix_chains_effective_group_id ON chains (effective_group_id);
+CREATE INDEX IF NOT EXISTS ix_chains_created_at ON chains (created_at);
+
+CREATE TABLE IF NOT EXISTS chain_groups (
+    chain_id INTEGER NOT NULL,
+    group_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_chain_groups_group_id ON chain_groups (group_id, chain_id);
+CREATE INDEX IF NOT EXISTS ix_chain_groups_chain_id ON chain_groups (chain_id);
+
+CREATE TABLE IF NOT EXISTS chain_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id TEXT NOT NULL,
+    context_digest TEXT,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_chain_events_request_id ON chain_events (request_id);
+CREATE INDEX IF NOT EXISTS ix_chain_events_context_digest ON chain_events (context_digest);
+
+CREATE TABLE IF NOT EXISTS pending (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id TEXT NOT NULL UNIQUE,
+    agent_id TEXT,
+    user_id TEXT,
+    created_at TEXT NOT NULL,
+    escalated_at TEXT,
+    context_digest TEXT,
+    context TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_pending_agent_id ON pending (agent_id);
+CREATE INDEX IF NOT EXISTS ix_pending_context_digest ON pending (context_digest);
+CREATE INDEX IF NOT EXISTS ix_pending_user_id ON pending (user_id);
+CREATE INDEX IF NOT EXISTS ix_pending_created_at ON pending (created_at);
+
+CREATE TABLE IF NOT EXISTS pending_groups (
+    request_id TEXT NOT NULL,
+    group_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_pending_groups_group_id ON pending_groups (group_id, request_id);
+CREATE INDEX IF NOT EXISTS ix_pending_groups_request_id ON pending_groups (request_id);
+
+-- Decision contexts by SHA-256 of their canonical JSON; rows above store
+-- {"$context": digest} in place of the context and set context_digest.
+CREATE TABLE IF NOT EXISTS contexts (
+    digest TEXT PRIMARY KEY,
+    context TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- Hourly analytics counters (see analytics.py).  Missing dimensions are
+-- stored as '' so they take part in the primary key.
+CREATE TABLE IF NOT EXISTS rollups (
+    rollup TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    dim1 TEXT NOT NULL,
+    dim2 TEXT NOT NULL,
+    measure TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (rollup, bucket, dim1, dim2, measure)
+) WITHOUT ROWID;
+"""
+
+
+def _sortable_timestamp(value: datetime) -> str:
+    """Fixed-width UTC ISO string, so text comparison orders correctly."""
+    return _as_utc(value).astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _ref_json(digest: str) -> str:
+    return json.dumps(context_ref(digest), separators=(",", ":"))
+
+
+def _rehydrate(text: str, digest: str | None, context: str | None) -> str:
+    """Put the context JSON back in place of its reference in *text*."""
+    if digest is None or context is None:
+        return text
+    return text.replace(_ref_json(digest), context, 1)
+
+
+def _extra_groups(group_id: str | None, group_ids: list[str] | None) -> list[str]:
+    """Effective groups other than the first, which has its own column."""
+    return [gid for gid in dict.fromkeys(group_ids or []) if gid != group_id]
+
+
+def _pending_entry(request_id: str, context: str, escalated_at: str | None) -> dict[str, Any]:
+    entry = {"request_id": request_id, **json.loads(context)}
+    if escalated_at is not None:
+        entry["escalated_at"] = escalated_at
+    return entry
+
+
+class SQLiteDecisionStore:
+    """Drop-in replacement for ``DecisionStore`` backed by a SQLite database."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_atomic_logs: int = MAX_ATOMIC_LOGS,
+        max_chains: int = MAX_CHAINS,
+        max_pending: int = MAX_PENDING,
+        pending_ttl_seconds: float = PENDING_TTL_SECONDS,
+        pending_escalate_after_seconds: float = PENDING_ESCALATE_AFTER_SECONDS,
+        busy_timeout_ms: int = 5000,
+        intern_contexts: bool = INTERN_CONTEXTS,
+        analytics_retention_hours: int = ANALYTICS_RETENTION_HOURS,
+    ):
+        self.path = Path(path)
+        self.max_atomic_logs = max_atomic_logs
+        self.max_chains = max_chains
+        self.max_pending = max_pending
+        self.pending_ttl_seconds = pending_ttl_seconds
+        self.pending_escalate_after_seconds = pending_escalate_after_seconds
+        # Entries this worker evicted for capacity, handed to its next sweep_pending().
+        self._evicted_pending: list[dict[str, Any]] = []
+        self.intern_contexts = intern_contexts
+        # (context, digest, canonical JSON) of the last context stored, so
+        # the copies logged for one decision are serialized and hashed once.
+        self._last_context: tuple[dict[str, Any], str, str] | None = None
+        self.analytics_retention_hours = analytics_retention_hours
+        # Newest rollup bucket this worker has written; older ones are pruned
+        # whenever it advances.
+        self._newest_bucket: int | None = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; transactions are opened explicitly with
+        # BEGIN IMMEDIATE so concurrent workers serialize on the write lock
+        # instead of failing on lock upgrade.
+        self._conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,
+            check_same_thread=False,
+            timeout=busy_timeout_ms / 1000,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._commit_latencies: deque[float] = deque(maxlen=1024)
+        self._commit_count = 0
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            if self._batch_depth:
+                yield self._conn
+                return
+            started = time.perf_counter()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._commit_latencies.append((time.perf_counter() - started) * 1000)
+            self._commit_count += 1
+
+    @contextmanager
+    def batch(self):
+        """Run every mutation in the block inside one transaction."""
+        with self._transaction():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+
+    async def commit(self) -> None:
+        """Mutations are committed synchronously; nothing to wait for."""
+
+    async def aclose(self) -> None:
+        """Mutations are committed synchronously; nothing to drain."""
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def flush_stats(self) -> dict[str, Any]:
+        latencies = sorted(self._commit_latencies)
+
+        def percentile(p: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "durability": "sqlite",
+            "flushes": self._commit_count,
+            "queued_records": 0,
+            "flush_ms_p50": percentile(0.50),
+            "flush_ms_p99": percentile(0.99),
+            "flush_ms_max": round(latencies[-1], 3) if latencies else None,
+            "write_failures": 0,
+            "last_write_error": None,
+            "retry_delay_ms": None,
+        }
+
+    def _store_context(self, conn, context: Any) -> tuple[Any, str | None]:
+        """Store *context* in the contexts table; return its reference and digest."""
+        if not self.intern_contexts or not isinstance(context, dict) or not context:
+            return context, None
+        last = self._last_context
+        if last is not None and (context is last[0] or _same_values(context, last[0])):
+            _, digest, text = last
+        else:
+            text = canonical_json(context)
+            digest = context_digest(text)
+            self._last_context = (context, digest, text)
+        conn.execute("INSERT OR IGNORE INTO contexts (digest, context) VALUES (?, ?)", (digest, text))
+        return context_ref(digest), digest
+
+    @staticmethod
+    def _release_contexts(conn, digests) -> None:
+        """Drop context blobs no longer referenced by any row."""
+        conn.executemany(
+            "DELETE FROM contexts WHERE digest = ?1"
+            " AND NOT EXISTS (SELECT 1 FROM atomic_logs WHERE context_digest = ?1)"
+            " AND NOT EXISTS (SELECT 1 FROM chain_events WHERE context_digest = ?1)"
+            " AND NOT EXISTS (SELECT 1 FROM pending WHERE context_digest = ?1)",
+            [(digest,) for digest in {digest for digest in digests if digest is not None}],
+        )
+
+    @staticmethod
+    def _fetch_contexts(conn, digests) -> dict[str, str]:
+        wanted = list({digest for digest in digests if digest is not None})
+        found: dict[str, str] = {}
+        for start in range(0, len(wanted), 500):
+            chunk = wanted[start:start + 500]
+            found.update(conn.execute(
+                f"SELECT digest, context FROM contexts WHERE digest IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return found
+
+    def _count_rollups(self, conn, rollups) -> None:
+        rows = [
+            (name, bucket, *("" if value is None else str(value) for value in key))
+            for name, bucket, key in rollups
+        ]
+        if not rows:
+            return
+        conn.executemany(
+            "INSERT INTO rollups (rollup, bucket, dim1, dim2, measure, count) VALUES (?, ?, ?, ?, ?, 1)"
+            " ON CONFLICT (rollup, bucket, dim1, dim2, measure) DO UPDATE SET count = count + 1",
+            rows,
+        )
+        newest = max(row[1] for row in rows)
+        if self._newest_bucket is None or newest > self._newest_bucket:
+            self._newest_bucket = newest
+            if self.analytics_retention_hours > 0:
+                cutoff = newest - self.analytics_retention_hours * BUCKET_SECONDS
+                conn.execute("DELETE FROM rollups WHERE bucket < ?", (cutoff,))
+
+    def log_atomic(self, entry: AtomicLogEntry):
+        with self._transaction() as conn:
+            self._count_rollups(conn, atomic_rollups(entry))
+            ref, digest = self._store_context(conn, entry.context)
+            payload = entry.model_dump(mode="json", exclude={"context"})
+            payload["context"] = ref
+            cursor = conn.execute(
+                "INSERT INTO atomic_logs"
+                " (request_id, agent_id, user_id, effective_group_id, decision, timestamp, context_digest, entry)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.request_id,
+                    entry.agent_id,
+                    entry.user_id,
+                    entry.effective_group_id,
+                    entry.decision.value,
+                    _sortable_timestamp(entry.timestamp),
+                    digest,
+                    json.dumps(payload, separators=(",", ":")),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO atomic_log_groups (log_id, group_id) VALUES (?, ?)",
+                [
+                    (cursor.lastrowid, group_id)
+                    for group_id in _extra_groups(entry.effective_group_id, entry.effective_group_ids)
+                ],
+            )
+            cutoff = cursor.lastrowid - self.max_atomic_logs
+            conn.execute("DELETE FROM atomic_log_groups WHERE log_id <= ?", (cutoff,))
+            evicted = conn.execute(
+                "DELETE FROM atomic_logs WHERE id <= ? RETURNING context_digest", (cutoff,)
+            ).fetchall()
+            self._release_contexts(conn, [row[0] for row in evicted])
+
+    _ATOMIC_SELECT = (
+        "SELECT atomic_logs.id, atomic_logs.entry, atomic_logs.context_digest, contexts.context FROM atomic_logs"
+        " LEFT JOIN contexts ON contexts.digest = atomic_logs.context_digest"
+    )
+
+    def get_atomic_logs(self) -> list[AtomicLogEntry]:
+        with self._lock:
+            rows = self._conn.execute(self._ATOMIC_SELECT + " ORDER BY atomic_logs.id").fetchall()
+        return [AtomicLogEntry.model_validate_json(_rehydrate(*row[1:])) for row in rows]
+
+    def query_atomic_logs(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        **filters: Any,
+    ) -> tuple[list[AtomicLogEntry], str | None]:
+        rows = self._query_page(
+            self._ATOMIC_SELECT, "timestamp", ATOMIC_INDEX_FIELDS,
+            cursor, limit, since, until, filters, table="atomic_logs", groups=("atomic_log_groups", "log_id"),
+        )
+        return self._finish_page(
+            [(row[0], AtomicLogEntry.model_validate_json(_rehydrate(*row[1:]))) for row in rows], limit
+        )
+
+    def query_chains(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        **filters: Any,
+    ) -> tuple[list[DecisionChain], str | None]:
+        rows = self._query_page(
+            "SELECT id, request_id FROM chains", "created_at", CHAIN_INDEX_FIELDS,
+            cursor, limit, since, until, filters, groups=("chain_groups", "chain_id"),
+        )
+        return self._finish_page([(row_id, self.get_chain(request_id)) for row_id, request_id in rows], limit)
+
+    def _query_page(self, select, time_column, fields, cursor, limit, since, until, filters, table=None, groups=None):
+        filters = {field: value for field, value in filters.items() if value is not None}
+        unknown = set(filters) - set(fields)
+        if unknown:
+            raise ValueError(f"Unsupported filter(s): {', '.join(sorted(unknown))}")
+        # Qualify columns when *select* joins other tables.
+        prefix = f"{table}." if table else ""
+        clauses, params = [], []
+        after = parse_cursor(cursor)
+        if after is not None:
+            clauses.append(f"{prefix}id > ?")
+            params.append(after)
+        for field, value in filters.items():
+            if field == "effective_group_id" and groups is not None:
+                # The first group is a column, any further ones are in *groups*.
+                groups_table, id_column = groups
+                clauses.append(
+                    f"({prefix}{field} = ? OR {prefix}id IN"
+                    f" (SELECT {id_column} FROM {groups_table} WHERE group_id = ?))"
+                )
+                params.extend((value, value))
+            else:
+                clauses.append(f"{prefix}{field} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append(f"{prefix}{time_column} >= ?")
+            params.append(_sortable_timestamp(since))
+        if until is not None:
+            clauses.append(f"{prefix}{time_column} <= ?")
+            params.append(_sortable_timestamp(until))
+        sql = select
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {prefix}id"
+        if limit is not None:
+            # One extra row tells us whether there is a next page.
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _finish_page(rows, limit):
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            return [item for _, item in rows], str(rows[-1][0])
+        return [item for _, item in rows], None
+
+    def log_chain_event(self, request_id: str, event_type: str, details: dict | None = None) -> ChainEvent:
+        event = ChainEvent(event_type=event_type, details=details or {})
+        with self._transaction() as conn:
+            self._count_rollups(conn, event_rollups(event))
+            exists = conn.execute("SELECT 1 FROM chains WHERE request_id = ?", (request_id,)).fetchone()
+            if exists is None:
+                # Ids stay contiguous (no failed inserts), so the oldest
+                # chains beyond max_chains are exactly those at or below
+                # the cutoff.
+                values = _chain_index_values(DecisionChain(request_id=request_id, events=[event]))
+                group_id = event.details.get("effective_group_id")
+                cursor = conn.execute(
+                    "INSERT INTO chains (request_id, agent_id, user_id, effective_group_id, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        request_id,
+                        values["agent_id"],
+                        values["user_id"],
+                        group_id,
+                        _sortable_timestamp(event.timestamp),
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO chain_groups (chain_id, group_id) VALUES (?, ?)",
+                    [
+                        (cursor.lastrowid, extra)
+                        for extra in _extra_groups(group_id, event.details.get("effective_group_ids"))
+                    ],
+                )
+                cutoff = cursor.lastrowid - self.max_chains
+                conn.execute("DELETE FROM chain_groups WHERE chain_id <= ?", (cutoff,))
+                evicted = conn.execute(
+                    "DELETE FROM chain_events WHERE request_id IN (SELECT request_id FROM chains WHERE id <= ?)"
+                    " RETURNING context_digest",
+                    (cutoff,),
+                ).fetchall()
+                conn.execute("DELETE FROM chains WHERE id <= ?", (cutoff,))
+                self._release_contexts(conn, [row[0] for row in evicted])
+            digest = None
+            if "context" in event.details:
+                ref, digest = self._store_context(conn, event.details["context"])
+                payload = event.model_dump(mode="json", exclude={"details": {"context"}})
+                payload["details"]["context"] = ref
+                event_json = json.dumps(payload, separators=(",", ":"))
+            else:
+                event_json = event.model_dump_json()
+            conn.execute(
+                "INSERT INTO chain_events (request_id, context_digest, event) VALUES (?, ?, ?)",
+                (request_id, digest, event_json),
+            )
+        return event
+
+    _EVENT_COLUMNS = (
+        "chain_events.event, chain_events.context_digest, contexts.context FROM chain_events"
+        " LEFT JOIN contexts ON contexts.digest = chain_events.context_digest"
+    )
+
+    def get_chain(self, request_id: str) -> DecisionChain | None:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._EVENT_COLUMNS} WHERE chain_events.request_id = ? ORDER BY chain_events.id",
+                (request_id,),
+            ).fetchall()
+        if not rows:
+            return None
+        return DecisionChain(
+            request_id=request_id,
+            events=[ChainEvent.model_validate_json(_rehydrate(*row)) for row in rows],
+        )
+
+    def get_all_chains(self) -> list[DecisionChain]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT chains.request_id, {self._EVENT_COLUMNS}"
+                " JOIN chains ON chain_events.request_id = chains.request_id"
+                " ORDER BY chains.id, chain_events.id"
+            ).fetchall()
+        chains: dict[str, DecisionChain] = {}
+        for request_id, *event in rows:
+            chain = chains.get(request_id)
+            if chain is None:
+                chain = chains[request_id] = DecisionChain(request_id=request_id)
+            chain.events.append(ChainEvent.model_validate_json(_rehydrate(*event)))
+        return list(chains.values())
+
+    def add_pending(self, request_id: str, context: dict):
+        created = pending_created_at(context, datetime.now(timezone.utc))
+        values = pending_index_values(context)
+        with self._transaction() as conn:
+            self._delete_pending(conn, "request_id = ?", (request_id,))
+            stored, digest = context, None
+            if "context" in context:
+                ref, digest = self._store_context(conn, context["context"])
+                stored = {**context, "context": ref}
+            conn.execute(
+                "INSERT INTO pending (request_id, agent_id, user_id, created_at, context_digest, context)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    request_id,
+                    context.get("agent_id"),
+                    context.get("user_id"),
+                    _sortable_timestamp(created),
+                    digest,
+                    json.dumps(stored, separators=(",", ":")),
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO pending_groups (request_id, group_id) VALUES (?, ?)",
+                [(request_id, group_id) for group_id in values["group_id"] if group_id is not None],
+            )
+            count = conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+            if count > self.max_pending:
+                evicted = self._delete_pending(
+                    conn,
+                    "id IN (SELECT id FROM pending ORDER BY id LIMIT ?)",
+                    (count - self.max_pending,),
+                )
+                self._evicted_pending.extend({**entry, "expiry_reason": "capacity"} for entry in evicted)
+
+    def _delete_pending(self, conn, where: str, params: tuple) -> list[dict]:
+        rows = conn.execute(
+            f"DELETE FROM pending WHERE {where} RETURNING request_id, context, escalated_at, context_digest", params
+        ).fetchall()
+        conn.executemany("DELETE FROM pending_groups WHERE request_id = ?", [(row[0],) for row in rows])
+        entries = self._pending_entries(conn, rows)
+        self._release_contexts(conn, [row[3] for row in rows])
+        return entries
+
+    def _pending_entries(self, conn, rows) -> list[dict]:
+        """Rows of (request_id, context, escalated_at, context_digest) as pending entries."""
+        contexts = self._fetch_contexts(conn, [row[3] for row in rows])
+        return [
+            _pending_entry(request_id, _rehydrate(context, digest, contexts.get(digest)), escalated_at)
+            for request_id, context, escalated_at, digest in rows
+        ]
+
+    def is_pending(self, request_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM pending WHERE request_id = ?", (request_id,)).fetchone()
+        return row is not None
+
+    def resolve_pending(self, request_id: str):
+        # DELETE ... RETURNING makes resolution atomic across workers: only
+        # one caller gets the pending context back.
+        with self._transaction() as conn:
+            rows = self._delete_pending(conn, "request_id = ?", (request_id,))
+        if not rows:
+            return None
+        rows[0].pop("request_id")
+        return rows[0]
+
+    def get_pending(self) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT request_id, context, escalated_at, context_digest FROM pending ORDER BY id"
+            ).fetchall()
+            return self._pending_entries(self._conn, rows)
+
+    def query_pending(
+        self, *, cursor: str | None = None, limit: int | None = None, **filters: Any
+    ) -> tuple[list[dict], str | None]:
+        filters = {field: value for field, value in filters.items() if value is not None}
+        unknown = set(filters) - set(PENDING_INDEX_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported filter(s): {', '.join(sorted(unknown))}")
+        clauses, params = [], []
+        after = parse_cursor(cursor)
+        if after is not None:
+            clauses.append("id > ?")
+            params.append(after)
+        for field, value in filters.items():
+            if field == "group_id":
+                clauses.append("request_id IN (SELECT request_id FROM pending_groups WHERE group_id = ?)")
+            else:
+                clauses.append(f"{field} = ?")
+            params.append(value)
+        sql = "SELECT id, request_id, context, escalated_at, context_digest FROM pending"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            entries = self._pending_entries(self._conn, [row[1:] for row in rows])
+        return self._finish_page(list(zip([row[0] for row in rows], entries)), limit)
+
+    def sweep_pending(self, now: datetime | None = None) -> tuple[list[dict], list[dict]]:
+        """Expire and escalate pending approvals that are due; see ``DecisionStore.sweep_pending``.
+
+        Both steps are single DELETE/UPDATE ... RETURNING statements, so each
+        entry is expired or escalated by exactly one worker.
+        """
+        now = now or datetime.now(timezone.utc)
+        expired, self._evicted_pending = self._evicted_pending, []
+        escalated = []
+        with self._transaction() as conn:
+            if self.pending_ttl_seconds > 0:
+                cutoff = _sortable_timestamp(now - timedelta(seconds=self.pending_ttl_seconds))
+                rows = self._delete_pending(conn, "created_at <= ?", (cutoff,))
+                expired.extend({**entry, "expiry_reason": "ttl"} for entry in rows)
+            if self.pending_escalate_after_seconds > 0:
+                cutoff = _sortable_timestamp(now - timedelta(seconds=self.pending_escalate_after_seconds))
+                rows = conn.execute(
+                    "UPDATE pending SET escalated_at = ? WHERE escalated_at IS NULL AND created_at <= ?"
+                    " RETURNING request_id, context, escalated_at, context_digest",
+                    (now.isoformat(), cutoff),
+                ).fetchall()
+                escalated = self._pending_entries(conn, rows)
+        return expired, escalated
+
+    def analytics(
+        self,
+        rollup: str,
+        *,
+        by: list[str] | None = None,
+        granularity: str = "hour",
+        since: datetime | None = None,
+        until: datetime | None = None,
+        **filters: Any,
+    ) -> list[dict[str, Any]]:
+        by = check_query(rollup, by, granularity, filters)
+        first, last = bucket_range(since, until)
+        sources = rollup_sources(rollup, by, filters)
+        sql = f"SELECT bucket, dim1, dim2, measure, count FROM rollups WHERE rollup IN ({','.join('?' * len(sources))})"
+        params: list[Any] = list(sources)
+        if first is not None:
+            sql += " AND bucket >= ?"
+            params.append(first)
+        if last is not None:
+            sql += " AND bucket <= ?"
+            params.append(last)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return summarize(
+            rollup,
+            ((row[0], tuple(None if value == "" else value for value in row[1:4]), row[4]) for row in rows),
+            by,
+            granularity,
+            filters,
+        )
+
+    def export(self) -> dict[str, Any]:
+        pending = self.get_pending()
+        return {
+            "atomic_logs": [entry.model_dump(mode="json") for entry in self.get_atomic_logs()],
+            "chains": {chain.request_id: chain.model_dump(mode="json") for chain in self.get_all_chains()},
+            "pending": {entry.pop("request_id"): entry for entry in pending},
+        }
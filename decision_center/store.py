@@ -1,97 +1,976 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Protocol
 
 from pydantic import BaseModel, Field
+from pydantic_core import to_jsonable_python
 
+from .analytics import (
+    ANALYTICS_RETENTION_HOURS,
+    Rollups,
+    atomic_rollups,
+    bucket_range,
+    check_query,
+    event_rollups,
+    rollup_sources,
+    summarize,
+)
+from .archive import SegmentArchive, parse_archive_cursor
+from .atomic_log import AtomicLog
+from .contexts import ContextTable, context_ref
+from .log_index import LogIndex, matches, parse_cursor
 from .models import AtomicLogEntry, ChainEvent, DecisionChain
+from .pending import PendingQueue, pending_created_at
 from shared.persistence import atomic_write_json
 
 MAX_ATOMIC_LOGS = int(os.getenv("MAX_ATOMIC_LOGS", "10000"))
 MAX_CHAINS = int(os.getenv("MAX_CHAINS", "5000"))
+# Pending approvals beyond MAX_PENDING expire oldest first; each also expires
+# PENDING_TTL_SECONDS after it was created and is escalated (once) after
+# PENDING_ESCALATE_AFTER_SECONDS.  Zero disables the TTL or escalation.
+MAX_PENDING = int(os.getenv("MAX_PENDING", "10000"))
+PENDING_TTL_SECONDS = float(os.getenv("PENDING_TTL_SECONDS", "0"))
+PENDING_ESCALATE_AFTER_SECONDS = float(os.getenv("PENDING_ESCALATE_AFTER_SECONDS", "0"))
+# "always" fsyncs the journal after every flush; "never" leaves it to the OS.
+JOURNAL_FSYNC = os.getenv("DECISION_STORE_JOURNAL_FSYNC", "always")
+# Number of journal records after which the journal is folded into the snapshot.
+JOURNAL_COMPACT_EVERY = int(os.getenv("DECISION_STORE_JOURNAL_COMPACT_EVERY", "1000"))
+JOURNAL_FSYNC_POLICIES = ("always", "never")
+# "sync" writes inside the mutating call; "group_commit" queues writes for a
+# background writer and lets handlers await ``commit()``; "async" queues
+# writes without waiting for them.
+DURABILITY = os.getenv("DECISION_STORE_DURABILITY", "sync")
+DURABILITY_MODES = ("sync", "group_commit", "async")
+GROUP_COMMIT_INTERVAL_MS = float(os.getenv("DECISION_STORE_GROUP_COMMIT_INTERVAL_MS", "5"))
+GROUP_COMMIT_MAX_RECORDS = int(os.getenv("DECISION_STORE_GROUP_COMMIT_MAX_RECORDS", "256"))
+# After a failed journal write the background writer waits twice as long
+# before each retry, up to this many milliseconds.
+WRITER_RETRY_MAX_MS = float(os.getenv("DECISION_STORE_WRITER_RETRY_MAX_MS", "30000"))
+# Keep one copy of each distinct decision context (see contexts.py).
+INTERN_CONTEXTS = os.getenv("DECISION_STORE_INTERN_CONTEXTS", "true").lower() in ("1", "true", "yes")
+# Atomic log entries and chains evicted past MAX_ATOMIC_LOGS / MAX_CHAINS are
+# appended to compressed segments in this directory (see archive.py) rather
+# than dropped.  Unset keeps only what fits in memory.
+ARCHIVE_PATH = os.getenv("DECISION_STORE_ARCHIVE_PATH")
+ARCHIVE_SEGMENT_RECORDS = int(os.getenv("DECISION_STORE_ARCHIVE_SEGMENT_RECORDS", "10000"))
+ARCHIVE_FLUSH_RECORDS = int(os.getenv("DECISION_STORE_ARCHIVE_FLUSH_RECORDS", "256"))
+
+# "memory" keeps the store in process (optionally journaled to
+# DECISION_STORE_PERSISTENCE_PATH); "sqlite" shares it across workers.
+BACKEND = os.getenv("DECISION_STORE_BACKEND", "memory")
+SQLITE_PATH = os.getenv("DECISION_STORE_SQLITE_PATH", "data/decision_center.sqlite3")
+
+logger = logging.getLogger(__name__)
+
+
+ATOMIC_INDEX_FIELDS = ("agent_id", "user_id", "effective_group_id", "decision")
+CHAIN_INDEX_FIELDS = ("agent_id", "user_id", "effective_group_id")
+
+
+def _atomic_index_values(entry: AtomicLogEntry) -> dict[str, Any]:
+    """Index values of an entry; ``effective_group_id`` covers every effective group."""
+    return {
+        "agent_id": entry.agent_id,
+        "user_id": entry.user_id,
+        "effective_group_id": entry.effective_group_ids or entry.effective_group_id,
+        "decision": entry.decision.value,
+    }
+
+
+def _chain_index_values(chain: DecisionChain) -> dict[str, Any]:
+    details = chain.events[0].details if chain.events else {}
+    values = {field: details.get(field) for field in CHAIN_INDEX_FIELDS}
+    values["effective_group_id"] = details.get("effective_group_ids") or values["effective_group_id"]
+    return values
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
 
 class DecisionStoreData(BaseModel):
+    # Snapshot form only: the store moves these into its columnar AtomicLog.
     atomic_logs: list[AtomicLogEntry] = Field(default_factory=list)
     chains: dict[str, DecisionChain] = Field(default_factory=dict)
     pending: dict[str, dict[str, Any]] = Field(default_factory=dict)
 
 
+class DecisionStorage(Protocol):
+    """Interface the Decision Center app uses; implemented by every backend."""
+
+    def log_atomic(self, entry: AtomicLogEntry): ...
+    def get_atomic_logs(self) -> list[AtomicLogEntry]: ...
+    def log_chain_event(self, request_id: str, event_type: str, details: dict | None = None) -> ChainEvent: ...
+    def get_chain(self, request_id: str) -> DecisionChain | None: ...
+    def get_all_chains(self) -> list[DecisionChain]: ...
+    def add_pending(self, request_id: str, context: dict): ...
+    def is_pending(self, request_id: str) -> bool: ...
+    def resolve_pending(self, request_id: str) -> dict | None: ...
+    def get_pending(self) -> list[dict]: ...
+    def query_pending(self, **kwargs: Any) -> tuple[list[dict], str | None]: ...
+    def sweep_pending(self, now: datetime | None = None) -> tuple[list[dict], list[dict]]: ...
+    def query_atomic_logs(self, **kwargs: Any) -> tuple[list[AtomicLogEntry], str | None]: ...
+    def query_chains(self, **kwargs: Any) -> tuple[list[DecisionChain], str | None]: ...
+    def analytics(self, rollup: str, **kwargs: Any) -> list[dict[str, Any]]: ...
+    def export(self) -> dict[str, Any]: ...
+    def batch(self): ...
+    async def commit(self) -> None: ...
+    async def aclose(self) -> None: ...
+    def flush_stats(self) -> dict[str, Any]: ...
+
+
+def create_decision_store(backend: str = BACKEND) -> DecisionStorage:
+    if backend == "memory":
+        return DecisionStore(persistence_path=os.getenv("DECISION_STORE_PERSISTENCE_PATH"))
+    if backend == "sqlite":
+        from .sqlite_store import SQLiteDecisionStore
+
+        return SQLiteDecisionStore(SQLITE_PATH)
+    raise ValueError(f"Unknown decision store backend {backend!r}; expected 'memory' or 'sqlite'")
+
+
 class DecisionStore:
+    """In-memory decision store with optional snapshot + journal persistence.
+
+    The snapshot at ``persistence_path`` holds the full store.  Every mutation
+    is appended as one JSON line to ``<persistence_path>.journal``; once the
+    journal reaches ``compact_every`` records it is folded into a fresh
+    snapshot and truncated.  Loading reads the snapshot and replays the
+    journal tail on top of it.
+
+    With ``durability`` other than ``sync`` the journal appends are coalesced
+    by a background writer task that flushes every
+    ``group_commit_interval_ms`` or ``group_commit_max_records`` records,
+    running the file I/O in a thread.
+
+    With ``archive_path`` set, evicted atomic log entries and chains go to a
+    ``SegmentArchive``; ``get_chain`` and queries whose ``since`` reaches
+    past the oldest entry in memory read them back from there.
+
+    Hourly analytics rollups (see analytics.py) are counted as entries are
+    logged and saved with the snapshot, so they cover evicted entries too.
+    """
+
     def __init__(
         self,
         data: DecisionStoreData | None = None,
         persistence_path: str | Path | None = None,
         max_atomic_logs: int = MAX_ATOMIC_LOGS,
         max_chains: int = MAX_CHAINS,
+        max_pending: int = MAX_PENDING,
+        pending_ttl_seconds: float = PENDING_TTL_SECONDS,
+        pending_escalate_after_seconds: float = PENDING_ESCALATE_AFTER_SECONDS,
+        fsync: str = JOURNAL_FSYNC,
+        compact_every: int = JOURNAL_COMPACT_EVERY,
+        durability: str = DURABILITY,
+        group_commit_interval_ms: float = GROUP_COMMIT_INTERVAL_MS,
+        group_commit_max_records: int = GROUP_COMMIT_MAX_RECORDS,
+        intern_contexts: bool = INTERN_CONTEXTS,
+        archive_path: str | Path | None = ARCHIVE_PATH,
+        archive_segment_records: int = ARCHIVE_SEGMENT_RECORDS,
+        archive_flush_records: int = ARCHIVE_FLUSH_RECORDS,
+        analytics_retention_hours: int = ANALYTICS_RETENTION_HOURS,
     ):
+        if fsync not in JOURNAL_FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {JOURNAL_FSYNC_POLICIES}, got {fsync!r}")
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, got {durability!r}")
         self.data = data or DecisionStoreData()
         self.persistence_path = Path(persistence_path) if persistence_path else None
+        self.journal_path = (
+            self.persistence_path.with_name(self.persistence_path.name + ".journal")
+            if self.persistence_path
+            else None
+        )
         self.max_atomic_logs = max_atomic_logs
         self.max_chains = max_chains
+        self.max_pending = max_pending
+        self.pending_ttl_seconds = pending_ttl_seconds
+        self.pending_escalate_after_seconds = pending_escalate_after_seconds
+        # Entries evicted for capacity, handed to the next sweep_pending().
+        self._evicted_pending: list[dict[str, Any]] = []
+        self.fsync = fsync
+        self.compact_every = max(1, compact_every)
+        self.durability = durability
+        self.group_commit_interval_ms = group_commit_interval_ms
+        self.group_commit_max_records = max(1, group_commit_max_records)
+        self.intern_contexts = intern_contexts
+        # Context blobs read from disk while loading, and the digests whose
+        # blob is already in the snapshot or journal.
+        self._known_contexts: dict[str, dict[str, Any]] | None = None
+        self._persisted_contexts: set[str] = set()
+        self._batch_depth = 0
+        self._pending_records: list[str] = []
+        self._journal_records = 0
+        # Sequence number of the last journaled mutation.  Snapshots record it
+        # so replay can skip records a snapshot already contains.
+        self._seq = 0
+        self._durable_seq = 0
+        self._writer: asyncio.Task | None = None
+        self._writer_wake: asyncio.Event | None = None
+        self._waiters: list[tuple[int, asyncio.Future]] = []
+        self._flush_latencies: deque[float] = deque(maxlen=1024)
+        self._flush_count = 0
+        self._flushed_records = 0
+        # Consecutive failed background writes, and when to try again.
+        self._write_failures = 0
+        self._last_write_error: str | None = None
+        self._retry_delay_ms = 0.0
+        self._archive = (
+            SegmentArchive(archive_path, archive_segment_records, archive_flush_records, fsync=fsync == "always")
+            if archive_path
+            else None
+        )
+        # Evictions so far, per archive kind.  Replaying the journal evicts
+        # entries again; those already in the archive are not appended twice.
+        self._evicted = {"atomic": 0, "chains": 0}
+        self._atomic_log = AtomicLog(max_atomic_logs)
+        self.analytics_retention_hours = analytics_retention_hours
+        self._rebuild_indexes()
+        self._rebuild_rollups()
         if data is None:
             self._load()
+        if self._archive is not None:
+            for kind in self._evicted:
+                self._evicted[kind] = max(self._evicted[kind], self._archive.archived(kind))
 
     def _load(self) -> None:
-        if self.persistence_path is None or not self.persistence_path.exists():
+        if self.persistence_path is None:
+            return
+        if self.persistence_path.exists():
+            try:
+                payload = json.loads(self.persistence_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError as exc:
+                raise RuntimeError(f"Failed to parse decision store at {self.persistence_path}: {exc}") from exc
+
+            self._seq = payload.pop("journal_seq", 0)
+            self._evicted.update(payload.pop("evicted", {}))
+            rollups = payload.pop("rollups", None)
+            self._known_contexts = payload.pop("contexts", {})
+            try:
+                self.data = DecisionStoreData.model_validate(payload)
+            except Exception as exc:
+                raise RuntimeError(f"Failed to validate decision store at {self.persistence_path}: {exc}") from exc
+        else:
+            self._known_contexts = {}
+            rollups = None
+        self._persisted_contexts = set(self._known_contexts)
+        self._rebuild_indexes()
+        if rollups is None:
+            self._rebuild_rollups()
+        else:
+            self._rollups = Rollups.from_json(rollups, self.analytics_retention_hours)
+        self._replay_journal()
+        self._known_contexts = None
+        self._durable_seq = self._seq
+
+    def _replay_journal(self) -> None:
+        if self.journal_path is None or not self.journal_path.exists():
+            return
+        raw = self.journal_path.read_bytes()
+        lines = raw.split(b"\n")
+        # A crash mid-append leaves at most one torn record without its
+        # trailing newline; drop it so the next append starts on a clean line.
+        if lines[-1]:
+            try:
+                json.loads(lines[-1])
+            except json.JSONDecodeError:
+                with self.journal_path.open("r+b") as fh:
+                    fh.truncate(len(raw) - len(lines[-1]))
+            else:
+                with self.journal_path.open("ab") as fh:
+                    fh.write(b"\n")
+                lines.append(b"")
+        lines = lines[:-1]
+
+        for lineno, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if record["seq"] <= self._seq:
+                    continue
+                self._apply(record)
+            except Exception as exc:
+                raise RuntimeError(
+                    f"Failed to replay decision store journal at {self.journal_path}:{lineno}: {exc}"
+                ) from exc
+            self._seq = record["seq"]
+            self._journal_records += 1
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        op = record["op"]
+        if op == "context":
+            self._known_contexts[record["digest"]] = record["context"]
+            self._persisted_contexts.add(record["digest"])
+        elif op == "atomic_log":
+            entry = AtomicLogEntry.model_validate(record["entry"])
+            self._append_atomic(entry)
+            self._rollups.add(atomic_rollups(entry))
+        elif op == "chain_event":
+            event = ChainEvent.model_validate(record["event"])
+            self._append_chain_event(record["request_id"], event)
+            self._rollups.add(event_rollups(event))
+        elif op == "add_pending":
+            self._add_pending(record["request_id"], record["context"])
+        elif op == "resolve_pending":
+            self._remove_pending(record["request_id"])
+        elif op == "escalate_pending":
+            context = self.data.pending.get(record["request_id"])
+            if context is not None:
+                context["escalated_at"] = record["escalated_at"]
+        else:
+            raise ValueError(f"unknown journal op {op!r}")
+
+    def _record(self, record: dict[str, Any]) -> None:
+        if self.persistence_path is None:
+            return
+        self._seq += 1
+        record["seq"] = self._seq
+        self._pending_records.append(json.dumps(record, separators=(",", ":")))
+        if not self._batch_depth:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if not self._pending_records:
+            return
+        if self.durability == "sync":
+            self._flush()
             return
         try:
-            payload = json.loads(self.persistence_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
-            raise RuntimeError(f"Failed to parse decision store at {self.persistence_path}: {exc}") from exc
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (CLI, plain tests): nothing could run the writer.
+            self._flush()
+            return
+        if self._writer is None or self._writer.done():
+            self._writer_wake = asyncio.Event()
+            self._writer = loop.create_task(self._run_writer())
+        if len(self._pending_records) >= self.group_commit_max_records:
+            self._writer_wake.set()
+
+    def _take_pending(self) -> tuple[list[str], int]:
+        records, self._pending_records = self._pending_records, []
+        return records, self._seq
+
+    def _write_records(self, records: list[str]) -> None:
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(records) + "\n")
+            fh.flush()
+            if self.fsync == "always":
+                os.fsync(fh.fileno())
+
+    def _write_snapshot(self, payload: dict[str, Any]) -> None:
+        atomic_write_json(self.persistence_path, payload)
+        self.journal_path.unlink(missing_ok=True)
+
+    def _snapshot_payload(self) -> dict[str, Any]:
+        extra: dict[str, Any] = {"journal_seq": self._seq, "rollups": self._rollups.to_json()}
+        if self._archive is not None:
+            # Entries evicted before this snapshot can only be recovered from
+            # the archive once the journal is truncated.
+            self._archive.flush()
+            extra["evicted"] = dict(self._evicted)
+        if not self.intern_contexts:
+            return {**self.export(), **extra}
 
+        contexts: dict[str, dict[str, Any]] = {}
+
+        def ref(context: Any) -> Any:
+            digest = self._contexts.digest_of(context) if isinstance(context, dict) else None
+            if digest is None:
+                return to_jsonable_python(context)
+            contexts[digest] = context
+            return context_ref(digest)
+
+        atomic_logs = []
+        for entry in self._atomic_log:
+            item = entry.model_dump(mode="json", exclude={"context"})
+            item["context"] = ref(entry.context)
+            atomic_logs.append(item)
+        chains = {
+            request_id: {"request_id": request_id, "events": [self._event_payload(event, ref) for event in chain.events]}
+            for request_id, chain in self.data.chains.items()
+        }
+        pending = {
+            request_id: {key: ref(value) if key == "context" else to_jsonable_python(value) for key, value in context.items()}
+            for request_id, context in self.data.pending.items()
+        }
+        self._persisted_contexts = set(contexts)
+        return {
+            "atomic_logs": atomic_logs,
+            "chains": chains,
+            "pending": pending,
+            "contexts": to_jsonable_python(contexts),
+            **extra,
+        }
+
+    @staticmethod
+    def _event_payload(event: ChainEvent, ref) -> dict[str, Any]:
+        if "context" not in event.details:
+            return event.model_dump(mode="json")
+        payload = event.model_dump(mode="json", exclude={"details": {"context"}})
+        payload["details"]["context"] = ref(event.details["context"])
+        return payload
+
+    def _context_ref(self, context: Any) -> Any:
+        """Journal form of an interned *context*: a reference, after its blob."""
+        digest = self._contexts.digest_of(context) if isinstance(context, dict) else None
+        if digest is None:
+            return to_jsonable_python(context)
+        if digest not in self._persisted_contexts:
+            self._record({"op": "context", "digest": digest, "context": to_jsonable_python(context)})
+            self._persisted_contexts.add(digest)
+        return context_ref(digest)
+
+    def _intern(self, context: Any) -> Any:
+        # An empty context is smaller than a reference to it.
+        if not self.intern_contexts or not isinstance(context, dict) or not context:
+            return context
+        canonical, _, _ = self._contexts.intern(context, self._known_contexts)
+        return canonical
+
+    def _flush(self) -> None:
+        if not self._pending_records:
+            return
+        records, seq = self._take_pending()
+        started = time.perf_counter()
+        self._write_records(records)
+        self._after_flush(records, seq, started)
+        if self._journal_records >= self.compact_every:
+            self.compact()
+
+    async def _flush_async(self) -> None:
+        if not self._pending_records:
+            return
+        records, seq = self._take_pending()
+        started = time.perf_counter()
         try:
-            self.data = DecisionStoreData.model_validate(payload)
+            await asyncio.to_thread(self._write_records, records)
         except Exception as exc:
-            raise RuntimeError(f"Failed to validate decision store at {self.persistence_path}: {exc}") from exc
+            self._pending_records[:0] = records
+            self._write_failures += 1
+            self._last_write_error = f"{type(exc).__name__}: {exc}"
+            self._retry_delay_ms = min(
+                max(self.group_commit_interval_ms, 1) * 2**self._write_failures, WRITER_RETRY_MAX_MS
+            )
+            if self._write_failures == 1:
+                logger.exception("Decision store journal write failed; retrying with backoff")
+            else:
+                logger.warning(
+                    "Decision store journal write failed %d times in a row (%s); retrying in %.0f ms",
+                    self._write_failures,
+                    self._last_write_error,
+                    self._retry_delay_ms,
+                )
+            self._fail_waiters(exc)
+            return
+        if self._write_failures:
+            logger.info("Decision store journal write recovered after %d failures", self._write_failures)
+            self._write_failures = 0
+            self._last_write_error = None
+            self._retry_delay_ms = 0.0
+        self._after_flush(records, seq, started)
+        if self._journal_records >= self.compact_every:
+            # Serialize on the loop so the snapshot and journal_seq agree,
+            # then do the file I/O in a thread.
+            await asyncio.to_thread(self._write_snapshot, self._snapshot_payload())
+            self._journal_records = 0
+
+    def _after_flush(self, records: list[str], seq: int, started: float) -> None:
+        self._flush_latencies.append((time.perf_counter() - started) * 1000)
+        self._flush_count += 1
+        self._flushed_records += len(records)
+        self._journal_records += len(records)
+        self._durable_seq = seq
+        remaining = []
+        for waiter_seq, future in self._waiters:
+            if waiter_seq <= seq:
+                if not future.done():
+                    future.set_result(None)
+            else:
+                remaining.append((waiter_seq, future))
+        self._waiters = remaining
+
+    def _fail_waiters(self, exc: Exception) -> None:
+        waiters, self._waiters = self._waiters, []
+        for _, future in waiters:
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _run_writer(self) -> None:
+        while True:
+            if self._write_failures:
+                # Back off after a failed write; new mutations do not cut it short.
+                await asyncio.sleep(self._retry_delay_ms / 1000)
+            else:
+                try:
+                    await asyncio.wait_for(self._writer_wake.wait(), self.group_commit_interval_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            self._writer_wake.clear()
+            await self._flush_async()
+            if not self._pending_records and not self._waiters:
+                # Idle: exit and let the next mutation restart the writer.
+                return
 
-    def _save(self) -> None:
+    async def commit(self) -> None:
+        """Wait until every mutation made so far is durable.
+
+        Only ``group_commit`` waits for the background writer; ``sync`` has
+        already written and ``async`` acknowledges before the write.
+        """
+        if self.durability != "group_commit" or self._durable_seq >= self._seq:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((self._seq, future))
+        await future
+
+    async def aclose(self) -> None:
+        """Drain the background writer and flush anything still queued."""
+        writer, self._writer = self._writer, None
+        if writer is not None and not writer.done():
+            self._writer_wake.set()
+            await writer
+        await self._flush_async()
+        if self._archive is not None:
+            self._archive.flush()
+
+    def flush_stats(self) -> dict[str, Any]:
+        latencies = sorted(self._flush_latencies)
+
+        def percentile(p: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "durability": self.durability,
+            "flushes": self._flush_count,
+            "records_flushed": self._flushed_records,
+            "queued_records": len(self._pending_records),
+            "flush_ms_p50": percentile(0.50),
+            "flush_ms_p99": percentile(0.99),
+            "flush_ms_max": round(latencies[-1], 3) if latencies else None,
+            "write_failures": self._write_failures,
+            "last_write_error": self._last_write_error,
+            "retry_delay_ms": self._retry_delay_ms if self._write_failures else None,
+        }
+
+    def compact(self) -> None:
+        """Write the full store as a snapshot and truncate the journal."""
         if self.persistence_path is None:
             return
-        atomic_write_json(self.persistence_path, self.data.model_dump(mode="json"))
+        self._write_snapshot(self._snapshot_payload())
+        self._journal_records = 0
 
-    def log_atomic(self, entry: AtomicLogEntry):
-        self.data.atomic_logs.append(entry)
-        if len(self.data.atomic_logs) > self.max_atomic_logs:
-            self.data.atomic_logs = self.data.atomic_logs[-self.max_atomic_logs:]
-        self._save()
+    @contextmanager
+    def batch(self):
+        """Defer persistence of every mutation in the block to one flush on exit."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._schedule_flush()
 
-    def get_atomic_logs(self) -> list[AtomicLogEntry]:
-        return self.data.atomic_logs
+    def _rebuild_indexes(self) -> None:
+        # Sequence numbers restart at zero per process; cursors are only
+        # meaningful against the process that issued them.
+        self._contexts = ContextTable()
+        entries = [*self._atomic_log, *self.data.atomic_logs]
+        self.data.atomic_logs = []
+        self._atomic_log = AtomicLog(self.max_atomic_logs)
+        self._atomic_index = LogIndex(ATOMIC_INDEX_FIELDS)
+        for entry in entries:
+            self._append_atomic(entry)
+        self._chain_index = LogIndex(CHAIN_INDEX_FIELDS)
+        self._chain_ids = deque(self.data.chains)
+        for seq, chain in enumerate(self.data.chains.values()):
+            self._chain_index.add(seq, _chain_index_values(chain))
+        for chain in self.data.chains.values():
+            for event in chain.events:
+                if "context" in event.details:
+                    event.details["context"] = self._intern(event.details["context"])
+        for context in self.data.pending.values():
+            if "context" in context:
+                context["context"] = self._intern(context["context"])
+        self._pending = PendingQueue(self.data.pending)
 
-    def log_chain_event(self, request_id: str, event_type: str, details: dict | None = None):
-        if request_id not in self.data.chains:
-            self.data.chains[request_id] = DecisionChain(request_id=request_id)
+    def _rebuild_rollups(self) -> None:
+        """Count the entries in memory; used when no saved rollups exist."""
+        self._rollups = Rollups(self.analytics_retention_hours)
+        for entry in self._atomic_log:
+            self._rollups.add(atomic_rollups(entry))
+        for chain in self.data.chains.values():
+            for event in chain.events:
+                self._rollups.add(event_rollups(event))
+
+    def _append_atomic(self, entry: AtomicLogEntry) -> None:
+        entry.context = self._intern(entry.context)
+        log = self._atomic_log
+        if self._archive is not None and len(log) == log.capacity:
+            oldest = log.get(log.first_seq)
+            self._archive_evicted("atomic", oldest, oldest.timestamp)
+        seq, evicted = log.append(entry)
+        self._atomic_index.add(seq, _atomic_index_values(entry))
+        if evicted is not None:
+            self._contexts.release(evicted)
+            self._atomic_index.advance(log.first_seq, len(log))
+
+    def _append_chain_event(self, request_id: str, event: ChainEvent) -> None:
+        if "context" in event.details:
+            event.details["context"] = self._intern(event.details["context"])
+        chain = self.data.chains.get(request_id)
+        if chain is None:
+            chain = self.data.chains[request_id] = DecisionChain(request_id=request_id, events=[event])
+            index = self._chain_index
+            index.add(index.base + len(self._chain_ids), _chain_index_values(chain))
+            self._chain_ids.append(request_id)
             if len(self.data.chains) > self.max_chains:
-                oldest_key = next(iter(self.data.chains))
-                del self.data.chains[oldest_key]
+                oldest_key = self._chain_ids.popleft()
+                evicted = self.data.chains.pop(oldest_key)
+                if self._archive is not None:
+                    evicted = self._with_archived_history(evicted)
+                    self._archive_evicted("chains", evicted, evicted.events[0].timestamp)
+                for old in evicted.events:
+                    self._contexts.release(old.details.get("context"))
+                index.advance(index.base + 1, len(self._chain_ids))
+            return
+        chain.events.append(event)
+
+    def _with_archived_history(self, chain: DecisionChain) -> DecisionChain:
+        # A chain always opens with its REQUEST event; one that does not was
+        # recreated after eviction (e.g. a late approval), and its earlier
+        # events are in the archive.
+        if chain.events[0].event_type == "REQUEST":
+            return chain
+        record = self._archive.find("chains", chain.request_id)
+        if record is None:
+            return chain
+        archived = DecisionChain.model_validate(record)
+        return DecisionChain(request_id=chain.request_id, events=archived.events + chain.events)
+
+    def _archive_evicted(self, kind: str, item: AtomicLogEntry | DecisionChain, timestamp: datetime) -> None:
+        self._evicted[kind] += 1
+        if self._evicted[kind] <= self._archive.archived(kind):
+            return
+        self._archive.append(kind, item.request_id, _as_utc(timestamp), item.model_dump(mode="json"))
+
+    def query_atomic_logs(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        **filters: Any,
+    ) -> tuple[list[AtomicLogEntry], str | None]:
+        """Return atomic log entries after *cursor*, oldest first.
+
+        *filters* match ``ATOMIC_INDEX_FIELDS`` exactly.  The second element
+        is the cursor for the next page, or None when this page is the last.
+        """
+        log = self._atomic_log
+
+        def query_memory(cursor: str | None, limit: int | None) -> tuple[list[AtomicLogEntry], str | None]:
+            start = self._page_start(cursor, self._atomic_index)
+            if since is not None:
+                start = max(start, log.bisect(since))
+            return self._page(
+                self._atomic_index,
+                start,
+                len(log),
+                log.get,
+                _atomic_index_values,
+                lambda entry: entry.timestamp,
+                limit,
+                until,
+                filters,
+            )
+
+        return self._query_with_archive(
+            "atomic",
+            AtomicLogEntry,
+            self._atomic_index,
+            _atomic_index_values,
+            lambda entry: entry.timestamp,
+            log.get(log.first_seq).timestamp if len(log) else None,
+            query_memory,
+            cursor,
+            limit,
+            since,
+            until,
+            filters,
+        )
+
+    def query_chains(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        **filters: Any,
+    ) -> tuple[list[DecisionChain], str | None]:
+        """Return decision chains created after *cursor*, oldest first.
+
+        A chain is matched on the identity and timestamp of its first event.
+        """
+        chains = self.data.chains
+
+        def query_memory(cursor: str | None, limit: int | None) -> tuple[list[DecisionChain], str | None]:
+            start = self._page_start(cursor, self._chain_index)
+            if since is not None:
+                offset = bisect_left(
+                    self._chain_ids, _as_utc(since), key=lambda request_id: chains[request_id].events[0].timestamp
+                )
+                start = max(start, self._chain_index.base + offset)
+            return self._page(
+                self._chain_index,
+                start,
+                len(self._chain_ids),
+                lambda seq: chains[self._chain_ids[seq - self._chain_index.base]],
+                _chain_index_values,
+                lambda chain: chain.events[0].timestamp,
+                limit,
+                until,
+                filters,
+            )
 
-        self.data.chains[request_id].events.append(
-            ChainEvent(event_type=event_type, details=details or {})
+        return self._query_with_archive(
+            "chains",
+            DecisionChain,
+            self._chain_index,
+            _chain_index_values,
+            lambda chain: chain.events[0].timestamp,
+            chains[self._chain_ids[0]].events[0].timestamp if self._chain_ids else None,
+            query_memory,
+            cursor,
+            limit,
+            since,
+            until,
+            filters,
         )
-        self._save()
+
+    def _query_with_archive(
+        self, kind, model, index, values_of, timestamp_of, oldest, query_memory, cursor, limit, since, until, filters
+    ):
+        """Page through archived entries, then continue with *query_memory*.
+
+        The archive is only read for an archive cursor or, on the first page,
+        a *since* before the *oldest* entry in memory.  Archive cursors keep
+        their position as entries are evicted, so paging from one continues
+        into memory without gaps.
+        """
+        position = parse_archive_cursor(cursor) if self._archive is not None else None
+        if position is None and (
+            self._archive is None
+            or cursor is not None
+            or since is None
+            or (oldest is not None and _as_utc(since) >= _as_utc(oldest))
+        ):
+            return query_memory(cursor, limit)
+
+        filters = self._check_filters(index, filters)
+        since = _as_utc(since) if since is not None else None
+        until = _as_utc(until) if until is not None else None
+        items = []
+        last_cursor = None
+        for record_cursor, record in self._archive.scan(kind, position, since, until):
+            item = model.model_validate(record)
+            timestamp = _as_utc(timestamp_of(item))
+            if since is not None and timestamp < since:
+                continue
+            if until is not None and timestamp > until:
+                return items, None
+            if filters and not matches(values_of(item), filters):
+                continue
+            if limit is not None and len(items) == limit:
+                return items, last_cursor
+            items.append(item)
+            last_cursor = record_cursor
+        if limit is not None and len(items) == limit:
+            # The next page starts at the end of the archive.
+            return items, last_cursor
+        rest, next_cursor = query_memory(None, None if limit is None else limit - len(items))
+        return items + rest, next_cursor
+
+    @staticmethod
+    def _page_start(cursor: str | None, index: LogIndex) -> int:
+        after = parse_cursor(cursor)
+        return index.base if after is None else max(index.base, after + 1)
+
+    @staticmethod
+    def _check_filters(index: LogIndex, filters: dict[str, Any]) -> dict[str, Any]:
+        filters = {field: value for field, value in filters.items() if value is not None}
+        unknown = set(filters) - set(index.fields)
+        if unknown:
+            raise ValueError(f"Unsupported filter(s): {', '.join(sorted(unknown))}")
+        return filters
+
+    @classmethod
+    def _page(cls, index, start, live, get, values_of, timestamp_of, limit, until, filters):
+        filters = cls._check_filters(index, filters)
+        until = _as_utc(until) if until is not None else None
+        if filters:
+            seqs = index.candidates(filters, start)
+        else:
+            seqs = range(start, index.base + live)
+
+        items = []
+        last_seq = None
+        for seq in seqs:
+            item = get(seq)
+            if until is not None and timestamp_of(item) > until:
+                break
+            if filters and not matches(values_of(item), filters):
+                continue
+            if limit is not None and len(items) == limit:
+                return items, str(last_seq)
+            items.append(item)
+            last_seq = seq
+        return items, None
+
+    def log_atomic(self, entry: AtomicLogEntry):
+        self._append_atomic(entry)
+        self._rollups.add(atomic_rollups(entry))
+        if self.persistence_path is None:
+            return
+        payload = entry.model_dump(mode="json", exclude={"context"})
+        payload["context"] = self._context_ref(entry.context)
+        self._record({"op": "atomic_log", "entry": payload})
+
+    def get_atomic_logs(self) -> list[AtomicLogEntry]:
+        return list(self._atomic_log)
+
+    def log_chain_event(self, request_id: str, event_type: str, details: dict | None = None) -> ChainEvent:
+        event = ChainEvent(event_type=event_type, details=details or {})
+        self._append_chain_event(request_id, event)
+        self._rollups.add(event_rollups(event))
+        if self.persistence_path is not None:
+            payload = self._event_payload(event, self._context_ref)
+            self._record({"op": "chain_event", "request_id": request_id, "event": payload})
+        return event
 
     def get_chain(self, request_id: str) -> DecisionChain | None:
-        return self.data.chains.get(request_id)
+        chain = self.data.chains.get(request_id)
+        if self._archive is None:
+            return chain
+        if chain is not None:
+            return self._with_archived_history(chain)
+        record = self._archive.find("chains", request_id)
+        return DecisionChain.model_validate(record) if record is not None else None
 
     def get_all_chains(self) -> list[DecisionChain]:
         return list(self.data.chains.values())
 
+    def _add_pending(self, request_id: str, context: dict) -> None:
+        self._remove_pending(request_id)
+        if "context" in context:
+            context["context"] = self._intern(context["context"])
+        self._pending.add(request_id, context, pending_created_at(context, datetime.now(timezone.utc)))
+
+    def _remove_pending(self, request_id: str) -> dict | None:
+        context = self._pending.remove(request_id)
+        if context is not None:
+            self._contexts.release(context.get("context"))
+        return context
+
     def add_pending(self, request_id: str, context: dict):
-        self.data.pending[request_id] = context
-        self._save()
+        self._add_pending(request_id, context)
+        if self.persistence_path is not None:
+            record = {key: self._context_ref(value) if key == "context" else value for key, value in context.items()}
+            self._record({"op": "add_pending", "request_id": request_id, "context": record})
+        while len(self._pending) > self.max_pending:
+            oldest = self._pending.oldest()
+            self._evicted_pending.append(
+                {"request_id": oldest, **self.resolve_pending(oldest), "expiry_reason": "capacity"}
+            )
 
     def is_pending(self, request_id: str) -> bool:
         return request_id in self.data.pending
 
     def resolve_pending(self, request_id: str):
-        resolved = self.data.pending.pop(request_id, None)
+        resolved = self._remove_pending(request_id)
         if resolved is not None:
-            self._save()
+            self._record({"op": "resolve_pending", "request_id": request_id})
         return resolved
 
     def get_pending(self) -> list[dict]:
         return [{"request_id": k, **v} for k, v in self.data.pending.items()]
+
+    def query_pending(
+        self, *, cursor: str | None = None, limit: int | None = None, **filters: Any
+    ) -> tuple[list[dict], str | None]:
+        """Return pending approvals after *cursor*, oldest first.
+
+        *filters* match ``PENDING_INDEX_FIELDS``; ``group_id`` matches any of
+        the entry's effective groups.
+        """
+        return self._pending.page(cursor, limit, filters)
+
+    def sweep_pending(self, now: datetime | None = None) -> tuple[list[dict], list[dict]]:
+        """Expire and escalate pending approvals that are due.
+
+        Returns ``(expired, escalated)``.  Expired entries are removed and
+        carry ``expiry_reason`` ("capacity" or "ttl"); escalated entries stay
+        pending with ``escalated_at`` set.
+        """
+        now = now or datetime.now(timezone.utc)
+        expired, self._evicted_pending = self._evicted_pending, []
+        if self.pending_ttl_seconds > 0:
+            cutoff = now - timedelta(seconds=self.pending_ttl_seconds)
+            for request_id in self._pending.created_before(cutoff):
+                expired.append({"request_id": request_id, **self.resolve_pending(request_id), "expiry_reason": "ttl"})
+        escalated = []
+        if self.pending_escalate_after_seconds > 0:
+            cutoff = now - timedelta(seconds=self.pending_escalate_after_seconds)
+            for request_id in self._pending.due_for_escalation(cutoff):
+                context = self.data.pending[request_id]
+                if "escalated_at" in context:
+                    continue
+                context["escalated_at"] = now.isoformat()
+                self._record({"op": "escalate_pending", "request_id": request_id, "escalated_at": context["escalated_at"]})
+                escalated.append({"request_id": request_id, **context})
+        return expired, escalated
+
+    def analytics(
+        self,
+        rollup: str,
+        *,
+        by: list[str] | None = None,
+        granularity: str = "hour",
+        since: datetime | None = None,
+        until: datetime | None = None,
+        **filters: Any,
+    ) -> list[dict[str, Any]]:
+        """Counts from the *rollup* counters, per period and per *by* key.
+
+        Entries are counted in the hour they were logged; *since* and
+        *until* select whole hours.
+        """
+        by = check_query(rollup, by, granularity, filters)
+        first, last = bucket_range(since, until)
+        rows = (
+            row for source in rollup_sources(rollup, by, filters) for row in self._rollups.rows(source, first, last)
+        )
+        return summarize(rollup, rows, by, granularity, filters)
+
+    def export(self) -> dict[str, Any]:
+        return {
+            "atomic_logs": [entry.model_dump(mode="json") for entry in self._atomic_log],
+            **self.data.model_dump(mode="json", exclude={"atomic_logs"}),
+        }
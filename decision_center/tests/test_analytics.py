@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from decision_center.models import AtomicLogEntry, DecisionState
+from decision_center.sqlite_store import SQLiteDecisionStore
+from decision_center.store import DecisionStore
+
+BASE = datetime(2026, 1, 1, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return DecisionStore(max_atomic_logs=2, max_chains=2)
+    return SQLiteDecisionStore(tmp_path / "decision_center.sqlite3", max_atomic_logs=2, max_chains=2)
+
+
+def _log(store, minutes: int, decision: DecisionState, group_id: str, agent_id: str) -> None:
+    store.log_atomic(AtomicLogEntry(
+        timestamp=BASE + timedelta(minutes=minutes), request_description="NeedLaptop", context={},
+        decision=decision, effective_group_id=group_id, agent_id=agent_id,
+    ))
+
+
+def test_outcomes_are_counted_per_hour_and_survive_eviction(store):
+    _log(store, 0, DecisionState.APPROVED, "g1", "agt_a")
+    _log(store, 10, DecisionState.REJECTED, "g1", "agt_b")
+    _log(store, 70, DecisionState.APPROVED, "g2", "agt_a")
+    _log(store, 80, DecisionState.APPROVED, "g1", "agt_a")
+
+    assert store.analytics("outcomes", by=["group_id"]) == [
+        {"bucket": "2026-01-01T10:00:00+00:00", "group_id": "g1", "counts": {"APPROVED": 1, "REJECTED": 1}, "total": 2},
+        {"bucket": "2026-01-01T11:00:00+00:00", "group_id": "g1", "counts": {"APPROVED": 1}, "total": 1},
+        {"bucket": "2026-01-01T11:00:00+00:00", "group_id": "g2", "counts": {"APPROVED": 1}, "total": 1},
+    ]
+    assert store.analytics("outcomes", by=["agent_id"], granularity="total", group_id="g1") == [
+        {"bucket": None, "agent_id": "agt_a", "counts": {"APPROVED": 2}, "total": 2},
+        {"bucket": None, "agent_id": "agt_b", "counts": {"REJECTED": 1}, "total": 1},
+    ]
+    rows = store.analytics("outcomes", by=[], since=BASE + timedelta(minutes=65))
+    assert rows == [{"bucket": "2026-01-01T11:00:00+00:00", "counts": {"APPROVED": 2}, "total": 2}]
+
+
+def test_multi_group_decisions_count_under_every_group(store):
+    _log(store, 0, DecisionState.APPROVED, "g1", "agt_a")
+    store.log_atomic(AtomicLogEntry(
+        request_id="req-multi", timestamp=BASE + timedelta(minutes=5), request_description="NeedLaptop", context={},
+        decision=DecisionState.REJECTED, effective_group_id="g2", effective_group_ids=["g2", "g1"], agent_id="agt_a",
+    ))
+    store.log_chain_event(
+        "req-multi", "REQUEST", details={"effective_group_id": "g2", "effective_group_ids": ["g2", "g1"]}
+    )
+
+    assert store.analytics("outcomes", by=["group_id"], granularity="total") == [
+        {"bucket": None, "group_id": "g1", "counts": {"APPROVED": 1, "REJECTED": 1}, "total": 2},
+        {"bucket": None, "group_id": "g2", "counts": {"REJECTED": 1}, "total": 1},
+    ]
+    assert store.analytics("outcomes", by=[], granularity="total", group_id="g1")[0]["total"] == 2
+    assert store.analytics("outcomes", by=["agent_id"], granularity="total")[0]["total"] == 2
+
+    page, _ = store.query_atomic_logs(effective_group_id="g1")
+    assert len(page) == 2 and page[1].request_id == "req-multi"
+    page, _ = store.query_chains(effective_group_id="g1")
+    assert [chain.request_id for chain in page] == ["req-multi"]
+
+
+def test_rule_hits_and_approvals_come_from_chain_events(store):
+    store.log_chain_event("req-1", "EVALUATION", details={"matched_details": [
+        {"rule_id": "r1", "rule_name": "Limit", "hit_type": "edge_case", "trigger_expression": "x", "group_id": "g1"},
+        {"rule_id": "r2", "rule_name": "Ask", "hit_type": "rule_logic", "trigger_expression": "x", "group_id": "g1"},
+    ]})
+    store.log_chain_event("req-2", "EVALUATION", details={"matched_details": [
+        {"rule_id": "r2", "rule_name": "Ask", "hit_type": "rule_logic", "trigger_expression": "x", "group_id": "g1"},
+    ]})
+    store.log_chain_event("req-2", "APPROVAL_STATUS", details={"status": "APPROVED", "approver": "alice"})
+    store.log_chain_event("req-3", "APPROVAL_STATUS", details={"status": "EXPIRED", "approver": None})
+
+    rules = store.analytics("rules", by=["rule_id"], granularity="day")
+    assert [(row["rule_id"], row["counts"]) for row in rules] == [
+        ("r1", {"edge_case": 1}), ("r2", {"rule_logic": 2}),
+    ]
+    approvals = store.analytics("approvals", granularity="total")
+    assert [(row["approver"], row["counts"]) for row in approvals] == [(None, {"EXPIRED": 1}), ("alice", {"APPROVED": 1})]
+
+
+def test_unknown_rollups_and_dimensions_are_rejected(store):
+    with pytest.raises(ValueError, match="Unknown rollup"):
+        store.analytics("latency")
+    with pytest.raises(ValueError, match="Unsupported dimension"):
+        store.analytics("approvals", by=["group_id"])
+    with pytest.raises(ValueError, match="Unknown granularity"):
+        store.analytics("outcomes", granularity="week")
+
+
+def test_memory_rollups_are_saved_with_the_snapshot(tmp_path):
+    path = tmp_path / "store.json"
+    store = DecisionStore(persistence_path=path, compact_every=2)
+    for minutes in range(3):
+        _log(store, minutes, DecisionState.APPROVED, "g1", "agt_a")
+
+    restored = DecisionStore(persistence_path=path, max_atomic_logs=1)
+    assert restored.analytics("outcomes", granularity="total")[0]["total"] == 3
@@ -5,6 +5,7 @@ from httpx import AsyncClient, ASGITransport
 from decision_center.app import app
 import decision_center.app as app_module
 from decision_center.store import DecisionStore
+from decision_center.models import AtomicLogEntry, DecisionState
 
 # We need to mock the Rule Engine API call in real life, but for MVP evaluator tests
 # we can just use a mocked httpx transport or patch it. Since the app makes outbound
@@ -721,3 +722,558 @@ async def test_export_logs_returns_full_store_as_attachment(mock_rule_engine, mo
             assert req_id in payload["pending"]
     finally:
         monkeypatch.setattr(app_module, "store", original_store)
+
+
+@pytest.mark.asyncio
+async def test_batch_decide_fetches_each_group_once_and_flushes_once(mock_rule_engine, monkeypatch, tmp_path):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1",
+        "name": "Grp",
+        "rules": [
+            {"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}
+        ]
+    }
+    mock_rule_engine.return_value = mock_response
+    monkeypatch.setattr(app_module, "store", DecisionStore(persistence_path=tmp_path / "store.json"))
+
+    with patch("decision_center.store.os.fsync") as mock_fsync:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.post("/v1/decide/batch", json={"items": [
+                {"request_description": "Big", "context": {"amount": 150}, "group_id": "g1"},
+                {"request_description": "Small", "context": {"amount": 50}, "group_id": "g1"},
+                {"request_description": "No group", "context": {}},
+            ]})
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert [item["result"]["outcome"] for item in results] == ["ASK_FOR_APPROVAL", "APPROVE", "APPROVE"]
+    assert mock_rule_engine.call_count == 1
+    assert mock_fsync.call_count == 1
+    assert len(app_module.store.get_atomic_logs()) == 3
+    assert app_module.store.is_pending(results[0]["result"]["request_id"])
+
+
+@pytest.mark.asyncio
+async def test_batch_decide_isolates_item_errors(mock_rule_engine, monkeypatch):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"id": "g1", "name": "Grp", "rules": []}
+
+    async def fetch(group_id):
+        if group_id != "g1":
+            raise ValueError(f"Invalid group_id format: {group_id!r}")
+        return mock_response
+
+    mock_rule_engine.side_effect = fetch
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/v1/decide/batch", json={"items": [
+            {"request_description": "Bad group", "context": {}, "group_id": "../etc"},
+            {"request_description": "Good", "context": {}, "group_id": "g1"},
+        ]})
+
+    assert resp.status_code == 200
+    bad, good = resp.json()["results"]
+    assert bad["result"] is None
+    assert "Invalid group_id format" in bad["error"]
+    assert good["error"] is None
+    assert good["result"]["outcome"] == "APPROVE"
+
+
+@pytest.mark.asyncio
+async def test_batch_decide_rejects_oversized_batch(monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_DECIDE_BATCH_SIZE", 2)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/v1/decide/batch", json={"items": [
+            {"request_description": f"Item {i}", "context": {}} for i in range(3)
+        ]})
+
+    assert resp.status_code == 400
+    assert "maximum size" in resp.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_decide_with_multiple_groups_merges_into_one_decision(mock_rule_engine, monkeypatch):
+    groups = {
+        "profit": {"id": "profit", "name": "Profit", "rules": [
+            {"id": "low_margin", "name": "Low margin", "rule_logic": "IF margin < 10 THEN ASK_FOR_APPROVAL"},
+        ]},
+        "safety": {"id": "safety", "name": "Safety", "rules": [
+            {"id": "hazard", "name": "Hazardous", "rule_logic": "IF hazard_level > 3 THEN REJECT"},
+        ]},
+    }
+
+    async def fetch(group_id):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = groups[group_id]
+        return response
+
+    mock_rule_engine.side_effect = fetch
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/v1/decide", json={
+            "request_description": "Order 42",
+            "context": {"margin": 5, "hazard_level": 5},
+            "group_ids": ["profit", "safety"],
+        })
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["outcome"] == "REJECT"
+        assert data["matched_rules"] == ["low_margin", "hazard"]
+        assert [d["group_id"] for d in data["matched_details"]] == ["profit", "safety"]
+        assert data["effective_group_id"] == "profit"
+        assert data["effective_group_ids"] == ["profit", "safety"]
+
+        chains = (await client.get("/v1/logs/chains")).json()
+        assert [chain["request_id"] for chain in chains] == [data["request_id"]]
+        assert len(app_module.store.get_atomic_logs()) == 1
+
+
+@pytest.mark.asyncio
+async def test_decide_with_multiple_groups_fails_closed_on_missing_group(mock_rule_engine, monkeypatch):
+    async def fetch(group_id):
+        response = MagicMock()
+        response.status_code = 404 if group_id == "gone" else 200
+        response.json.return_value = {"id": group_id, "name": "Grp", "rules": []}
+        return response
+
+    mock_rule_engine.side_effect = fetch
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/v1/decide", json={
+            "request_description": "Order 43",
+            "context": {},
+            "group_id": "g1",
+            "group_ids": ["gone", "g1"],
+        })
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["outcome"] == "ASK_FOR_APPROVAL"
+        assert data["matched_rules"] == ["unreachable_or_missing_group"]
+        assert data["effective_group_ids"] == ["g1", "gone"]
+
+        resp = await client.post(f"/v1/decide/{data['request_id']}/approve", json={"approved": True, "approver": "Bob"})
+        assert resp.status_code == 200
+        final = app_module.store.get_atomic_logs()[-1]
+        assert final.effective_group_ids == ["g1", "gone"]
+
+
+@pytest.mark.asyncio
+async def test_persistence_metrics_report_flushes(mock_rule_engine, monkeypatch, tmp_path):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"id": "g1", "name": "Grp", "rules": []}
+    mock_rule_engine.return_value = mock_response
+    store = DecisionStore(persistence_path=tmp_path / "store.json", durability="group_commit")
+    monkeypatch.setattr(app_module, "store", store)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/v1/decide", json={"request_description": "A", "context": {}, "group_id": "g1"})
+        assert resp.status_code == 200
+        # group_commit acknowledges only after the decision is journaled.
+        assert store.flush_stats()["queued_records"] == 0
+
+        metrics = (await client.get("/v1/metrics/persistence")).json()
+
+    assert metrics["durability"] == "group_commit"
+    assert metrics["records_flushed"] == 3
+    assert metrics["flushes"] >= 1
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_atomic_logs_support_cursor_pagination_and_filters(monkeypatch):
+    store = DecisionStore()
+    for i in range(3):
+        store.log_atomic(AtomicLogEntry(
+            request_id=f"req-{i}", request_description="A", context={},
+            decision=DecisionState.APPROVED, agent_id="agt_01",
+        ))
+        store.log_chain_event(f"req-{i}", "REQUEST", details={"agent_id": "agt_01"})
+    monkeypatch.setattr(app_module, "store", store)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/v1/logs/atomic", params={"limit": 2, "agent_id": "agt_01"})
+        assert [e["request_id"] for e in resp.json()] == ["req-0", "req-1"]
+        cursor = resp.headers["X-Next-Cursor"]
+
+        resp = await client.get("/v1/logs/atomic", params={"limit": 2, "agent_id": "agt_01", "cursor": cursor})
+        assert [e["request_id"] for e in resp.json()] == ["req-2"]
+        assert "X-Next-Cursor" not in resp.headers
+
+        resp = await client.get("/v1/logs/chains", params={"limit": 1, "agent_id": "agt_01"})
+        assert [c["request_id"] for c in resp.json()] == ["req-0"]
+        assert resp.headers["X-Next-Cursor"]
+
+        resp = await client.get("/v1/logs/atomic", params={"decision": "REJECTED"})
+        assert resp.json() == []
+
+        resp = await client.get("/v1/logs/atomic", params={"cursor": "nope"})
+        assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_logs_streams_ndjson_with_gzip_and_time_range(monkeypatch):
+    import gzip
+    from datetime import datetime, timezone
+
+    store = DecisionStore()
+    for i, day in enumerate((1, 2, 3)):
+        store.log_atomic(AtomicLogEntry(
+            request_id=f"req-{i}", timestamp=datetime(2026, 1, day, tzinfo=timezone.utc),
+            request_description="A", context={}, decision=DecisionState.APPROVAL_REQUIRED,
+        ))
+        store.log_chain_event(f"req-{i}", "REQUEST", details={"description": "A"})
+    store.add_pending("req-2", {"description": "A"})
+    monkeypatch.setattr(app_module, "store", store)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/v1/logs/export", params={
+            "format": "ndjson", "gzip": "true", "since": "2026-01-02T00:00:00Z", "until": "2026-01-02T12:00:00Z",
+        })
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/gzip"
+    assert resp.headers["content-disposition"].endswith('.ndjson.gz"')
+    records = [json.loads(line) for line in gzip.decompress(resp.content).decode().splitlines()]
+    # Chains were created now, outside the range; pending ignores the range.
+    assert [(r["type"], r["request_id"]) for r in records] == [("atomic_log", "req-1"), ("pending", "req-2")]
+
+
+
+@pytest.mark.asyncio
+async def test_decisions_and_approvals_are_published_as_events(mock_rule_engine, monkeypatch):
+    from decision_center.events import EventBroker
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1", "name": "Grp", "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    mock_rule_engine.return_value = mock_response
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+    broker = EventBroker()
+    monkeypatch.setattr(app_module, "events", broker)
+    subscription, _ = broker.subscribe()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        req_id = (await client.post("/v1/decide", json={
+            "request_description": "NeedLaptop", "context": {"amount": 150}, "group_id": "g1",
+        })).json()["request_id"]
+        await client.post(f"/v1/decide/{req_id}/approve", json={"approved": True, "approver": "Bob"})
+
+    published, dropped = await subscription.next_batch(timeout=0)
+    assert dropped == 0
+    assert [e.type for e in published] == [
+        "atomic_log", "chain_event", "chain_event", "pending_added",
+        "pending_resolved", "chain_event", "atomic_log",
+    ]
+    assert json.loads(published[1].encode().split("data: ", 1)[1])["events"][0]["event_type"] == "REQUEST"
+
+
+@pytest.mark.asyncio
+async def test_event_stream_endpoint_honours_last_event_id(monkeypatch):
+    from starlette.requests import Request as StarletteRequest
+    from decision_center.events import EventBroker
+
+    broker = EventBroker()
+    broker.publish("atomic_log", {"n": 1})
+    broker.publish("atomic_log", {"n": 2})
+    monkeypatch.setattr(app_module, "events", broker)
+
+    request = StarletteRequest({"type": "http", "headers": [(b"last-event-id", b"1")]})
+    response = await app_module.event_stream(request)
+    assert response.media_type == "text/event-stream"
+
+    body = response.body_iterator
+    assert await body.__anext__() == "retry: 3000\n\n"
+    assert (await body.__anext__()).startswith("id: 2\nevent: atomic_log\n")
+    await body.aclose()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_approval_returns_when_approved(mock_rule_engine, monkeypatch):
+    import asyncio
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1", "name": "Grp", "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    mock_rule_engine.return_value = mock_response
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+    # Fail the test if the waiter falls back to polling instead of being woken.
+    monkeypatch.setattr(app_module, "APPROVAL_WAIT_POLL_SECONDS", 30)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        req_id = (await client.post("/v1/decide", json={
+            "request_description": "NeedLaptop", "context": {"amount": 150}, "group_id": "g1",
+        })).json()["request_id"]
+
+        waiter = asyncio.create_task(client.get(f"/v1/decide/{req_id}/wait", params={"timeout": 10}))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        await client.post(f"/v1/decide/{req_id}/approve", json={"approved": False, "approver": "Bob"})
+        resp = await asyncio.wait_for(waiter, 1)
+
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "REJECTED"
+        assert resp.json()["event"]["details"]["approver"] == "Bob"
+
+        # Once resolved, waiting returns immediately.
+        resp = await client.get(f"/v1/decide/{req_id}/wait", params={"timeout": 10})
+        assert resp.json()["status"] == "REJECTED"
+    assert not app_module.approval_waiters._waiters
+
+
+@pytest.mark.asyncio
+async def test_wait_for_approval_times_out_and_sees_other_workers(mock_rule_engine, monkeypatch):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1", "name": "Grp", "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    mock_rule_engine.return_value = mock_response
+    store = DecisionStore()
+    monkeypatch.setattr(app_module, "store", store)
+    monkeypatch.setattr(app_module, "APPROVAL_WAIT_POLL_SECONDS", 0.01)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        req_id = (await client.post("/v1/decide", json={
+            "request_description": "NeedLaptop", "context": {"amount": 150}, "group_id": "g1",
+        })).json()["request_id"]
+
+        resp = await client.get(f"/v1/decide/{req_id}/wait", params={"timeout": 0.05})
+        assert resp.json() == {"request_id": req_id, "status": "PENDING", "event": None}
+
+        # Resolved directly in the store, as another worker sharing it would.
+        store.resolve_pending(req_id)
+        store.log_chain_event(req_id, "APPROVAL_STATUS", details={"status": "APPROVED"})
+        resp = await client.get(f"/v1/decide/{req_id}/wait", params={"timeout": 5})
+        assert resp.json()["status"] == "APPROVED"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_approval_errors(monkeypatch):
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/v1/decide/missing/wait")
+        assert resp.status_code == 404
+
+        resp = await client.get("/v1/decide?request_description=Test&context={}")
+        req_id = resp.json()["request_id"]
+        resp = await client.get(f"/v1/decide/{req_id}/wait")
+        assert resp.status_code == 409
+
+        resp = await client.get(f"/v1/decide/{req_id}/wait", params={"timeout": 10_000})
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_pending_endpoint_pages_and_expires_stale_entries(mock_rule_engine, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1", "name": "Grp", "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    mock_rule_engine.return_value = mock_response
+    store = DecisionStore(max_pending=3)
+    monkeypatch.setattr(app_module, "store", store)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        req_ids = []
+        for agent_id in ["agt_a", "agt_b", "agt_a", "agt_b"]:
+            resp = await client.post("/v1/decide", json={
+                "request_description": "NeedLaptop", "context": {"amount": 150},
+                "group_id": "g1", "agent_id": agent_id,
+            })
+            req_ids.append(resp.json()["request_id"])
+
+        # Over capacity: the oldest entry expired and fails closed.
+        chain = (await client.get(f"/v1/logs/chains/{req_ids[0]}")).json()
+        assert chain["events"][-1]["event_type"] == "APPROVAL_STATUS"
+        assert chain["events"][-1]["details"]["status"] == "EXPIRED"
+        assert chain["events"][-1]["details"]["reason"] == "capacity"
+        assert store.get_atomic_logs()[-1].decision == DecisionState.REJECTED
+        resp = await client.get(f"/v1/decide/{req_ids[0]}/wait", params={"timeout": 0})
+        assert resp.json()["status"] == "EXPIRED"
+
+        resp = await client.get("/v1/pending", params={"limit": 2})
+        assert [p["request_id"] for p in resp.json()] == req_ids[1:3]
+        resp = await client.get("/v1/pending", params={"limit": 2, "cursor": resp.headers["X-Next-Cursor"]})
+        assert [p["request_id"] for p in resp.json()] == req_ids[3:]
+        assert "X-Next-Cursor" not in resp.headers
+
+        resp = await client.get("/v1/pending", params={"agent_id": "agt_b", "group_id": "g1"})
+        assert [p["request_id"] for p in resp.json()] == [req_ids[1], req_ids[3]]
+
+        store.pending_ttl_seconds = 60
+        store.data.pending[req_ids[1]]["created_at"] = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        store._rebuild_indexes()
+        resp = await client.get("/v1/pending")
+        assert [p["request_id"] for p in resp.json()] == req_ids[2:]
+        chain = (await client.get(f"/v1/logs/chains/{req_ids[1]}")).json()
+        assert chain["events"][-1]["details"]["reason"] == "ttl"
+
+
+@pytest.mark.asyncio
+async def test_batch_approval_resolves_items_with_one_flush(mock_rule_engine, tmp_path, monkeypatch):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1", "name": "Grp", "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    mock_rule_engine.return_value = mock_response
+    store = DecisionStore(persistence_path=tmp_path / "store.json")
+    monkeypatch.setattr(app_module, "store", store)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        req_ids = []
+        for _ in range(3):
+            resp = await client.post("/v1/decide", json={
+                "request_description": "NeedLaptop", "context": {"amount": 150}, "group_id": "g1",
+            })
+            req_ids.append(resp.json()["request_id"])
+        await client.post(f"/v1/decide/{req_ids[0]}/approve", json={"approved": True, "approver": "Bob"})
+
+        with patch("decision_center.store.os.fsync") as fsync:
+            resp = await client.post("/v1/pending/approve", json={
+                "approved": False, "approver": "Alice", "request_ids": [*req_ids, "missing", "bad id"],
+            })
+        assert fsync.call_count == 1
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert [(r["request_id"], r["status_code"]) for r in results] == [
+            (req_ids[0], 409), (req_ids[1], 200), (req_ids[2], 200), ("missing", 404), ("bad id", 400),
+        ]
+        assert results[1]["final_state"] == "REJECTED"
+        assert results[0]["error"] == "Decision already resolved"
+        assert (await client.get("/v1/pending")).json() == []
+
+        chain = (await client.get(f"/v1/logs/chains/{req_ids[2]}")).json()
+        assert chain["events"][-1]["details"]["approver"] == "Alice"
+
+
+@pytest.mark.asyncio
+async def test_batch_approval_by_filter(mock_rule_engine, monkeypatch):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1", "name": "Grp", "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    mock_rule_engine.return_value = mock_response
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for agent_id in ["agt_a", "agt_b", "agt_a"]:
+            await client.post("/v1/decide", json={
+                "request_description": "NeedLaptop", "context": {"amount": 150},
+                "group_id": "g1", "agent_id": agent_id,
+            })
+
+        resp = await client.post("/v1/pending/approve", json={"approved": True, "approver": "Bob"})
+        assert resp.status_code == 400
+
+        resp = await client.post("/v1/pending/approve", json={"approved": True, "approver": "Bob", "agent_id": "agt_a"})
+        assert [r["final_state"] for r in resp.json()["results"]] == ["APPROVED", "APPROVED"]
+        assert [p["agent_id"] for p in (await client.get("/v1/pending")).json()] == ["agt_b"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_endpoints_report_rollups(mock_rule_engine, monkeypatch):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1", "name": "Grp", "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    mock_rule_engine.return_value = mock_response
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for amount in (50, 150):
+            resp = await client.post("/v1/decide", json={
+                "request_description": "NeedLaptop", "context": {"amount": amount}, "group_id": "g1", "agent_id": "agt_a",
+            })
+        await client.post(f"/v1/decide/{resp.json()['request_id']}/approve", json={"approved": False, "approver": "bob"})
+
+        resp = await client.get("/v1/analytics/outcomes", params={"by": "group_id", "granularity": "total"})
+        assert resp.json() == [{
+            "bucket": None, "group_id": "g1", "counts": {"APPROVED": 1, "APPROVAL_REQUIRED": 1, "REJECTED": 1}, "total": 3,
+        }]
+        resp = await client.get("/v1/analytics/rules", params={"by": "rule_id", "granularity": "total"})
+        assert resp.json() == [{"bucket": None, "rule_id": "r1", "counts": {"rule_logic": 1}, "total": 1}]
+        resp = await client.get("/v1/analytics/approvals", params={"granularity": "total"})
+        assert resp.json() == [{"bucket": None, "approver": "bob", "counts": {"REJECTED": 1}, "total": 1}]
+
+        resp = await client.get("/v1/analytics/outcomes", params={"by": "rule_id"})
+        assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_context_shaped_like_a_stored_reference_is_logged_verbatim(tmp_path, monkeypatch):
+    path = tmp_path / "decision_center_store.json"
+    monkeypatch.setattr(app_module, "store", DecisionStore(persistence_path=path))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.post("/v1/decide", json={"request_description": "A", "context": {"amount": 150}})
+        other_digest = app_module.store._contexts.digest_of(app_module.store.get_atomic_logs()[0].context)
+        contexts = [{"$context": "unknown"}, {"$context": other_digest}]
+        request_ids = []
+        for context in contexts:
+            resp = await client.post("/v1/decide", json={"request_description": "B", "context": context})
+            assert resp.status_code == 200
+            request_ids.append(resp.json()["request_id"])
+    assert first.status_code == 200
+
+    for store in (app_module.store, DecisionStore(persistence_path=path)):
+        logged = {entry.request_id: entry.context for entry in store.get_atomic_logs()}
+        for request_id, context in zip(request_ids, contexts):
+            assert logged[request_id] == context
+            assert store.get_chain(request_id).events[0].details["context"] == context
+
+
+@pytest.mark.asyncio
+async def test_every_decision_records_the_group_revision_and_staleness(monkeypatch):
+    import httpx
+    from decision_center import evaluator
+
+    rule = {"id": "r1", "name": "Cap", "rule_logic": "IF amount > 100 THEN REJECT"}
+    group = {"id": "audit-group", "revision": 7, "rules": [rule]}
+    responses = [httpx.Response(200, json=group, headers={"ETag": '"audit-group.7"'}), httpx.ConnectError("down")]
+
+    async def fake_fetch(group_id, etag=None):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    evaluator.invalidate_compiled_groups("audit-group")
+    monkeypatch.setattr(evaluator, "_fetch_group", fake_fetch)
+    monkeypatch.setattr(evaluator, "GROUP_CACHE_MAX_STALE_SECONDS", 300)
+    monkeypatch.setattr(app_module, "store", DecisionStore())
+
+    body = {"request_description": "A", "context": {"amount": 5}, "group_id": "audit-group"}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        fresh = await client.post("/v1/decide", json=body)
+        # The Rule Engine is down now; no rule matches, but the stale copy decides.
+        stale = await client.post("/v1/decide", json=body)
+
+    assert fresh.json()["group_versions"] == [{"group_id": "audit-group", "revision": 7, "stale_seconds": None}]
+    result = stale.json()
+    assert (result["outcome"], result["matched_rules"]) == ("APPROVE", [])
+    [version] = result["group_versions"]
+    assert (version["group_id"], version["revision"]) == ("audit-group", 7)
+    assert version["stale_seconds"] >= 0
+    evaluation = app_module.store.get_chain(result["request_id"]).events[1]
+    assert evaluation.event_type == "EVALUATION"
+    assert evaluation.details["group_versions"] == result["group_versions"]
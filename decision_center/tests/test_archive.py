@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+from decision_center.archive import BloomFilter, SegmentArchive
+from decision_center.models import AtomicLogEntry, DecisionState
+from decision_center.store import DecisionStore
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _log(store: DecisionStore, i: int, agent_id: str = "agt_a") -> None:
+    request_id = f"req-{i}"
+    store.log_atomic(AtomicLogEntry(
+        request_id=request_id, timestamp=BASE + timedelta(minutes=i), request_description="NeedLaptop",
+        context={"amount": i}, decision=DecisionState.APPROVED, agent_id=agent_id,
+    ))
+    store.log_chain_event(request_id, "REQUEST", details={"context": {"amount": i}, "agent_id": agent_id})
+
+
+def test_bloom_filter_round_trips_without_false_negatives():
+    bloom = BloomFilter(1000)
+    for i in range(100):
+        bloom.add(f"req-{i}")
+    restored = BloomFilter.from_json(bloom.to_json())
+    assert all(f"req-{i}" in restored for i in range(100))
+    assert sum(f"other-{i}" in restored for i in range(1000)) < 50
+
+
+def test_evicted_entries_are_read_back_from_the_archive(tmp_path):
+    store = DecisionStore(
+        max_atomic_logs=2, max_chains=2, archive_path=tmp_path / "archive",
+        archive_segment_records=2, archive_flush_records=1,
+    )
+    for i in range(6):
+        _log(store, i, agent_id="agt_a" if i % 2 else "agt_b")
+
+    assert store.get_chain("req-0").events[0].details["context"] == {"amount": 0}
+    assert store.get_chain("missing") is None
+    assert len(list((tmp_path / "archive").glob("atomic-*.ndjson.gz"))) == 2
+
+    # Without a since before the oldest entry in memory only memory is read.
+    page, _ = store.query_atomic_logs()
+    assert [entry.request_id for entry in page] == ["req-4", "req-5"]
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.query_atomic_logs(since=BASE, cursor=cursor, limit=2)
+        seen += [entry.request_id for entry in page]
+        if cursor is None:
+            break
+    assert seen == [f"req-{i}" for i in range(6)]
+
+    page, _ = store.query_atomic_logs(since=BASE + timedelta(minutes=1), until=BASE + timedelta(minutes=4), agent_id="agt_a")
+    assert [entry.request_id for entry in page] == ["req-1", "req-3"]
+    page, _ = store.query_chains(since=BASE, agent_id="agt_b")
+    assert [chain.request_id for chain in page] == ["req-0", "req-2", "req-4"]
+
+
+def test_resolving_an_evicted_chain_keeps_its_history(tmp_path):
+    store = DecisionStore(max_atomic_logs=2, max_chains=2, archive_path=tmp_path / "archive")
+    _log(store, 0)
+    store.log_chain_event("req-0", "EVALUATION", details={"decision": "ASK_FOR_APPROVAL"})
+    for i in range(1, 3):
+        _log(store, i)
+    store.log_chain_event("req-0", "APPROVAL_STATUS", details={"status": "APPROVED"})
+
+    history = ["REQUEST", "EVALUATION", "APPROVAL_STATUS"]
+    assert [event.event_type for event in store.get_chain("req-0").events] == history
+
+    # Evicting the resumed chain archives it with its full history.
+    for i in range(3, 5):
+        _log(store, i)
+    assert "req-0" not in store.data.chains
+    assert [event.event_type for event in store.get_chain("req-0").events] == history
+
+
+def test_archive_cursor_survives_further_evictions(tmp_path):
+    store = DecisionStore(max_atomic_logs=2, max_chains=2, archive_path=tmp_path / "archive")
+    for i in range(4):
+        _log(store, i)
+    page, cursor = store.query_atomic_logs(since=BASE, limit=1)
+    assert [entry.request_id for entry in page] == ["req-0"]
+
+    for i in range(4, 6):
+        _log(store, i)
+    page, cursor = store.query_atomic_logs(since=BASE, cursor=cursor)
+    assert [entry.request_id for entry in page] == [f"req-{i}" for i in range(1, 6)]
+    assert cursor is None
+
+
+def test_replayed_evictions_are_not_archived_twice(tmp_path):
+    options = {
+        "persistence_path": tmp_path / "store.json", "max_atomic_logs": 2, "max_chains": 2,
+        "archive_path": tmp_path / "archive", "archive_flush_records": 1,
+    }
+    store = DecisionStore(**options)
+    for i in range(5):
+        _log(store, i)
+    assert store._archive.archived("atomic") == 3
+
+    restored = DecisionStore(**options)
+    assert restored._archive.archived("atomic") == 3
+    _log(restored, 5)
+    restored.compact()
+
+    restored = DecisionStore(**options)
+    page, _ = restored.query_atomic_logs(since=BASE)
+    assert [entry.request_id for entry in page] == [f"req-{i}" for i in range(6)]
+
+
+def test_torn_segment_tail_is_truncated_on_open(tmp_path):
+    archive = SegmentArchive(tmp_path, flush_records=1)
+    archive.append("chains", "req-1", BASE, {"request_id": "req-1", "events": []})
+    with (tmp_path / "chains-00000001.ndjson.gz").open("ab") as fh:
+        fh.write(b"\x1f\x8b torn")
+
+    reopened = SegmentArchive(tmp_path)
+    assert reopened.archived("chains") == 1
+    assert reopened.find("chains", "req-1") == {"request_id": "req-1", "events": []}
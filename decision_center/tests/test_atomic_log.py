@@ -0,0 +1,84 @@
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from decision_center.atomic_log import AtomicLog
+from decision_center.models import AtomicLogEntry, DecisionState
+from decision_center.store import DecisionStore
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _entry(i: int, **fields) -> AtomicLogEntry:
+    return AtomicLogEntry(**{
+        "timestamp": BASE + timedelta(minutes=i),
+        "request_description": "NeedLaptop",
+        "context": {"amount": i},
+        "decision": DecisionState.APPROVED,
+        **fields,
+    })
+
+
+def test_entries_round_trip_through_the_columns():
+    log = AtomicLog(capacity=4)
+    entries = [
+        _entry(0, agent_id="agt_a", credential_id="cred_1", user_id="u1", effective_group_id="g1"),
+        _entry(1, request_id="custom-id", decision=DecisionState.REJECTED, effective_group_ids=["g1", "g2"]),
+        _entry(2, request_id="6F9619FF-8B86-D011-B42D-00C04FC964FF"),
+    ]
+    for entry in entries:
+        log.append(entry)
+
+    assert [entry.model_dump() for entry in log] == [entry.model_dump() for entry in entries]
+    assert log.get(0).context is entries[0].context
+    assert log.get(1).model_dump(mode="json")["decision"] == "REJECTED"
+
+
+def test_only_identity_columns_are_interned():
+    log = AtomicLog(capacity=1)
+    log.append(_entry(0, request_description="".join(["Need", "Laptop ", "#1"]), agent_id="".join(["agt", "_x"])))
+    entry = log.get(0)
+    assert entry.agent_id is sys.intern("agt_x")
+    assert entry.request_description is not sys.intern("NeedLaptop #1")
+
+
+def test_naive_timestamps_are_read_back_as_utc():
+    log = AtomicLog(capacity=1)
+    log.append(_entry(0, timestamp=datetime(2026, 1, 1, 12, 30, 0, 123456)))
+    assert log.get(0).timestamp == datetime(2026, 1, 1, 12, 30, 0, 123456, tzinfo=timezone.utc)
+
+
+def test_full_log_overwrites_the_oldest_slot():
+    log = AtomicLog(capacity=3)
+    entries = [_entry(i, request_id=f"req-{i}") if i % 2 else _entry(i) for i in range(7)]
+    evicted = [log.append(entry)[1] for entry in entries]
+
+    assert evicted[:3] == [None, None, None]
+    assert evicted[3:] == [entry.context for entry in entries[:4]]
+    assert (log.first_seq, log.next_seq, len(log)) == (4, 7, 3)
+    assert [entry.request_id for entry in log] == [entry.request_id for entry in entries[4:]]
+    with pytest.raises(IndexError):
+        log.get(3)
+
+
+def test_bisect_finds_the_first_entry_at_or_after_a_time():
+    log = AtomicLog(capacity=4)
+    for i in range(6):
+        log.append(_entry(i))
+    assert log.bisect(BASE) == 2
+    assert log.bisect(BASE + timedelta(minutes=3, seconds=30)) == 4
+    assert log.bisect(BASE + timedelta(hours=1)) == 6
+
+
+def test_store_pages_and_exports_across_the_wrap():
+    store = DecisionStore(max_atomic_logs=4)
+    for i in range(10):
+        store.log_atomic(_entry(i, agent_id="agt_a" if i % 2 else "agt_b"))
+
+    page, cursor = store.query_atomic_logs(agent_id="agt_a", limit=1)
+    assert [entry.context["amount"] for entry in page] == [7]
+    page, cursor = store.query_atomic_logs(agent_id="agt_a", cursor=cursor)
+    assert [entry.context["amount"] for entry in page] == [9]
+    assert cursor is None
+    assert [entry["context"]["amount"] for entry in store.export()["atomic_logs"]] == [6, 7, 8, 9]
@@ -566,3 +566,23 @@ def test_prompt_rule_creation_swap_datapoint(mock_get, mock_post, mock_translate
     _, post_kwargs = mock_post.call_args
     assert "delivery_time_days" in post_kwargs["json"]["rule_logic"]
     assert "account_age_days" not in post_kwargs["json"]["rule_logic"]
+
+
+def test_download_decision_log_streams_export_to_disk(tmp_path):
+    from decision_center.cli import download_decision_log
+
+    chunks = [b'{"type":"atomic_log"}\n', b'{"type":"pending"}\n']
+    response = MagicMock()
+    response.iter_bytes.return_value = iter(chunks)
+    stream = MagicMock()
+    stream.__enter__.return_value = response
+
+    output = tmp_path / "log.ndjson"
+    with patch("httpx.stream", return_value=stream) as mock_stream:
+        path = download_decision_log(str(output), base_url="http://dc/", export_format="ndjson")
+
+    assert path == str(output)
+    assert output.read_bytes() == b"".join(chunks)
+    mock_stream.assert_called_once_with(
+        "GET", "http://dc/v1/logs/export", params={"format": "ndjson"}, timeout=30
+    )
@@ -0,0 +1,60 @@
+import pytest
+
+from decision_center.coercion import (
+    ContextNormalizer,
+    _coerce_bool_strings,
+    _coerce_numeric_strings,
+)
+
+CONTEXT = {
+    "amount": "500",
+    "ratio": "0.25",
+    "flag": "TRUE",
+    "other_flag": "false",
+    "note": "needs review",
+    "count": 3,
+    "big": "1e5",
+    "padded": " 42 ",
+    "nested": {"a": "1"},
+    "missing": None,
+}
+
+DEFINITIONS = [
+    {"name": "amount", "type": "number"},
+    {"name": "ratio", "type": "number"},
+    {"name": "flag", "type": "boolean"},
+    {"name": "other_flag", "type": "number"},
+    {"name": "note", "type": "text"},
+    {"name": "padded", "type": "enum", "values": ["42"]},
+]
+
+
+def _legacy_coercion(context):
+    ctx = dict(context)
+    _coerce_bool_strings(ctx)
+    _coerce_numeric_strings(ctx)
+    return ctx
+
+
+@pytest.mark.parametrize("definitions", [[], DEFINITIONS])
+def test_normalizer_matches_per_rule_coercion(definitions):
+    normalized = ContextNormalizer(definitions)(CONTEXT)
+
+    expected = _legacy_coercion(CONTEXT)
+    assert dict(normalized) == expected
+    for key, value in expected.items():
+        assert type(normalized[key]) is type(value)
+
+
+def test_normalizer_returns_read_only_view_and_leaves_input_untouched():
+    context = {"amount": "500"}
+    normalized = ContextNormalizer()(context)
+
+    with pytest.raises(TypeError):
+        normalized["amount"] = 1
+    assert context == {"amount": "500"}
+
+
+def test_normalizer_ignores_unknown_datapoint_types():
+    normalized = ContextNormalizer([{"name": "amount", "type": "currency"}])({"amount": "5"})
+    assert normalized["amount"] == 5
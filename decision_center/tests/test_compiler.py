@@ -0,0 +1,100 @@
+import pytest
+from json_logic import jsonLogic
+
+import decision_center.evaluator  # noqa: F401  registers the strict operators
+from decision_center.compiler import CompiledGroupCache, compile_logic, compile_rule
+
+
+PARITY_CASES = [
+    ({"if": [{">": [{"var": "amount"}, 500]}, "REJECT", None]}, {"amount": 600}),
+    ({"if": [{">": [{"var": "amount"}, 500]}, "REJECT", None]}, {"amount": 400}),
+    ({"if": [{"==": [{"var": "partner"}, "Amazon"]}, "ASK_FOR_APPROVAL", None]}, {"partner": "AMAZON"}),
+    ({"if": [{"and": [{"==": [{"var": "a"}, 1]}, {"<=": [{"var": "b"}, 2]}]}, "APPROVE", "REJECT"]}, {"a": 1, "b": 3}),
+    ({"if": [{"or": [{"==": [{"var": "a"}, 1]}, {"==": [{"var": "b"}, True]}]}, "ASK_FOR_APPROVAL"]}, {"a": 2, "b": True}),
+    ({"if": [{"<": [{"var": "x"}, 0]}, "REJECT", {">": [{"var": "x"}, 9]}, "ASK_FOR_APPROVAL", "APPROVE"]}, {"x": 5}),
+    ({"if": [{"in": [{"var": "country"}, ["DE", "FR"]]}, "REJECT", None]}, {"country": "DE"}),
+    ({"if": [{">": [{"+": [{"var": "a"}, {"var": "b"}]}, 10]}, "REJECT", None]}, {"a": 4, "b": 7}),
+    ({"if": [{"==": [{"var": "nested.value"}, 3]}, "REJECT", None]}, {"nested": {"value": 3}}),
+    ({"if": [{"==": [{"var": ["missing_key", 0]}, 0]}, "APPROVE", None]}, {}),
+    ({"if": [{"!": [{"var": "flag"}]}, "REJECT", None]}, {"flag": False}),
+    ({"if": [{"some": [{"var": "items"}, {">": [{"var": ""}, 2]}]}, "REJECT", None]}, {"items": [1, 3]}),
+    ({"condition": {"==": [{"var": "a"}, 1]}, "outcome": "REJECT"}, {"a": 1}),
+]
+
+
+@pytest.mark.parametrize("logic,data", PARITY_CASES)
+def test_compiled_logic_matches_interpreter(logic, data):
+    assert compile_logic(logic)(data) == jsonLogic(logic, data)
+
+
+@pytest.mark.parametrize("logic,data", [
+    ({"if": [{"==": [{"var": "order_total_cost"}, 0]}, "REJECT", None]}, {}),
+    ({"if": [{">": [{"var": "amount"}, 500]}, "REJECT", None]}, {"amount": "lots"}),
+    ({"if": [{"==": [{"var": "status"}, "ACTIVE"]}, "APPROVE", None]}, {"status": 200}),
+])
+def test_compiled_logic_keeps_strict_operators_fail_closed(logic, data):
+    with pytest.raises((ValueError, TypeError)):
+        jsonLogic(logic, data)
+    with pytest.raises((ValueError, TypeError)):
+        compile_logic(logic)(data)
+
+
+@pytest.mark.parametrize("logic", [{"?:": [True, "a"]}, {"?:": [False, "a", "b", "c"]}, {"?:": True}])
+def test_compiled_ternary_with_wrong_arity_raises_like_the_interpreter(logic):
+    with pytest.raises(TypeError):
+        jsonLogic(logic, {})
+    with pytest.raises(TypeError):
+        compile_logic(logic)({})
+    assert compile_logic({"?:": [False, "a", "b"]})({}) == jsonLogic({"?:": [False, "a", "b"]}, {}) == "b"
+
+
+def test_compiled_logic_unknown_operator_raises_at_evaluation():
+    evaluate = compile_logic({"no_such_op": [1, 2]})
+    with pytest.raises(ValueError):
+        evaluate({})
+
+
+def test_compile_rule_handles_missing_edge_case_json():
+    rule = compile_rule({
+        "id": "r1",
+        "name": "Rule",
+        "rule_logic": "IF amount > 5 THEN REJECT",
+        "edge_cases": ["IF amount > 100 THEN REJECT"],
+        "edge_cases_json": [],
+    })
+    assert rule.evaluate is None
+    assert rule.edge_cases[0].evaluate is None
+    assert rule.active is True
+
+
+def _group(revision, rule_logic_json):
+    return {
+        "id": "g1",
+        "revision": revision,
+        "rules": [{"id": "r1", "name": "R", "rule_logic": "", "rule_logic_json": rule_logic_json}],
+    }
+
+
+def test_compiled_group_cache_reuses_plan_until_revision_changes():
+    cache = CompiledGroupCache()
+    first = cache.get("g1", _group(1, {"if": [True, "REJECT", None]}))
+    assert cache.get("g1", _group(1, {"if": [True, "REJECT", None]})) is first
+
+    second = cache.get("g1", _group(2, {"if": [True, "APPROVE", None]}))
+    assert second is not first
+    assert second.rules[0].evaluate({}) == "APPROVE"
+
+
+def test_compiled_group_cache_fingerprints_groups_without_revision():
+    cache = CompiledGroupCache()
+    first = cache.get("g1", {"rules": [{"id": "r1", "rule_logic_json": {"if": [True, "REJECT", None]}}]})
+    second = cache.get("g1", {"rules": [{"id": "r1", "rule_logic_json": {"if": [True, "APPROVE", None]}}]})
+    assert second is not first
+    assert second.rules[0].evaluate({}) == "APPROVE"
+
+
+def test_compiled_group_cache_is_bounded():
+    cache = CompiledGroupCache(max_groups=2)
+    for group_id in ("g1", "g2", "g3"):
+        cache.get(group_id, _group(1, {}))
+    assert len(cache) == 2
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from decision_center.contexts import ContextTable
+from decision_center.models import AtomicLogEntry, DecisionState
+from decision_center.sqlite_store import SQLiteDecisionStore
+from decision_center.store import DecisionStore
+
+BIG_CONTEXT = {"amount": 150, "notes": "x" * 5000, "items": [{"sku": i} for i in range(20)]}
+
+
+def _log_decision(store, request_id: str, context: dict) -> None:
+    """Log one context the way the app does: atomic entry, REQUEST event, pending."""
+    store.log_atomic(AtomicLogEntry(
+        request_id=request_id, request_description="NeedLaptop", context=context,
+        decision=DecisionState.APPROVAL_REQUIRED,
+    ))
+    store.log_chain_event(request_id, "REQUEST", details={"description": "NeedLaptop", "context": context})
+    store.add_pending(request_id, {"description": "NeedLaptop", "context": context})
+
+
+def test_context_table_distinguishes_values_that_compare_equal():
+    table = ContextTable()
+    one, one_digest, _ = table.intern({"flag": 1})
+    true, true_digest, _ = table.intern({"flag": True})
+    assert one_digest != true_digest
+    assert true["flag"] is True
+
+    again, digest, created = table.intern({"flag": 1})
+    assert (again, digest, created) == (one, one_digest, False)
+    table.release(one)
+    table.release(again)
+    assert one_digest not in table.blobs
+
+
+def test_memory_store_keeps_one_copy_per_context(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path, compact_every=1000)
+    _log_decision(store, "req-1", dict(BIG_CONTEXT))
+
+    assert len(store._contexts) == 1
+    context = store.get_atomic_logs()[0].context
+    assert store.get_chain("req-1").events[0].details["context"] is context
+    assert store.get_pending()[0]["context"] is context
+    assert store.journal_path.read_text().count("x" * 5000) == 1
+
+    store.compact()
+    assert path.read_text().count("x" * 5000) == 1
+    _log_decision(store, "req-2", dict(BIG_CONTEXT, amount=10))
+
+    restored = DecisionStore(persistence_path=path)
+    assert restored.get_atomic_logs()[0].context == BIG_CONTEXT
+    assert restored.get_chain("req-2").events[0].details["context"]["amount"] == 10
+    assert restored.get_pending()[0]["context"] == BIG_CONTEXT
+    assert len(restored._contexts) == 2
+    assert json.loads(json.dumps(restored.export()))["atomic_logs"][1]["context"]["amount"] == 10
+
+
+def test_memory_store_drops_contexts_once_unreferenced():
+    store = DecisionStore(max_atomic_logs=1, max_chains=1)
+    _log_decision(store, "req-1", {"amount": 1})
+    _log_decision(store, "req-2", {"amount": 2})
+    assert len(store._contexts) == 2
+
+    store.resolve_pending("req-1")
+    assert [context["amount"] for context in store._contexts.blobs.values()] == [2]
+
+
+def test_sqlite_store_keeps_one_copy_per_context(tmp_path):
+    store = SQLiteDecisionStore(tmp_path / "decision_center.sqlite3", max_atomic_logs=1, max_chains=1)
+    _log_decision(store, "req-1", dict(BIG_CONTEXT))
+    assert store._conn.execute("SELECT COUNT(*) FROM contexts").fetchone()[0] == 1
+
+    assert store.get_atomic_logs()[0].context == BIG_CONTEXT
+    assert store.get_chain("req-1").events[0].details["context"] == BIG_CONTEXT
+    assert store.get_pending()[0]["context"] == BIG_CONTEXT
+    items, _ = store.query_pending(limit=1)
+    assert items[0]["context"] == BIG_CONTEXT
+    assert store.export()["chains"]["req-1"]["events"][0]["details"]["context"] == BIG_CONTEXT
+
+    # Evicting the log entry and chain leaves the pending reference.
+    _log_decision(store, "req-2", {"amount": 2})
+    assert store._conn.execute("SELECT COUNT(*) FROM contexts").fetchone()[0] == 2
+    assert store.resolve_pending("req-1")["context"] == BIG_CONTEXT
+    assert store._conn.execute("SELECT COUNT(*) FROM contexts").fetchone()[0] == 1
+
+
+@pytest.mark.parametrize("intern_contexts", [True, False])
+def test_context_interning_can_be_disabled(tmp_path, intern_contexts):
+    store = DecisionStore(persistence_path=tmp_path / "store.json", intern_contexts=intern_contexts)
+    _log_decision(store, "req-1", dict(BIG_CONTEXT))
+    copies = store.journal_path.read_text().count("x" * 5000)
+    assert copies == (1 if intern_contexts else 3)
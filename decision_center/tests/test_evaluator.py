@@ -94,3 +94,248 @@ def test_evaluate_rule_coerces_string_numbers():
     assert evaluate_rule(rule_json, rule_str, {"amount": 600}) == "REJECT"
     assert evaluate_rule(rule_json, rule_str, {"amount": 400}) is None
 
+
+
+def test_map_missing_variables_aliases_by_containment_and_fuzzy_match():
+    from decision_center.evaluator import map_missing_variables
+
+    context = {"transaction_amount": 700, "aml_risk_scor": 80, "credit_score": 600}
+    rule_json = {"and": [
+        {">": [{"var": "amount"}, 500]},
+        {">": [{"var": "aml_risk_score"}, 50]},
+    ]}
+    map_missing_variables(rule_json, context)
+
+    assert context["amount"] == 700
+    assert context["aml_risk_score"] == 80
+
+
+def test_map_missing_variables_rejects_generic_suffix_matches():
+    from decision_center.evaluator import map_missing_variables
+
+    context = {"credit_score": 600}
+    map_missing_variables({">": [{"var": "aml_score"}, 50]}, context)
+
+    assert "aml_score" not in context
+
+
+def test_alias_cache_hits_for_repeated_context_shape():
+    from decision_center.evaluator import (
+        alias_cache_stats,
+        apply_variable_aliases,
+        resolve_variable_aliases,
+    )
+
+    resolve_variable_aliases.cache_clear()
+    rule_vars = frozenset({"amount"})
+
+    first = {"order_amount": 10, "country": "DE"}
+    apply_variable_aliases(rule_vars, first)
+    second = {"country": "FR", "order_amount": 20}
+    apply_variable_aliases(rule_vars, second)
+
+    assert first["amount"] == 10
+    assert second["amount"] == 20
+    stats = alias_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_alias_cache_skipped_when_context_has_all_vars():
+    from decision_center.evaluator import (
+        alias_cache_stats,
+        apply_variable_aliases,
+        resolve_variable_aliases,
+    )
+
+    resolve_variable_aliases.cache_clear()
+    apply_variable_aliases(frozenset({"amount"}), {"amount": 1})
+
+    assert alias_cache_stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_evaluate_request_shares_one_coerced_context_across_rules(monkeypatch):
+    from unittest.mock import MagicMock
+    from decision_center import evaluator
+
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {
+        "id": "coerce-group",
+        "datapoint_definitions": [{"name": "amount", "type": "number"}],
+        "rules": [
+            {"id": "r1", "name": "Alias", "rule_logic": "",
+             "rule_logic_json": {"if": [{">": [{"var": "total"}, 100]}, "ASK_FOR_APPROVAL", None]}},
+            {"id": "r2", "name": "Bool", "rule_logic": "",
+             "rule_logic_json": {"if": [{"==": [{"var": "vip"}, True]}, "APPROVE", None]}},
+            {"id": "r3", "name": "Legacy", "rule_logic": "IF vip == true THEN REJECT"},
+        ],
+    }
+
+    async def fake_fetch(group_id):
+        return response
+
+    monkeypatch.setattr(evaluator, "_fetch_group", fake_fetch)
+    context = {"total_amount": "150", "vip": "true"}
+
+    outcome, matched, _ = await evaluator.evaluate_request(context, "coerce-group")
+
+    assert matched == ["r1", "r2", "r3"]
+    assert outcome.value == "REJECT"
+    # The caller's context is never mutated by coercion or aliasing.
+    assert context == {"total_amount": "150", "vip": "true"}
+
+
+@pytest.mark.asyncio
+async def test_evaluate_request_with_rule_id_across_groups_only_evaluates_owning_group(monkeypatch):
+    from unittest.mock import MagicMock
+    from decision_center import evaluator
+
+    groups = {
+        "a": {"id": "a", "revision": 1, "rules": [{"id": "ra", "name": "A", "rule_logic": "IF amount > 1 THEN REJECT"}]},
+        "b": {"id": "b", "revision": 1, "rules": [{"id": "rb", "name": "B", "rule_logic": "IF amount > 1 THEN ASK_FOR_APPROVAL"}]},
+    }
+
+    async def fake_fetch(group_id):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = groups[group_id]
+        return response
+
+    monkeypatch.setattr(evaluator, "_fetch_group", fake_fetch)
+
+    outcome, matched, details = await evaluator.evaluate_request({"amount": 5}, ["a", "b"], rule_id="rb")
+    assert (outcome.value, matched) == ("ASK_FOR_APPROVAL", ["rb"])
+    assert details[0]["group_id"] == "b"
+
+    outcome, matched, _ = await evaluator.evaluate_request({"amount": 5}, ["a", "b"], rule_id="nope")
+    assert (outcome.value, matched) == ("ASK_FOR_APPROVAL", ["rule_not_found"])
+
+
+def _remote_group(monkeypatch, group_id, responses):
+    """Serve *group_id* from a list of responses (or exceptions); return the ETags sent."""
+    import httpx
+    from decision_center import evaluator
+
+    evaluator.invalidate_compiled_groups(group_id)
+    sent = []
+
+    async def fake_fetch(gid, etag=None):
+        sent.append(etag)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(evaluator, "_fetch_group", fake_fetch)
+    group = {"id": group_id, "revision": 7, "rules": [{"id": "r1", "name": "Cap", "rule_logic": "IF amount > 1 THEN REJECT"}]}
+    return sent, httpx.Response(200, json=group, headers={"ETag": f'"{group_id}.7"'})
+
+
+@pytest.mark.asyncio
+async def test_remote_group_is_revalidated_with_if_none_match(monkeypatch):
+    import httpx
+    from decision_center import evaluator
+
+    responses = []
+    sent, ok = _remote_group(monkeypatch, "etag-group", responses)
+    responses += [ok, httpx.Response(304, headers={"ETag": '"etag-group.7"'})]
+
+    first, _ = await evaluator.load_compiled_group("etag-group")
+    second, reasons = await evaluator.load_compiled_group("etag-group")
+
+    assert sent == [None, '"etag-group.7"']
+    assert second is first and reasons == []
+
+
+@pytest.mark.asyncio
+async def test_remote_group_within_ttl_is_not_fetched(monkeypatch):
+    from decision_center import evaluator
+
+    responses = []
+    sent, ok = _remote_group(monkeypatch, "ttl-group", responses)
+    responses.append(ok)
+    monkeypatch.setattr(evaluator, "GROUP_CACHE_TTL_SECONDS", 60)
+
+    await evaluator.load_compiled_group("ttl-group")
+    outcome, _, details = await evaluator.evaluate_request({"amount": 5}, "ttl-group")
+
+    assert sent == [None]
+    assert outcome.value == "REJECT"
+    assert details[0]["group_revision"] == 7
+    assert "stale_seconds" not in details[0]
+
+
+@pytest.mark.asyncio
+async def test_remote_group_served_stale_within_bound_when_rule_engine_fails(monkeypatch):
+    import httpx
+    from decision_center import evaluator
+
+    responses = []
+    _, ok = _remote_group(monkeypatch, "stale-group", responses)
+    responses += [ok, httpx.ConnectError("down"), httpx.Response(503)]
+    monkeypatch.setattr(evaluator, "GROUP_CACHE_MAX_STALE_SECONDS", 300)
+
+    await evaluator.load_compiled_group("stale-group")
+    outcome, _, details = await evaluator.evaluate_request({"amount": 5}, "stale-group")
+    assert outcome.value == "REJECT"
+    assert details[0]["group_revision"] == 7
+    assert details[0]["stale_seconds"] >= 0
+
+    monkeypatch.setattr(evaluator, "GROUP_CACHE_MAX_STALE_SECONDS", 0)
+    outcome, matched, _ = await evaluator.evaluate_request({"amount": 5}, "stale-group")
+    assert (outcome.value, matched) == ("ASK_FOR_APPROVAL", ["unreachable_or_missing_group"])
+
+
+@pytest.mark.asyncio
+async def test_remote_group_deleted_upstream_is_not_served_stale(monkeypatch):
+    import httpx
+    from decision_center import evaluator
+
+    responses = []
+    sent, ok = _remote_group(monkeypatch, "gone-group", responses)
+    responses += [ok, httpx.Response(404), ok]
+
+    await evaluator.load_compiled_group("gone-group")
+    compiled, reasons = await evaluator.load_compiled_group("gone-group")
+    assert (compiled, reasons) == (None, ["unreachable_or_missing_group"])
+
+    await evaluator.load_compiled_group("gone-group")
+    # The 404 dropped the cached copy, so the next fetch is unconditional.
+    assert sent == [None, '"gone-group.7"', None]
+
+
+@pytest.mark.asyncio
+async def test_local_rule_store_plans_are_reused_until_the_store_changes(monkeypatch):
+    from decision_center import evaluator
+    from rule_engine.models import BusinessRuleGroup, CreateRule, CreateRuleGroup
+    from rule_engine.store import RuleStore
+
+    monkeypatch.setattr(evaluator, "_local_rule_store", None)
+    store = RuleStore()
+    evaluator.use_local_rule_store(store)
+    group = store.create_group(CreateRuleGroup(name="Local"))
+    rule = store.add_rule(group.id, CreateRule(
+        name="Cap", feature="f", datapoints=["amount"], edge_cases=[], rule_logic="IF amount > 1 THEN REJECT",
+    ))
+
+    first, _ = await evaluator.load_compiled_group(group.id)
+    dumps = []
+    original_dump = BusinessRuleGroup.model_dump
+    monkeypatch.setattr(BusinessRuleGroup, "model_dump", lambda self, **kw: dumps.append(1) or original_dump(self, **kw))
+    outcome, _, _ = await evaluator.evaluate_request({"amount": 5}, group.id)
+    assert outcome.value == "REJECT"
+    assert (await evaluator.load_compiled_group(group.id))[0] is first
+    assert dumps == []
+
+    store.update_rule(group.id, rule.id, CreateRule(
+        name="Cap", feature="f", datapoints=["amount"], edge_cases=[], rule_logic="IF amount > 1 THEN APPROVE",
+    ))
+    outcome, _, details = await evaluator.evaluate_request({"amount": 5}, group.id)
+    assert outcome.value == "APPROVE"
+    assert details[0]["group_revision"] == store.get_group(group.id).revision
+    assert dumps == [1]
+
+    store.delete_group(group.id)
+    assert await evaluator.load_compiled_group(group.id) == (None, ["unreachable_or_missing_group"])
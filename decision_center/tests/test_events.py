@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+import pytest
+
+from decision_center.events import EventBroker, sse_stream
+
+
+def _frames(text):
+    frames = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        frames.append(fields)
+    return frames
+
+
+@pytest.mark.asyncio
+async def test_subscriber_receives_published_events():
+    broker = EventBroker()
+    stream = sse_stream(broker, heartbeat_seconds=5)
+    assert await stream.__anext__() == "retry: 3000\n\n"
+
+    next_frame = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    broker.publish("pending_added", {"request_id": "req-1"})
+    frame = _frames(await asyncio.wait_for(next_frame, 1))[0]
+
+    assert frame == {"id": "1", "event": "pending_added", "data": '{"request_id": "req-1"}'}
+    await stream.aclose()
+    assert broker.subscribers == set()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_and_is_told():
+    broker = EventBroker(queue_size=2)
+    subscription, _ = broker.subscribe()
+    for i in range(5):
+        broker.publish("atomic_log", {"n": i})
+
+    events, dropped = await subscription.next_batch(timeout=0)
+    assert [e.data["n"] for e in events] == [3, 4]
+    assert dropped == 3
+
+    broker = EventBroker(queue_size=1)
+    stream = sse_stream(broker, heartbeat_seconds=5)
+    await stream.__anext__()
+    for i in range(3):
+        broker.publish("atomic_log", {"n": i})
+    overflow = _frames(await asyncio.wait_for(stream.__anext__(), 1))[0]
+    latest = _frames(await asyncio.wait_for(stream.__anext__(), 1))[0]
+    assert overflow["event"] == "overflow" and json.loads(overflow["data"]) == {"dropped": 2}
+    assert latest["id"] == "3"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_resume_from_last_event_id_replays_history():
+    broker = EventBroker(history_size=3)
+    for i in range(5):
+        broker.publish("atomic_log", {"n": i})
+
+    subscription, complete = broker.subscribe(last_event_id=3)
+    events, _ = await subscription.next_batch(timeout=0)
+    assert complete is True
+    assert [e.id for e in events] == [4, 5]
+
+    # Event 2 has already left the three-entry history.
+    stream = sse_stream(broker, last_event_id=1, heartbeat_seconds=5)
+    await stream.__anext__()
+    frame = _frames(await asyncio.wait_for(stream.__anext__(), 1))[0]
+    assert frame["event"] == "reset" and frame["id"] == "5"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_heartbeat():
+    stream = sse_stream(EventBroker(), heartbeat_seconds=0.01)
+    await stream.__anext__()
+    assert await asyncio.wait_for(stream.__anext__(), 1) == ": keep-alive\n\n"
+    await stream.aclose()
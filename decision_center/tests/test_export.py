@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from decision_center import export
+from decision_center.models import AtomicLogEntry, DecisionState
+from decision_center.sqlite_store import SQLiteDecisionStore
+from decision_center.store import DecisionStore
+
+
+def _fill(store, count):
+    for i in range(count):
+        store.log_atomic(AtomicLogEntry(
+            request_id=f"req-{i}", request_description="x" * 2000, context={}, decision=DecisionState.APPROVAL_REQUIRED,
+        ))
+        store.log_chain_event(f"req-{i}", "REQUEST")
+        store.log_chain_event(f"req-{i}", "EVALUATION")
+    store.add_pending("req-0", {"description": "A"})
+
+
+async def _collect(store, **kwargs):
+    return [chunk async for chunk in export.stream_export(store, **kwargs)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+async def test_json_export_is_chunked_and_matches_store_shape(backend, tmp_path, monkeypatch):
+    store = DecisionStore() if backend == "memory" else SQLiteDecisionStore(tmp_path / "dc.sqlite3")
+    _fill(store, 50)
+    monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 16 * 1024)
+
+    chunks = await _collect(store)
+
+    assert len(chunks) > 1
+    payload = json.loads(b"".join(chunks))
+    assert payload == store.export()
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_emits_one_record_per_line():
+    store = DecisionStore()
+    _fill(store, 3)
+
+    lines = b"".join(await _collect(store, export_format="ndjson")).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+
+    assert [r["type"] for r in records] == ["atomic_log"] * 3 + ["chain_event"] * 6 + ["pending"]
+    assert records[3]["request_id"] == "req-0" and records[3]["event_type"] == "REQUEST"
+    assert records[-1] == {"type": "pending", "request_id": "req-0", "description": "A"}
+
+
+def test_iterators_page_through_the_store():
+    store = DecisionStore()
+    _fill(store, 12)
+
+    assert [e.request_id for e in export.iter_atomic_logs(store, page_size=5)] == [f"req-{i}" for i in range(12)]
+    assert len(list(export.iter_chains(store, page_size=5))) == 12
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from decision_center.sqlite_store import SQLiteDecisionStore
+from decision_center.store import DecisionStore
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _context(minutes: int, **kwargs) -> dict:
+    return {"description": "NeedLaptop", "created_at": (T0 + timedelta(minutes=minutes)).isoformat(), **kwargs}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "memory":
+            return DecisionStore(**kwargs)
+        return SQLiteDecisionStore(tmp_path / "decision_center.sqlite3", **kwargs)
+
+    return make
+
+
+def test_query_pending_pages_and_filters(make_store):
+    store = make_store()
+    for i in range(10):
+        store.add_pending(f"req-{i}", _context(
+            i,
+            agent_id=f"agt_{i % 2}",
+            effective_group_id=f"g{i % 3}",
+            effective_group_ids=[f"g{i % 3}", "shared"],
+        ))
+    store.resolve_pending("req-2")
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = store.query_pending(cursor=cursor, limit=3)
+        seen += [item["request_id"] for item in items]
+        if cursor is None:
+            break
+    assert seen == [f"req-{i}" for i in range(10) if i != 2]
+
+    items, _ = store.query_pending(agent_id="agt_0", group_id="g0")
+    assert [item["request_id"] for item in items] == ["req-0", "req-6"]
+    items, _ = store.query_pending(group_id="shared", limit=2)
+    assert [item["request_id"] for item in items] == ["req-0", "req-1"]
+    assert items[0]["agent_id"] == "agt_0"
+
+    with pytest.raises(ValueError):
+        store.query_pending(decision="APPROVED")
+
+
+def test_sweep_expires_by_ttl_and_escalates_once(make_store):
+    store = make_store(pending_ttl_seconds=3600, pending_escalate_after_seconds=600)
+    for i in range(3):
+        store.add_pending(f"req-{i}", _context(i * 30))
+
+    expired, escalated = store.sweep_pending(now=T0 + timedelta(minutes=15))
+    assert expired == []
+    assert [entry["request_id"] for entry in escalated] == ["req-0"]
+    assert store.get_pending()[0]["escalated_at"]
+
+    expired, escalated = store.sweep_pending(now=T0 + timedelta(minutes=45))
+    assert [entry["request_id"] for entry in escalated] == ["req-1"]
+
+    expired, escalated = store.sweep_pending(now=T0 + timedelta(minutes=95))
+    assert [(entry["request_id"], entry["expiry_reason"]) for entry in expired] == [("req-0", "ttl"), ("req-1", "ttl")]
+    assert expired[0]["description"] == "NeedLaptop"
+    assert [entry["request_id"] for entry in escalated] == ["req-2"]
+    assert [entry["request_id"] for entry in store.get_pending()] == ["req-2"]
+
+
+def test_pending_never_expires_by_default(make_store):
+    store = make_store()
+    store.add_pending("req-0", _context(0))
+
+    assert store.sweep_pending(now=T0 + timedelta(days=30)) == ([], [])
+    assert [entry["request_id"] for entry in store.get_pending()] == ["req-0"]
+
+
+def test_capacity_evicts_oldest_and_reports_it_on_sweep(make_store):
+    store = make_store(max_pending=2, pending_ttl_seconds=0)
+    for i in range(4):
+        store.add_pending(f"req-{i}", _context(i))
+
+    assert [entry["request_id"] for entry in store.get_pending()] == ["req-2", "req-3"]
+    expired, _ = store.sweep_pending(now=T0)
+    assert [(entry["request_id"], entry["expiry_reason"]) for entry in expired] == [
+        ("req-0", "capacity"), ("req-1", "capacity"),
+    ]
+    assert store.sweep_pending(now=T0) == ([], [])
+
+
+def test_expiry_and_escalation_survive_restart(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    settings = {"pending_ttl_seconds": 3600, "pending_escalate_after_seconds": 600}
+    store = DecisionStore(persistence_path=path, **settings)
+    store.add_pending("req-0", _context(0))
+    store.add_pending("req-1", _context(50))
+    store.add_pending("req-2", _context(55))
+    expired, escalated = store.sweep_pending(now=T0 + timedelta(minutes=61))
+    assert [entry["request_id"] for entry in expired] == ["req-0"]
+    assert [entry["request_id"] for entry in escalated] == ["req-1"]
+
+    restored = DecisionStore(persistence_path=path, **settings)
+    assert [entry["request_id"] for entry in restored.get_pending()] == ["req-1", "req-2"]
+    assert "escalated_at" in restored.get_pending()[0]
+    assert restored.sweep_pending(now=T0 + timedelta(minutes=61)) == ([], [])
+    _, escalated = restored.sweep_pending(now=T0 + timedelta(minutes=66))
+    assert [entry["request_id"] for entry in escalated] == ["req-2"]
+
+
+def test_pending_queue_compacts_resolved_entries():
+    store = DecisionStore(pending_ttl_seconds=0)
+    for i in range(500):
+        store.add_pending(f"req-{i}", _context(i, agent_id="agt_01"))
+    for i in range(0, 500, 5):
+        store.add_pending(f"keep-{i}", _context(i, agent_id="agt_01"))
+    for i in range(500):
+        store.resolve_pending(f"req-{i}")
+
+    queue = store._pending
+    assert len(queue._order) <= 2 * len(queue) + 64
+    items, _ = store.query_pending(agent_id="agt_01", limit=1000)
+    assert len(items) == 100
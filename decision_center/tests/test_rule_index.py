@@ -0,0 +1,134 @@
+import itertools
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from decision_center import evaluator
+from decision_center.compiler import compile_rule
+from decision_center.evaluator import evaluate_rule
+from decision_center.rule_index import RULE_LOGIC, RuleIndex
+
+
+def _rule(rule_id, rule_logic_json, edge_cases_json=()):
+    return {
+        "id": rule_id,
+        "name": rule_id,
+        "rule_logic": "",
+        "rule_logic_json": rule_logic_json,
+        "edge_cases": [f"edge {i}" for i in range(len(edge_cases_json))],
+        "edge_cases_json": list(edge_cases_json),
+    }
+
+
+def _guarded(case_type, then="ASK_FOR_APPROVAL"):
+    return {"if": [{"and": [{"==": [{"var": "case_type"}, case_type]}, {">": [{"var": "amount"}, 10]}]}, then, None]}
+
+
+def test_equality_guards_select_matching_bucket_case_insensitively():
+    rules = [compile_rule(_rule("refund", _guarded("refund_request"))), compile_rule(_rule("fraud", _guarded("fraud")))]
+    index = RuleIndex(rules)
+
+    assert index.candidate_units({"case_type": "REFUND_request"}) == {(0, RULE_LOGIC)}
+    assert index.candidate_units({"case_type": "other"}) == set()
+
+
+def test_missing_or_mistyped_guard_variable_keeps_rules_as_candidates():
+    rules = [compile_rule(_rule("refund", _guarded("refund_request"))), compile_rule(_rule("fraud", _guarded("fraud")))]
+    index = RuleIndex(rules)
+
+    everything = {(0, RULE_LOGIC), (1, RULE_LOGIC)}
+    assert index.candidate_units({}) == everything
+    assert index.candidate_units({"case_type": 3}) == everything
+
+
+def test_numeric_threshold_guards_use_sorted_bounds():
+    rules = [
+        compile_rule(_rule(f"gt{n}", {"if": [{">": [{"var": "amount"}, n]}, "REJECT", None]}))
+        for n in (100, 200, 300)
+    ] + [compile_rule(_rule("lte150", {"if": [{">=": [150, {"var": "amount"}]}, "APPROVE"]}))]
+    index = RuleIndex(rules)
+
+    assert index.candidate_units({"amount": 250}) == {(0, RULE_LOGIC), (1, RULE_LOGIC)}
+    assert index.candidate_units({"amount": 150}) == {(0, RULE_LOGIC), (3, RULE_LOGIC)}
+    assert len(index.candidate_units({"amount": "lots"})) == 4
+
+
+def test_rules_with_outcome_else_branch_or_non_guard_conditions_are_always_visited():
+    rules = [
+        compile_rule(_rule("else_ask", {"if": [{"==": [{"var": "case_type"}, "x"]}, "APPROVE", "ASK_FOR_APPROVAL"]})),
+        compile_rule(_rule("or", {"if": [{"or": [{"==": [{"var": "case_type"}, "x"]}]}, "REJECT", None]})),
+        compile_rule({"id": "legacy", "rule_logic": "IF amount > 1 THEN REJECT"}),
+    ]
+    index = RuleIndex(rules)
+
+    assert index.candidate_units({"case_type": "y", "amount": 0}) == {
+        (0, RULE_LOGIC), (1, RULE_LOGIC), (2, RULE_LOGIC),
+    }
+
+
+def _unindexed_decide(rules, context):
+    """The evaluation loop before the index: every rule, every unit."""
+    matched, outcomes = [], []
+    for r in rules:
+        hit = None
+        for ec_str, ec_json in zip(r["edge_cases"], r["edge_cases_json"]):
+            hit = evaluate_rule(ec_json, ec_str, context)
+            if hit:
+                break
+        if not hit:
+            hit = evaluate_rule(r["rule_logic_json"], r["rule_logic"], context)
+        if hit:
+            matched.append(r["id"])
+            outcomes.append(hit)
+    for outcome in ("REJECT", "ASK_FOR_APPROVAL"):
+        if outcome in outcomes:
+            return outcome, matched
+    return "APPROVE", matched
+
+
+def _support_pack_rules():
+    pack = json.loads(Path("rule_packs/support_company.json").read_text())
+    return [{"id": f"sc-{i}", **rule} for i, rule in enumerate(pack["rules"])]
+
+
+def _synthetic_rules():
+    rules = []
+    for i, case_type in enumerate(["refund_request", "account_update", "fraud"] * 4):
+        rules.append(_rule(
+            f"r{i}",
+            _guarded(case_type, then=["APPROVE", "REJECT", "ASK_FOR_APPROVAL"][i % 3]),
+            [{"if": [{">": [{"var": "amount"}, 100 * i]}, "REJECT", None]}],
+        ))
+    return rules
+
+
+CONTEXTS = [
+    dict(zip(("case_type", "amount", "risk_score", "refund_amount"), values))
+    for values in itertools.product(
+        ["refund_request", "FRAUD", "other", None, 7],
+        [5, "250", 2000, None, "lots"],
+        [10, 95],
+        [100, 900],
+    )
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rules_factory", [_support_pack_rules, _synthetic_rules])
+async def test_indexed_evaluation_matches_unindexed_loop(monkeypatch, rules_factory):
+    rules = rules_factory()
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"id": "indexed", "revision": rules_factory.__name__, "rules": rules}
+
+    async def fake_fetch(group_id):
+        return response
+
+    monkeypatch.setattr(evaluator, "_fetch_group", fake_fetch)
+
+    for raw in CONTEXTS:
+        context = {k: v for k, v in raw.items() if v is not None}
+        outcome, matched, _ = await evaluator.evaluate_request(context, "indexed")
+        assert (outcome.value, matched) == _unindexed_decide(rules, context), context
@@ -0,0 +1,139 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from unittest.mock import patch, MagicMock
+
+import decision_center.app as app_module
+from decision_center.app import app
+from decision_center.models import AtomicLogEntry, DecisionState
+from decision_center.sqlite_store import SQLiteDecisionStore
+from decision_center.store import create_decision_store
+
+
+def _entry(request_id: str, **kwargs) -> AtomicLogEntry:
+    return AtomicLogEntry(
+        request_id=request_id,
+        request_description="NeedLaptop",
+        context={"amount": 150},
+        decision=DecisionState.APPROVAL_REQUIRED,
+        **kwargs,
+    )
+
+
+def test_two_connections_share_logs_chains_and_pending(tmp_path):
+    path = tmp_path / "decision_center.sqlite3"
+    worker_a = SQLiteDecisionStore(path)
+    worker_b = SQLiteDecisionStore(path)
+
+    worker_a.log_atomic(_entry("req-1", agent_id="agt_01", effective_group_id="g1"))
+    worker_a.log_chain_event("req-1", "REQUEST", details={"description": "NeedLaptop"})
+    worker_a.add_pending("req-1", {"description": "NeedLaptop", "effective_group_id": "g1"})
+
+    assert worker_b.get_atomic_logs()[0].effective_group_id == "g1"
+    assert worker_b.get_chain("req-1").events[0].event_type == "REQUEST"
+    assert worker_b.get_pending() == [{"request_id": "req-1", "description": "NeedLaptop", "effective_group_id": "g1"}]
+
+    assert worker_b.resolve_pending("req-1") == {"description": "NeedLaptop", "effective_group_id": "g1"}
+    assert worker_a.resolve_pending("req-1") is None
+    assert worker_a.is_pending("req-1") is False
+
+
+def test_database_uses_wal_and_indexes_query_columns(tmp_path):
+    store = SQLiteDecisionStore(tmp_path / "decision_center.sqlite3")
+
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexed = set()
+    for index in store._conn.execute("PRAGMA index_list(atomic_logs)").fetchall():
+        indexed.update(row[2] for row in store._conn.execute(f"PRAGMA index_info({index[1]})"))
+    assert {"request_id", "agent_id", "effective_group_id", "decision", "timestamp"} <= indexed
+
+
+def test_retention_limits_are_applied(tmp_path):
+    store = SQLiteDecisionStore(tmp_path / "decision_center.sqlite3", max_atomic_logs=2, max_chains=2)
+
+    for i in range(3):
+        store.log_atomic(_entry(f"req-{i}"))
+        store.log_chain_event(f"req-{i}", "REQUEST")
+        store.log_chain_event(f"req-{i}", "EVALUATION")
+
+    assert [e.request_id for e in store.get_atomic_logs()] == ["req-1", "req-2"]
+    assert [c.request_id for c in store.get_all_chains()] == ["req-1", "req-2"]
+    assert store.get_chain("req-0") is None
+    assert len(store.get_chain("req-2").events) == 2
+
+
+def test_batch_commits_once_and_rolls_back_on_error(tmp_path):
+    store = SQLiteDecisionStore(tmp_path / "decision_center.sqlite3")
+
+    with store.batch():
+        store.log_chain_event("req-1", "REQUEST")
+        store.add_pending("req-1", {"description": "A"})
+    assert store.flush_stats()["flushes"] == 1
+
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.add_pending("req-2", {"description": "B"})
+            raise RuntimeError("boom")
+    assert store.is_pending("req-2") is False
+
+
+def test_create_decision_store_selects_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr("decision_center.store.SQLITE_PATH", str(tmp_path / "dc.sqlite3"))
+    assert isinstance(create_decision_store("sqlite"), SQLiteDecisionStore)
+    with pytest.raises(ValueError, match="Unknown decision store backend"):
+        create_decision_store("postgres")
+
+
+@pytest.mark.asyncio
+async def test_approval_on_another_worker_finds_chain(tmp_path, monkeypatch):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "id": "g1",
+        "name": "Grp",
+        "rules": [{"id": "r1", "rule_logic": "IF amount > 100 THEN ASK_FOR_APPROVAL"}],
+    }
+    path = tmp_path / "decision_center.sqlite3"
+
+    with patch("decision_center.evaluator._fetch_group", return_value=mock_response):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            monkeypatch.setattr(app_module, "store", SQLiteDecisionStore(path))
+            resp = await client.post("/v1/decide", json={
+                "request_description": "NeedLaptop",
+                "context": {"amount": 150},
+                "group_id": "g1",
+            })
+            req_id = resp.json()["request_id"]
+
+            monkeypatch.setattr(app_module, "store", SQLiteDecisionStore(path))
+            resp = await client.post(f"/v1/decide/{req_id}/approve", json={"approved": True, "approver": "Bob"})
+            assert resp.status_code == 200
+            resp = await client.post(f"/v1/decide/{req_id}/approve", json={"approved": True, "approver": "Bob"})
+            assert resp.status_code == 409
+
+            export = (await client.get("/v1/logs/export")).json()
+
+    assert [e["decision"] for e in export["atomic_logs"]] == ["APPROVAL_REQUIRED", "APPROVED"]
+    assert export["chains"][req_id]["events"][-1]["event_type"] == "APPROVAL_STATUS"
+    assert export["pending"] == {}
+
+
+def test_query_atomic_logs_and_chains_page_with_filters(tmp_path):
+    store = SQLiteDecisionStore(tmp_path / "decision_center.sqlite3")
+    for i in range(5):
+        store.log_atomic(_entry(f"req-{i}", agent_id="agt_a" if i % 2 else "agt_b", user_id="u1"))
+        store.log_chain_event(f"req-{i}", "REQUEST", details={"agent_id": "agt_a" if i % 2 else "agt_b"})
+
+    page, cursor = store.query_atomic_logs(limit=1, agent_id="agt_a", decision="APPROVAL_REQUIRED")
+    assert [e.request_id for e in page] == ["req-1"]
+    page, cursor = store.query_atomic_logs(cursor=cursor, limit=1, agent_id="agt_a")
+    assert [e.request_id for e in page] == ["req-3"]
+    assert cursor is None
+
+    page, cursor = store.query_chains(agent_id="agt_b", limit=2)
+    assert [c.request_id for c in page] == ["req-0", "req-2"]
+    page, cursor = store.query_chains(agent_id="agt_b", cursor=cursor)
+    assert [c.request_id for c in page] == ["req-4"]
+
+    first = store.get_atomic_logs()[0].timestamp
+    page, _ = store.query_atomic_logs(until=first)
+    assert [e.request_id for e in page] == ["req-0"]
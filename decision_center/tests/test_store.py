@@ -1,3 +1,9 @@
+import asyncio
+import json
+import time
+
+import pytest
+
 from decision_center.models import AtomicLogEntry, DecisionState
 from decision_center.store import DecisionStore
 
@@ -62,3 +68,254 @@ def test_corrupted_decision_store_raises(tmp_path):
         assert "Failed to parse decision store" in str(exc)
     else:
         raise AssertionError("Expected RuntimeError for corrupted decision store")
+
+
+def test_mutations_append_to_journal_without_rewriting_snapshot(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path, compact_every=100)
+
+    store.log_atomic(AtomicLogEntry(request_id="req-1", request_description="A", context={}, decision=DecisionState.APPROVED))
+    store.log_chain_event("req-1", "REQUEST", details={"description": "A"})
+    store.add_pending("req-1", {"description": "A"})
+    store.resolve_pending("req-1")
+
+    assert not path.exists()
+    journal = store.journal_path.read_text().splitlines()
+    assert [json.loads(line)["op"] for line in journal] == [
+        "atomic_log", "chain_event", "add_pending", "resolve_pending",
+    ]
+
+    restored = DecisionStore(persistence_path=path)
+    assert restored.get_atomic_logs()[0].request_id == "req-1"
+    assert restored.get_chain("req-1").events[0].timestamp == store.get_chain("req-1").events[0].timestamp
+    assert restored.is_pending("req-1") is False
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path, compact_every=3)
+
+    for i in range(4):
+        store.log_chain_event(f"req-{i}", "REQUEST")
+
+    assert json.loads(path.read_text())["journal_seq"] == 3
+    assert len(store.journal_path.read_text().splitlines()) == 1
+
+    restored = DecisionStore(persistence_path=path)
+    assert [c.request_id for c in restored.get_all_chains()] == ["req-0", "req-1", "req-2", "req-3"]
+
+
+def test_replay_skips_records_already_in_snapshot(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path, compact_every=100)
+    store.log_chain_event("req-1", "REQUEST")
+    journal = store.journal_path.read_text()
+
+    # Simulate a crash between writing the snapshot and truncating the journal.
+    store.compact()
+    store.journal_path.write_text(journal)
+
+    restored = DecisionStore(persistence_path=path)
+    assert len(restored.get_chain("req-1").events) == 1
+
+
+def test_torn_journal_tail_is_dropped_on_recovery(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path, compact_every=100)
+    store.add_pending("req-1", {"description": "A"})
+    with store.journal_path.open("a") as fh:
+        fh.write('{"op":"add_pending","request_id":"req-2"')
+
+    restored = DecisionStore(persistence_path=path)
+    assert restored.is_pending("req-1") is True
+    assert restored.is_pending("req-2") is False
+
+    restored.add_pending("req-3", {"description": "C"})
+    assert DecisionStore(persistence_path=path).is_pending("req-3") is True
+
+
+def test_batch_appends_one_journal_write(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path, compact_every=100)
+
+    with store.batch():
+        store.log_chain_event("req-1", "REQUEST")
+        store.log_chain_event("req-1", "EVALUATION")
+        assert not store.journal_path.exists()
+
+    assert len(store.journal_path.read_text().splitlines()) == 2
+
+
+@pytest.mark.asyncio
+async def test_group_commit_coalesces_concurrent_mutations(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(
+        persistence_path=path,
+        compact_every=100,
+        durability="group_commit",
+        group_commit_interval_ms=50,
+    )
+
+    async def decide(i: int):
+        store.log_chain_event(f"req-{i}", "REQUEST")
+        store.log_chain_event(f"req-{i}", "EVALUATION")
+        await store.commit()
+
+    await asyncio.gather(*(decide(i) for i in range(10)))
+
+    assert len(store.journal_path.read_text().splitlines()) == 20
+    stats = store.flush_stats()
+    assert stats["durability"] == "group_commit"
+    assert stats["flushes"] == 1
+    assert stats["records_flushed"] == 20
+    assert stats["queued_records"] == 0
+    assert stats["flush_ms_p99"] is not None
+
+    await store.aclose()
+    assert len(DecisionStore(persistence_path=path).get_all_chains()) == 10
+
+
+@pytest.mark.asyncio
+async def test_group_commit_flushes_early_at_max_records(tmp_path):
+    store = DecisionStore(
+        persistence_path=tmp_path / "store.json",
+        durability="group_commit",
+        group_commit_interval_ms=60_000,
+        group_commit_max_records=2,
+    )
+
+    store.log_chain_event("req-1", "REQUEST")
+    store.log_chain_event("req-1", "EVALUATION")
+    await asyncio.wait_for(store.commit(), timeout=5)
+
+    assert store.flush_stats()["flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_durability_does_not_wait_and_drains_on_close(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path, durability="async", group_commit_interval_ms=60_000)
+
+    store.add_pending("req-1", {"description": "A"})
+    await store.commit()
+    assert not store.journal_path.exists()
+
+    await store.aclose()
+    assert DecisionStore(persistence_path=path).is_pending("req-1") is True
+
+
+@pytest.mark.asyncio
+async def test_failed_background_writes_back_off_and_are_reported(tmp_path, monkeypatch):
+    store = DecisionStore(persistence_path=tmp_path / "store.json", durability="async", group_commit_interval_ms=1)
+    write_records = store._write_records
+    attempts = []
+
+    def failing_write(records):
+        attempts.append(time.perf_counter())
+        if len(attempts) <= 3:
+            raise OSError("No space left on device")
+        write_records(records)
+
+    monkeypatch.setattr(store, "_write_records", failing_write)
+    store.add_pending("req-1", {"description": "A"})
+    while len(attempts) < 3:
+        await asyncio.sleep(0.001)
+
+    stats = store.flush_stats()
+    assert stats["write_failures"] == 3
+    assert stats["last_write_error"] == "OSError: No space left on device"
+    assert stats["retry_delay_ms"] == 8
+    assert stats["queued_records"] == 1
+    assert attempts[2] - attempts[1] >= 0.004
+
+    await store.aclose()
+    stats = store.flush_stats()
+    assert len(attempts) == 4
+    assert (stats["write_failures"], stats["last_write_error"], stats["retry_delay_ms"]) == (0, None, None)
+    assert stats["queued_records"] == 0
+
+
+def test_unknown_durability_mode_is_rejected():
+    with pytest.raises(ValueError, match="durability"):
+        DecisionStore(durability="eventually")
+
+
+def _log(store, request_id, decision=DecisionState.APPROVED, **identity):
+    store.log_atomic(AtomicLogEntry(
+        request_id=request_id, request_description="A", context={}, decision=decision, **identity,
+    ))
+
+
+def test_query_atomic_logs_pages_through_filtered_entries():
+    store = DecisionStore()
+    for i in range(10):
+        _log(store, f"req-{i}", agent_id="agt_a" if i % 2 else "agt_b", user_id="u1")
+
+    page, cursor = store.query_atomic_logs(limit=2, agent_id="agt_a")
+    assert [e.request_id for e in page] == ["req-1", "req-3"]
+    page, cursor = store.query_atomic_logs(cursor=cursor, limit=2, agent_id="agt_a")
+    assert [e.request_id for e in page] == ["req-5", "req-7"]
+    page, cursor = store.query_atomic_logs(cursor=cursor, limit=2, agent_id="agt_a")
+    assert [e.request_id for e in page] == ["req-9"]
+    assert cursor is None
+
+    page, _ = store.query_atomic_logs(agent_id="agt_b", user_id="nobody")
+    assert page == []
+
+
+def test_query_atomic_logs_filters_decision_and_time_range():
+    from datetime import datetime, timedelta, timezone
+
+    store = DecisionStore()
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(5):
+        store.log_atomic(AtomicLogEntry(
+            request_id=f"req-{i}",
+            timestamp=base + timedelta(minutes=i),
+            request_description="A",
+            context={},
+            decision=DecisionState.REJECTED if i % 2 else DecisionState.APPROVED,
+        ))
+
+    page, _ = store.query_atomic_logs(since=base + timedelta(minutes=1), until=base + timedelta(minutes=3))
+    assert [e.request_id for e in page] == ["req-1", "req-2", "req-3"]
+    page, _ = store.query_atomic_logs(decision="REJECTED", since=datetime(2026, 1, 1, 0, 2))
+    assert [e.request_id for e in page] == ["req-3"]
+
+
+def test_query_cursors_survive_eviction():
+    store = DecisionStore(max_atomic_logs=3, max_chains=3)
+    for i in range(3):
+        _log(store, f"req-{i}", agent_id="agt_a")
+        store.log_chain_event(f"req-{i}", "REQUEST", details={"agent_id": "agt_a"})
+
+    _, cursor = store.query_atomic_logs(limit=1, agent_id="agt_a")
+    _, chain_cursor = store.query_chains(limit=1, agent_id="agt_a")
+    for i in range(3, 6):
+        _log(store, f"req-{i}", agent_id="agt_a")
+        store.log_chain_event(f"req-{i}", "REQUEST", details={"agent_id": "agt_a"})
+
+    page, _ = store.query_atomic_logs(cursor=cursor, agent_id="agt_a")
+    assert [e.request_id for e in page] == ["req-3", "req-4", "req-5"]
+    page, _ = store.query_chains(cursor=chain_cursor)
+    assert [c.request_id for c in page] == ["req-3", "req-4", "req-5"]
+
+
+def test_query_chains_filters_on_first_event_identity(tmp_path):
+    path = tmp_path / "decision_center_store.json"
+    store = DecisionStore(persistence_path=path)
+    store.log_chain_event("req-1", "REQUEST", details={"agent_id": "agt_a", "effective_group_id": "g1"})
+    store.log_chain_event("req-2", "REQUEST", details={"agent_id": "agt_b", "effective_group_id": "g1"})
+    store.log_chain_event("req-1", "EVALUATION", details={"agent_id": "agt_b"})
+
+    restored = DecisionStore(persistence_path=path)
+    page, _ = restored.query_chains(agent_id="agt_a")
+    assert [c.request_id for c in page] == ["req-1"]
+    assert len(page[0].events) == 2
+    page, _ = restored.query_chains(effective_group_id="g1", limit=5)
+    assert [c.request_id for c in page] == ["req-1", "req-2"]
+
+
+def test_query_rejects_bad_cursor():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        DecisionStore().query_atomic_logs(cursor="abc")
@@ -51,9 +51,8 @@ async def run_scenario(
         resp.raise_for_status()
         group_id = resp.json()["id"]
 
-        for rule in scenario.rules:
-            rule_resp = await _re_post(f"/v1/groups/{group_id}/rules", json=rule)
-            rule_resp.raise_for_status()
+        rule_resp = await _re_post(f"/v1/groups/{group_id}/rules:bulk", json=list(scenario.rules))
+        rule_resp.raise_for_status()
 
         for i, (step, assertion) in enumerate(
             zip(scenario.workflow, scenario.receipt_assertions)
@@ -2,8 +2,10 @@ import pytest
 import httpx
 from httpx import ASGITransport
 
+import decision_center.app as dc_app_module
 import decision_center.evaluator as evaluator_module
-from decision_center.app import app as dc_app, store as dc_store
+from decision_center.app import app as dc_app
+from decision_center.store import DecisionStore
 from rule_engine.app import app as re_app, store as re_store
 
 from evals.agent_eval.runner import run_scenario
@@ -11,17 +13,12 @@ from evals.agent_eval.models import AgentScenario, WorkflowStep, ReceiptAssertio
 
 
 @pytest.fixture(autouse=True)
-def reset_stores():
+def reset_stores(monkeypatch):
     """Reset in-memory stores before each test."""
     re_store.groups.clear()
-    dc_store.data.atomic_logs.clear()
-    dc_store.data.chains.clear()
-    dc_store.data.pending.clear()
+    monkeypatch.setattr(dc_app_module, "store", DecisionStore())
     yield
     re_store.groups.clear()
-    dc_store.data.atomic_logs.clear()
-    dc_store.data.chains.clear()
-    dc_store.data.pending.clear()
 
 
 @pytest.fixture
@@ -34,8 +31,9 @@ async def clients(monkeypatch):
     dc_client = httpx.AsyncClient(transport=dc_transport, base_url="http://test-dc")
 
     # Patch _fetch_group to use in-process rule engine
-    async def mock_fetch_group(group_id: str):
-        return await re_client.get(f"/v1/groups/{group_id}")
+    async def mock_fetch_group(group_id: str, etag: str | None = None):
+        headers = {"If-None-Match": etag} if etag else None
+        return await re_client.get(f"/v1/groups/{group_id}", headers=headers)
 
     monkeypatch.setattr(evaluator_module, "_fetch_group", mock_fetch_group)
 
@@ -55,6 +55,8 @@ You are connected to Unreal Objects — a non-negotiable business rule guardrail
      ASK_FOR_APPROVAL → stop; tell the user what you wanted to do and why approval is needed.
                         Call submit_approval(request_id, approved, approver) with the
                         human's decision, then proceed only if approved=true.
+                        If the human approves elsewhere (e.g. the dashboard), call
+                        wait_for_approval(request_id) and proceed only on APPROVED.
 
 4. NEVER skip evaluate_action, reframe a rejected action to get a different outcome,
    or proceed after a REJECT. The guardrail decision is final.
@@ -363,6 +365,7 @@ async def evaluate_action(
     ctx: Context,
     group_id: str = None,
     user_id: str = None,
+    group_ids: list[str] = None,
 ):
     """Evaluate a planned action against business rules before executing it.
 
@@ -373,8 +376,10 @@ async def evaluate_action(
         request_description: Plain-English description of what you want to do.
         context_json: JSON string with the relevant data (e.g. recipient, amount).
         group_id: Rule group to evaluate against. If omitted, uses the server default.
+        group_ids: Additional rule groups. All groups are evaluated in one decision
+            and the most restrictive outcome wins.
     """
-    await ctx.info(f"evaluate_action called: group_id={group_id}")
+    await ctx.info(f"evaluate_action called: group_id={group_id}, group_ids={group_ids}")
 
     if len(context_json.encode("utf-8")) > MAX_CONTEXT_JSON_BYTES:
         return _invalid_input(
@@ -395,6 +400,8 @@ async def evaluate_action(
             return _invalid_input("user_id is required when agent auth is enabled")
         try:
             effective_group = _effective_group_id(group_id, principal)
+            for extra_group in group_ids or []:
+                _effective_group_id(extra_group, principal)
         except ValueError as exc:
             return _invalid_input(str(exc))
         payload = {
@@ -406,6 +413,16 @@ async def evaluate_action(
             "user_id": user_id,
             "scope": " ".join(principal.scopes),
         }
+        if group_ids:
+            payload["group_ids"] = group_ids
+        resp = await clients.decision_center.post("/v1/decide", json=payload)
+    elif group_ids:
+        payload = {
+            "request_description": request_description,
+            "context": parsed_context,
+            "group_id": _effective_group_id(group_id, None),
+            "group_ids": group_ids,
+        }
         resp = await clients.decision_center.post("/v1/decide", json=payload)
     else:
         params = {
@@ -442,6 +459,29 @@ async def submit_approval(request_id: str, approved: bool, approver: str, ctx: C
     return resp.json()
 
 
+@mcp.tool(annotations=ToolAnnotations(readOnlyHint=True, openWorldHint=True))
+@fail_closed
+async def wait_for_approval(request_id: str, ctx: Context, timeout_seconds: float = 30):
+    """Wait for a human to approve or reject a pending ASK_FOR_APPROVAL outcome.
+
+    Returns {"status": "APPROVED" | "REJECTED" | "EXPIRED" | "PENDING", ...}.
+    PENDING means the timeout passed without a decision; call again to keep
+    waiting. EXPIRED means nobody decided in time. Proceed only on APPROVED.
+    """
+    await ctx.info(f"wait_for_approval called: request_id={request_id}, timeout={timeout_seconds}")
+    if timeout_seconds < 0:
+        return _invalid_input("timeout_seconds must not be negative")
+    clients = _clients(ctx)
+    resp = await clients.decision_center.get(
+        f"/v1/decide/{request_id}/wait",
+        params={"timeout": timeout_seconds},
+        timeout=httpx.Timeout(timeout_seconds + BACKEND_TIMEOUT.read, connect=BACKEND_TIMEOUT.connect),
+    )
+    resp.raise_for_status()
+    await ctx.debug(f"wait_for_approval status={resp.json().get('status')}")
+    return resp.json()
+
+
 @mcp.tool(annotations=ToolAnnotations(readOnlyHint=True, openWorldHint=True))
 @fail_closed
 async def list_rule_groups(ctx: Context):
@@ -468,15 +508,52 @@ async def get_rule_group(group_id: str, ctx: Context):
 
 @mcp.tool(annotations=ToolAnnotations(readOnlyHint=True, openWorldHint=True))
 @fail_closed
-async def get_decision_log(log_type: str, ctx: Context, request_id: str = None):
+async def get_decision_log(
+    log_type: str,
+    ctx: Context,
+    request_id: str = None,
+    limit: int = None,
+    cursor: str = None,
+    agent_id: str = None,
+    user_id: str = None,
+    group_id: str = None,
+    decision: str = None,
+    since: str = None,
+    until: str = None,
+):
     """Retrieve decision logs.
 
     Args:
         log_type: 'atomic' (all decisions), 'chains' (all chains), or 'chain' (one chain by request_id).
         request_id: Required when log_type is 'chain'.
+        limit: Page size for 'atomic' and 'chains'. When paging or filtering, the result is
+            {"items": [...], "next_cursor": ...}; pass next_cursor back as cursor for the next page.
+        cursor: Cursor returned by the previous page.
+        agent_id, user_id, group_id: Only return entries for this agent, user or effective rule group.
+        decision: 'atomic' only: APPROVED, REJECTED or APPROVAL_REQUIRED.
+        since, until: ISO 8601 timestamps bounding the entries returned.
     """
     await ctx.info(f"get_decision_log called: log_type={log_type}")
 
+    params = {
+        key: value
+        for key, value in {
+            "limit": limit,
+            "cursor": cursor,
+            "agent_id": agent_id,
+            "user_id": user_id,
+            "effective_group_id": group_id,
+            "decision": decision,
+            "since": since,
+            "until": until,
+        }.items()
+        if value is not None
+    }
+    if params and log_type not in ("atomic", "chains"):
+        return _invalid_input("Pagination and filters apply only to log_type 'atomic' or 'chains'")
+    if decision is not None and log_type != "atomic":
+        return _invalid_input("decision filter applies only to log_type 'atomic'")
+
     if log_type == "atomic":
         url = "/v1/logs/atomic"
     elif log_type == "chains":
@@ -489,22 +566,59 @@ async def get_decision_log(log_type: str, ctx: Context, request_id: str = None):
         return _invalid_input(f"Invalid log_type: {log_type}. Must be 'atomic', 'chains', or 'chain'.")
 
     clients = _clients(ctx)
-    resp = await clients.decision_center.get(url)
+    if not params:
+        resp = await clients.decision_center.get(url)
+        resp.raise_for_status()
+        await ctx.debug("get_decision_log success")
+        return resp.json()
+
+    resp = await clients.decision_center.get(url, params=params)
     resp.raise_for_status()
     await ctx.debug("get_decision_log success")
-    return resp.json()
+    return {"items": resp.json(), "next_cursor": resp.headers.get("X-Next-Cursor")}
 
 
 @mcp.tool(annotations=ToolAnnotations(readOnlyHint=True, openWorldHint=True))
 @fail_closed
-async def get_pending(ctx: Context):
-    """List all actions currently awaiting human approval."""
+async def get_pending(
+    ctx: Context,
+    limit: int = None,
+    cursor: str = None,
+    agent_id: str = None,
+    user_id: str = None,
+    group_id: str = None,
+):
+    """List actions currently awaiting human approval, oldest first.
+
+    Args:
+        limit: Page size. When paging or filtering, the result is
+            {"items": [...], "next_cursor": ...}; pass next_cursor back as cursor for the next page.
+        cursor: Cursor returned by the previous page.
+        agent_id, user_id, group_id: Only return approvals for this agent, user or rule group.
+    """
     await ctx.info("get_pending called")
+    params = {
+        key: value
+        for key, value in {
+            "limit": limit,
+            "cursor": cursor,
+            "agent_id": agent_id,
+            "user_id": user_id,
+            "group_id": group_id,
+        }.items()
+        if value is not None
+    }
     clients = _clients(ctx)
-    resp = await clients.decision_center.get("/v1/pending")
+    if not params:
+        resp = await clients.decision_center.get("/v1/pending")
+        resp.raise_for_status()
+        await ctx.debug("get_pending success")
+        return resp.json()
+
+    resp = await clients.decision_center.get("/v1/pending", params=params)
     resp.raise_for_status()
     await ctx.debug("get_pending success")
-    return resp.json()
+    return {"items": resp.json(), "next_cursor": resp.headers.get("X-Next-Cursor")}
 
 
 # ---------------------------------------------------------------------------
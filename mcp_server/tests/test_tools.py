@@ -12,6 +12,7 @@ from mcp_server.server import (
     get_rule_group,
     evaluate_action,
     submit_approval,
+    wait_for_approval,
     get_decision_log,
     get_pending,
     guardrail_heartbeat,
@@ -176,6 +177,45 @@ async def test_evaluate_action_uses_authenticated_principal_and_posts_identity(m
     assert payload["group_id"] == "grp_finance"
 
 
+@pytest.mark.asyncio
+async def test_evaluate_action_forwards_allowed_group_ids(monkeypatch):
+    dc = AsyncMock()
+    dc.post.return_value = _mock_response(200, {"request_id": "req-multi", "outcome": "REJECT", "matched_rules": []})
+    ctx = _mock_ctx(dc_client=dc)
+    monkeypatch.setattr(server_module, "_AUTH_ENABLED", True)
+
+    async with principal_context(
+        AuthenticatedPrincipal(
+            agent_id="agt_ops_01",
+            credential_id="cred_finance_a",
+            scopes=["finance:execute"],
+            default_group_id="grp_finance",
+            allowed_group_ids=["grp_finance", "grp_safety"],
+        )
+    ):
+        res = await evaluate_action(
+            request_description="Ship order",
+            context_json='{"amount": 50}',
+            user_id="user_4821",
+            group_ids=["grp_safety"],
+            ctx=ctx,
+        )
+        denied = await evaluate_action(
+            request_description="Ship order",
+            context_json='{"amount": 50}',
+            user_id="user_4821",
+            group_ids=["grp_other"],
+            ctx=ctx,
+        )
+
+    assert res["outcome"] == "REJECT"
+    payload = dc.post.call_args.kwargs["json"]
+    assert payload["group_id"] == "grp_finance"
+    assert payload["group_ids"] == ["grp_safety"]
+    assert denied["reason"] == "INVALID_INPUT"
+    dc.post.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_evaluate_action_accepts_group_id_as_fourth_positional_argument():
     """Verify that with the new signature (ctx before group_id), group_id can be passed positionally."""
@@ -204,6 +244,29 @@ async def test_submit_approval():
     assert res["status"] == "success"
 
 
+@pytest.mark.asyncio
+async def test_wait_for_approval_passes_timeout():
+    dc = AsyncMock()
+    dc.get.return_value = _mock_response(200, {"request_id": "req-1", "status": "APPROVED", "event": {}})
+    ctx = _mock_ctx(dc_client=dc)
+    res = await wait_for_approval("req-1", ctx=ctx, timeout_seconds=10)
+    assert res["status"] == "APPROVED"
+    args, kwargs = dc.get.call_args
+    assert args[0] == "/v1/decide/req-1/wait"
+    assert kwargs["params"] == {"timeout": 10}
+    # The HTTP timeout must outlast the server-side wait.
+    assert kwargs["timeout"].read > 10
+
+
+@pytest.mark.asyncio
+async def test_wait_for_approval_rejects_negative_timeout():
+    dc = AsyncMock()
+    ctx = _mock_ctx(dc_client=dc)
+    res = await wait_for_approval("req-1", ctx=ctx, timeout_seconds=-1)
+    assert res["reason"] == "INVALID_INPUT"
+    dc.get.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_decision_log_atomic():
     dc = AsyncMock()
@@ -234,6 +297,27 @@ async def test_get_decision_log_chain_with_request_id():
     dc.get.assert_called_once_with("/v1/logs/chains/req-1")
 
 
+@pytest.mark.asyncio
+async def test_get_decision_log_paginates_with_filters():
+    dc = AsyncMock()
+    response = _mock_response(200, [{"request_id": "req-1"}])
+    response.headers = {"X-Next-Cursor": "7"}
+    dc.get.return_value = response
+    ctx = _mock_ctx(dc_client=dc)
+    res = await get_decision_log(log_type="atomic", limit=1, agent_id="agt_01", group_id="g1", ctx=ctx)
+    assert res == {"items": [{"request_id": "req-1"}], "next_cursor": "7"}
+    dc.get.assert_called_once_with(
+        "/v1/logs/atomic", params={"limit": 1, "agent_id": "agt_01", "effective_group_id": "g1"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_decision_log_rejects_filters_for_single_chain():
+    ctx = _mock_ctx()
+    res = await get_decision_log(log_type="chain", request_id="req-1", limit=5, ctx=ctx)
+    assert res["reason"] == "INVALID_INPUT"
+
+
 @pytest.mark.asyncio
 async def test_get_decision_log_invalid_log_type():
     ctx = _mock_ctx()
@@ -262,6 +346,18 @@ async def test_get_pending():
     assert res[0]["status"] == "pending"
 
 
+@pytest.mark.asyncio
+async def test_get_pending_paginates_with_filters():
+    dc = AsyncMock()
+    response = _mock_response(200, [{"request_id": "req-1"}])
+    response.headers = {"X-Next-Cursor": "4"}
+    dc.get.return_value = response
+    ctx = _mock_ctx(dc_client=dc)
+    res = await get_pending(ctx=ctx, limit=1, group_id="g1")
+    assert res == {"items": [{"request_id": "req-1"}], "next_cursor": "4"}
+    dc.get.assert_called_once_with("/v1/pending", params={"limit": 1, "group_id": "g1"})
+
+
 # ---------------------------------------------------------------------------
 # Input validation: evaluate_action
 # ---------------------------------------------------------------------------
@@ -1,7 +1,8 @@
 """Tool Creation Agent — FastAPI service on port 8003.
 
 Workflow:
-1. Rule Engine fires POST /v1/webhook/rule-created whenever a rule is created.
+1. Rule Engine fires POST /v1/webhook/rule-created whenever a rule is created
+   (POST /v1/webhook/rules-created once per bulk import).
 2. Agent asks an LLM: does this rule require a new guarded_ MCP tool?
 3. If yes: generate tool code → evaluate against "Unreal Objects System" meta-rule
    (always routes to ASK_FOR_APPROVAL — no auto-writes).
@@ -142,6 +143,10 @@ class RuleCreatedPayload(BaseModel):
     datapoints: list[str]
 
 
+class RulesCreatedPayload(BaseModel):
+    rules: list[RuleCreatedPayload]
+
+
 class ReviewDecision(BaseModel):
     approved: bool
     reviewer: str
@@ -435,6 +440,11 @@ async def {tool_name}(
 # Background task: analyze + store proposal
 # ---------------------------------------------------------------------------
 
+async def _process_rules(rules: list[RuleCreatedPayload]) -> None:
+    for rule in rules:
+        await _process_rule(rule)
+
+
 async def _process_rule(rule: RuleCreatedPayload) -> None:
     try:
         analysis = await _analyze_rule(rule)
@@ -553,6 +563,13 @@ async def webhook_rule_created(payload: RuleCreatedPayload, background_tasks: Ba
     return {"accepted": True}
 
 
+@app.post("/v1/webhook/rules-created", status_code=202)
+async def webhook_rules_created(payload: RulesCreatedPayload, background_tasks: BackgroundTasks):
+    """Receive one event for a bulk rule import; the rules are analyzed one after another."""
+    background_tasks.add_task(_process_rules, payload.rules)
+    return {"accepted": True, "rules": len(payload.rules)}
+
+
 @app.get("/v1/proposals")
 async def list_proposals():
     """List all tool proposals (pending, approved, and rejected)."""
@@ -3,11 +3,13 @@ import re
 
 import httpx
 import os
-from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Response, status
+from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
 
-from .models import BusinessRule, BusinessRuleGroup, CreateRule, CreateRuleGroup, DatapointDefinition
+from .changes import poll_changes, sse_changes
+from .models import BulkRulesResult, BusinessRule, BusinessRuleGroup, CreateRule, CreateRuleGroup, DatapointDefinition
 from .store import RuleStore
 from shared.middleware import InternalAuthMiddleware, check_production_api_key, internal_headers
 
@@ -18,6 +20,8 @@ _ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+$')
 check_production_api_key()
 
 TOOL_AGENT_URL = os.getenv("TOOL_AGENT_URL", "http://127.0.0.1:8003")
+MAX_CHANGE_WAIT_SECONDS = float(os.getenv("RULE_CHANGE_MAX_WAIT_SECONDS", "60"))
+MAX_BULK_RULES = int(os.getenv("RULE_ENGINE_MAX_BULK_RULES", "10000"))
 
 app = FastAPI(title="Unreal Objects Rule Engine API")
 
@@ -67,15 +71,64 @@ def _validate_id(value: str, name: str = "id") -> None:
         raise HTTPException(status_code=400, detail=f"Invalid {name} format")
 
 
+def group_etag(group: BusinessRuleGroup) -> str:
+    """Strong entity tag of *group*; it changes whenever the revision does."""
+    return f'"{group.id}.{group.revision}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of *etag* against an ``If-None-Match`` header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
 @app.get("/v1/groups/{group_id}", response_model=BusinessRuleGroup)
-async def get_group(group_id: str, response: Response):
+async def get_group(group_id: str, response: Response, if_none_match: str | None = Header(default=None)):
     _validate_id(group_id, "group_id")
-    response.headers["Cache-Control"] = "no-store"
     group = store.get_group(group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
+    # Cacheable, but only after revalidation against the current revision.
+    etag = group_etag(group)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     return group
 
+@app.get("/v1/changes")
+async def get_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    timeout: float = Query(0, ge=0, le=MAX_CHANGE_WAIT_SECONDS),
+):
+    """Rule store mutations after revision *since*.
+
+    By default returns ``{"revision", "reset", "changes"}``, long-polling up
+    to *timeout* seconds when nothing changed yet; ``reset: true`` means the
+    changes after *since* are no longer known and cached groups must be
+    re-fetched.  With ``Accept: text/event-stream`` the changes are streamed
+    as Server-Sent Events instead, resuming after ``Last-Event-ID``.  Without
+    *since*, the feed starts at the current revision.
+    """
+    if "text/event-stream" in request.headers.get("accept", ""):
+        header = request.headers.get("last-event-id")
+        if header is not None:
+            try:
+                since = int(header)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+        return StreamingResponse(
+            sse_changes(store.changes, store.changes.revision if since is None else since),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    result = await poll_changes(store.changes, store.changes.revision if since is None else since, timeout)
+    return JSONResponse(result, headers={"Cache-Control": "no-store"})
+
 @app.delete("/v1/groups/{group_id}", status_code=204)
 async def delete_group(group_id: str, x_admin_token: str | None = Header(default=None)):
     _validate_id(group_id, "group_id")
@@ -83,22 +136,32 @@ async def delete_group(group_id: str, x_admin_token: str | None = Header(default
     if not store.delete_group(group_id):
         raise HTTPException(status_code=404, detail="Group not found")
 
+def _rule_created_payload(group_id: str, rule: BusinessRule, group_name: str) -> dict:
+    return {
+        "group_id": group_id,
+        "group_name": group_name,
+        "rule_id": rule.id,
+        "rule_name": rule.name,
+        "feature": rule.feature,
+        "rule_logic": rule.rule_logic,
+        "datapoints": rule.datapoints,
+    }
+
 async def _notify_tool_agent(group_id: str, rule: BusinessRule, group_name: str):
     """Fire-and-forget webhook to the Tool Creation Agent. Silently ignored if agent is down."""
+    await _post_tool_agent("/v1/webhook/rule-created", _rule_created_payload(group_id, rule, group_name))
+
+async def _notify_tool_agent_bulk(group_id: str, rules: List[BusinessRule], group_name: str):
+    """One webhook for a bulk import, however many rules it created."""
+    await _post_tool_agent(
+        "/v1/webhook/rules-created",
+        {"rules": [_rule_created_payload(group_id, rule, group_name) for rule in rules]},
+    )
+
+async def _post_tool_agent(path: str, payload: dict):
     try:
         async with httpx.AsyncClient(timeout=3.0, headers=internal_headers()) as client:
-            await client.post(
-                f"{TOOL_AGENT_URL}/v1/webhook/rule-created",
-                json={
-                    "group_id": group_id,
-                    "group_name": group_name,
-                    "rule_id": rule.id,
-                    "rule_name": rule.name,
-                    "feature": rule.feature,
-                    "rule_logic": rule.rule_logic,
-                    "datapoints": rule.datapoints,
-                },
-            )
+            await client.post(f"{TOOL_AGENT_URL}{path}", json=payload)
     except httpx.RequestError:
         pass  # Non-blocking: tool agent may not be running
     except Exception:
@@ -115,6 +178,42 @@ async def add_rule(group_id: str, rule: CreateRule, background_tasks: Background
     background_tasks.add_task(_notify_tool_agent, group_id, created, group.name)
     return created
 
+@app.post("/v1/groups/{group_id}/rules:bulk", response_model=BulkRulesResult, status_code=201)
+async def add_rules(group_id: str, rules: List[CreateRule], background_tasks: BackgroundTasks):
+    """Create every rule in *rules* as one mutation: one revision, one journal record, one webhook.
+
+    The whole body is validated before anything is stored, so either all
+    rules are created or none.
+    """
+    _validate_id(group_id, "group_id")
+    _check_bulk_size(len(rules))
+    created = store.add_rules(group_id, rules)
+    if created is None:
+        raise HTTPException(status_code=404, detail="Group not found")
+    group = store.get_group(group_id)
+    if created:
+        background_tasks.add_task(_notify_tool_agent_bulk, group_id, created, group.name)
+    return BulkRulesResult(group_id=group_id, revision=group.revision, rule_ids=[rule.id for rule in created])
+
+@app.post("/v1/groups/{group_id}/rules:bulk-delete", response_model=BulkRulesResult)
+async def delete_rules(group_id: str, rule_ids: List[str]):
+    """Delete every rule in *rule_ids* as one mutation; 404 without deleting any if one is unknown."""
+    _validate_id(group_id, "group_id")
+    _check_bulk_size(len(rule_ids))
+    for rule_id in rule_ids:
+        _validate_id(rule_id, "rule_id")
+    try:
+        deleted = store.delete_rules(group_id, rule_ids)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Group not found")
+    return BulkRulesResult(group_id=group_id, revision=store.get_group(group_id).revision, rule_ids=deleted)
+
+def _check_bulk_size(count: int) -> None:
+    if count > MAX_BULK_RULES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_RULES} rules per bulk request")
+
 @app.get("/v1/groups/{group_id}/rules/{rule_id}", response_model=BusinessRule)
 async def get_rule(group_id: str, rule_id: str, response: Response):
     _validate_id(group_id, "group_id")
@@ -0,0 +1,114 @@
+"""Bounded in-memory feed of rule store mutations.
+
+Every ``RuleStore`` mutation takes the next store revision and is recorded
+here as ``(revision, group_id, rule_id, op)``.  Revisions are contiguous, so
+a consumer that remembers the last revision it saw can ask for everything
+after it; when that revision has already left the log (or predates a
+restart) the consumer is told to reset, i.e. drop its copies and re-fetch.
+The feed only covers mutations made by this process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator
+
+CHANGE_LOG_SIZE = int(os.getenv("RULE_CHANGE_LOG_SIZE", "1000"))
+CHANGE_HEARTBEAT_SECONDS = float(os.getenv("RULE_CHANGE_HEARTBEAT_SECONDS", "15"))
+
+
+@dataclass(frozen=True)
+class Change:
+    """``op`` is create, update or delete; ``rule_id`` is None when the group itself changed."""
+
+    revision: int
+    group_id: str
+    rule_id: str | None
+    op: str
+
+    def to_json(self) -> dict:
+        return asdict(self)
+
+
+class ChangeLog:
+    def __init__(self, size: int = CHANGE_LOG_SIZE, revision: int = 0):
+        self.entries: deque[Change] = deque(maxlen=max(1, size))
+        # Revision just before the oldest retained entry, and the latest one.
+        self.base = revision
+        self.revision = revision
+        self._changed: asyncio.Event | None = None
+
+    def record(self, revision: int, group_id: str, rule_id: str | None, op: str) -> Change:
+        change = Change(revision, group_id, rule_id, op)
+        if len(self.entries) == self.entries.maxlen:
+            self.base = self.entries[0].revision
+        self.entries.append(change)
+        self.revision = revision
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+        return change
+
+    def since(self, revision: int) -> tuple[list[Change], bool]:
+        """Changes after *revision*; False when some of them are no longer known."""
+        if not self.base <= revision <= self.revision:
+            return [], False
+        skip = revision - self.base
+        return [self.entries[i] for i in range(skip, len(self.entries))], True
+
+    async def wait(self, revision: int, timeout: float) -> None:
+        """Return once the log is past *revision*, or after *timeout* seconds."""
+        if self.revision != revision or timeout <= 0:
+            return
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def poll_changes(log: ChangeLog, since: int, timeout: float) -> dict:
+    """Long-poll body: the changes after *since*, waiting up to *timeout* for one."""
+    if since == log.revision:
+        await log.wait(since, timeout)
+    changes, complete = log.since(since)
+    return {
+        "revision": log.revision,
+        "reset": not complete,
+        "changes": [change.to_json() for change in changes],
+    }
+
+
+def _frame(event_type: str, data: dict, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_changes(
+    log: ChangeLog,
+    since: int,
+    heartbeat_seconds: float = CHANGE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for the changes after *since* until the client disconnects.
+
+    Frame ids are revisions, so ``Last-Event-ID`` resumes the feed.  A
+    ``reset`` frame means *since* could not be resumed and the client should
+    drop everything it cached.
+    """
+    yield "retry: 3000\n\n"
+    while True:
+        changes, complete = log.since(since)
+        if not complete:
+            since = log.revision
+            yield _frame("reset", {"revision": since}, since)
+        elif changes:
+            since = changes[-1].revision
+            yield "".join(_frame("change", change.to_json(), change.revision) for change in changes)
+        else:
+            await log.wait(since, heartbeat_seconds)
+            if log.revision == since:
+                yield ": keep-alive\n\n"
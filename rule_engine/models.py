@@ -30,6 +30,7 @@ class BusinessRuleGroup(BaseModel):
     description: str = ""
     rules: list[BusinessRule] = Field(default_factory=list)
     datapoint_definitions: list[DatapointDefinition] = Field(default_factory=list)
+    revision: int = 0
 
 class CreateRule(BaseModel):
     name: str
@@ -44,3 +45,8 @@ class CreateRule(BaseModel):
 class CreateRuleGroup(BaseModel):
     name: str
     description: str = ""
+
+class BulkRulesResult(BaseModel):
+    group_id: str
+    revision: int
+    rule_ids: list[str]
@@ -1,40 +1,220 @@
 from __future__ import annotations
 
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Callable
 
-from .models import BusinessRule, BusinessRuleGroup, CreateRule, CreateRuleGroup
+from pydantic import BaseModel, Field, ValidationError
+
+from .changes import Change, ChangeLog
+from .models import BusinessRule, BusinessRuleGroup, CreateRule, CreateRuleGroup, DatapointDefinition
 from shared.persistence import atomic_write_json
 
+# "always" fsyncs the journal after every flush; "never" leaves it to the OS.
+JOURNAL_FSYNC = os.getenv("RULE_STORE_JOURNAL_FSYNC", "always")
+JOURNAL_FSYNC_POLICIES = ("always", "never")
+# Minimum number of journal records before the journal is folded into the snapshot.
+JOURNAL_COMPACT_EVERY = int(os.getenv("RULE_STORE_JOURNAL_COMPACT_EVERY", "1000"))
+
+
+class RuleStoreData(BaseModel):
+    revision: int = 0
+    groups: list[BusinessRuleGroup] = Field(default_factory=list)
+
 
 class RuleStore:
-    def __init__(self, persistence_path: str | Path | None = None):
+    """In-memory rule store with optional snapshot + journal persistence.
+
+    The snapshot at ``persistence_path`` holds every group.  Each mutation is
+    appended as one JSON line to ``<persistence_path>.journal``, tagged with
+    the revision it produced, and the journal is folded into a fresh snapshot
+    once it holds ``compact_every`` records and at least as many records as
+    there are rules, so the bytes written stay proportional to the bytes
+    changed.  Loading reads the snapshot and replays the journal records
+    whose revision it does not contain yet.
+    """
+
+    def __init__(
+        self,
+        persistence_path: str | Path | None = None,
+        fsync: str = JOURNAL_FSYNC,
+        compact_every: int = JOURNAL_COMPACT_EVERY,
+    ):
+        if fsync not in JOURNAL_FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {JOURNAL_FSYNC_POLICIES}, got {fsync!r}")
         self.groups: dict[str, BusinessRuleGroup] = {}
         self.persistence_path = Path(persistence_path) if persistence_path else None
+        self.journal_path = (
+            self.persistence_path.with_name(self.persistence_path.name + ".journal")
+            if self.persistence_path
+            else None
+        )
+        self.fsync = fsync
+        self.compact_every = max(1, compact_every)
+        self._batch_depth = 0
+        self._pending_records: list[str] = []
+        self._journal_records = 0
+        # Store-wide, monotonically increasing mutation counter.  Each group
+        # carries the value of its latest mutation so consumers can cache
+        # compiled copies keyed by (group id, revision).
+        self.revision = 0
         self._load()
+        # Mutations made since startup, for consumers following /v1/changes.
+        self.changes = ChangeLog(revision=self.revision)
+        # In-process observers, called after every mutation.
+        self._listeners: list[Callable[[Change], None]] = []
 
     def _load(self) -> None:
-        if self.persistence_path is None or not self.persistence_path.exists():
+        if self.persistence_path is None:
             return
-        try:
-            payload = json.loads(self.persistence_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
-            raise RuntimeError(f"Failed to parse rule store at {self.persistence_path}: {exc}") from exc
+        if self.persistence_path.exists():
+            # Parsed and validated in one pass by pydantic-core.
+            try:
+                data = RuleStoreData.model_validate_json(self.persistence_path.read_bytes())
+            except ValidationError as exc:
+                if any(error["type"] == "json_invalid" for error in exc.errors()):
+                    raise RuntimeError(f"Failed to parse rule store at {self.persistence_path}: {exc}") from exc
+                raise RuntimeError(f"Failed to validate rule store at {self.persistence_path}: {exc}") from exc
+            self.groups = {group.id: group for group in data.groups}
+            # The stored counter also covers deleted groups.
+            self.revision = max([data.revision, *(group.revision for group in data.groups)])
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        if self.journal_path is None or not self.journal_path.exists():
+            return
+        raw = self.journal_path.read_bytes()
+        lines = raw.split(b"\n")
+        # A crash mid-append leaves at most one torn record without its
+        # trailing newline; drop it so the next append starts on a clean line.
+        if lines[-1]:
+            try:
+                json.loads(lines[-1])
+            except json.JSONDecodeError:
+                with self.journal_path.open("r+b") as fh:
+                    fh.truncate(len(raw) - len(lines[-1]))
+            else:
+                with self.journal_path.open("ab") as fh:
+                    fh.write(b"\n")
+                lines.append(b"")
+        lines = lines[:-1]
+
+        # Group id -> rule id -> position, built on first use so replaying
+        # many rule records stays linear.
+        positions: dict[str, dict[str, int]] = {}
+        for lineno, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if record["revision"] <= self.revision:
+                    continue
+                self._apply(record, positions)
+            except Exception as exc:
+                raise RuntimeError(f"Failed to replay rule store journal at {self.journal_path}:{lineno}: {exc}") from exc
+            self.revision = record["revision"]
+            self._journal_records += 1
+
+    def _apply(self, record: dict[str, Any], positions: dict[str, dict[str, int]]) -> None:
+        op = record["op"]
+        group_id = record["group"]["id"] if op == "put_group" else record["group_id"]
+        if op == "put_group":
+            self.groups[group_id] = BusinessRuleGroup.model_validate(record["group"])
+            positions.pop(group_id, None)
+            return
+        if op == "delete_group":
+            self.groups.pop(group_id, None)
+            positions.pop(group_id, None)
+            return
+        group = self.groups[group_id]
+        if op in ("put_rule", "put_rules"):
+            if group_id not in positions:
+                positions[group_id] = {existing.id: i for i, existing in enumerate(group.rules)}
+            index = positions[group_id]
+            for payload in record["rules"] if op == "put_rules" else [record["rule"]]:
+                rule = BusinessRule.model_validate(payload)
+                if rule.id in index:
+                    group.rules[index[rule.id]] = rule
+                else:
+                    index[rule.id] = len(group.rules)
+                    group.rules.append(rule)
+        elif op in ("delete_rule", "delete_rules"):
+            doomed = set(record["rule_ids"]) if op == "delete_rules" else {record["rule_id"]}
+            group.rules = [rule for rule in group.rules if rule.id not in doomed]
+            positions.pop(group_id, None)
+        elif op == "put_datapoints":
+            group.datapoint_definitions = [DatapointDefinition.model_validate(d) for d in record["definitions"]]
+        else:
+            raise ValueError(f"unknown journal op {op!r}")
+        group.revision = record["revision"]
+
+    def add_listener(self, listener: Callable[[Change], None]) -> None:
+        """Call *listener* with each ``Change`` once the mutation is applied."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def _record_change(self, group_id: str, rule_id: str | None, op: str) -> int:
+        self.revision += 1
+        change = self.changes.record(self.revision, group_id, rule_id, op)
+        for listener in self._listeners:
+            listener(change)
+        return self.revision
+
+    def _bump_revision(self, group: BusinessRuleGroup, op: str = "update", rule_id: str | None = None) -> None:
+        group.revision = self._record_change(group.id, rule_id, op)
+
+    def _record(self, record: dict[str, Any]) -> None:
+        """Journal *record* for the mutation that produced ``self.revision``."""
+        if self.persistence_path is None:
+            return
+        record["revision"] = self.revision
+        self._pending_records.append(json.dumps(record, separators=(",", ":")))
+        if not self._batch_depth:
+            self._flush()
 
-        raw_groups = payload.get("groups", [])
+    @contextmanager
+    def batch(self):
+        """Defer persistence of every mutation in the block to one flush on exit."""
+        self._batch_depth += 1
         try:
-            groups = [BusinessRuleGroup.model_validate(group) for group in raw_groups]
-        except Exception as exc:
-            raise RuntimeError(f"Failed to validate rule store at {self.persistence_path}: {exc}") from exc
-        self.groups = {group.id: group for group in groups}
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush()
 
-    def _save(self) -> None:
+    def _flush(self) -> None:
+        if not self._pending_records:
+            return
+        records, self._pending_records = self._pending_records, []
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal_path.open("a", encoding="utf-8") as fh:
+            fh.write("\n".join(records) + "\n")
+            fh.flush()
+            if self.fsync == "always":
+                os.fsync(fh.fileno())
+        self._journal_records += len(records)
+        if self._journal_records >= max(self.compact_every, self.rule_count()):
+            self.compact()
+
+    def compact(self) -> None:
+        """Write every group as a snapshot and truncate the journal."""
         if self.persistence_path is None:
             return
+        # Anything still queued by a batch() is in the snapshot already.
+        self._pending_records = []
         payload = {
+            "revision": self.revision,
             "groups": [group.model_dump(mode="json") for group in self.groups.values()],
         }
         atomic_write_json(self.persistence_path, payload)
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_records = 0
+
+    def rule_count(self) -> int:
+        return sum(len(group.rules) for group in self.groups.values())
 
     def create_group(self, group_create: CreateRuleGroup) -> BusinessRuleGroup:
         group = BusinessRuleGroup(
@@ -42,7 +222,8 @@ class RuleStore:
             description=group_create.description
         )
         self.groups[group.id] = group
-        self._save()
+        self._bump_revision(group, "create")
+        self._record({"op": "put_group", "group": group.model_dump(mode="json")})
         return group
 
     def list_groups(self) -> list[BusinessRuleGroup]:
@@ -54,15 +235,14 @@ class RuleStore:
     def delete_group(self, group_id: str) -> bool:
         if group_id in self.groups:
             del self.groups[group_id]
-            self._save()
+            self._record_change(group_id, None, "delete")
+            self._record({"op": "delete_group", "group_id": group_id})
             return True
         return False
 
-    def add_rule(self, group_id: str, rule_create: CreateRule) -> BusinessRule | None:
-        group = self.get_group(group_id)
-        if not group:
-            return None
-        rule = BusinessRule(
+    @staticmethod
+    def _new_rule(rule_create: CreateRule) -> BusinessRule:
+        return BusinessRule(
             name=rule_create.name,
             feature=rule_create.feature,
             active=rule_create.active,
@@ -72,10 +252,34 @@ class RuleStore:
             rule_logic=rule_create.rule_logic,
             rule_logic_json=rule_create.rule_logic_json,
         )
+
+    def add_rule(self, group_id: str, rule_create: CreateRule) -> BusinessRule | None:
+        group = self.get_group(group_id)
+        if not group:
+            return None
+        rule = self._new_rule(rule_create)
         group.rules.append(rule)
-        self._save()
+        self._bump_revision(group, "create", rule.id)
+        self._record({"op": "put_rule", "group_id": group_id, "rule": rule.model_dump(mode="json")})
         return rule
 
+    def add_rules(self, group_id: str, rule_creates: list[CreateRule]) -> list[BusinessRule] | None:
+        """Append all *rule_creates* as one mutation: one revision, change and journal record."""
+        group = self.get_group(group_id)
+        if not group:
+            return None
+        rules = [self._new_rule(rule_create) for rule_create in rule_creates]
+        if not rules:
+            return rules
+        group.rules.extend(rules)
+        self._bump_revision(group)
+        self._record({
+            "op": "put_rules",
+            "group_id": group_id,
+            "rules": [rule.model_dump(mode="json") for rule in rules],
+        })
+        return rules
+
     def get_rule(self, group_id: str, rule_id: str) -> BusinessRule | None:
         group = self.get_group(group_id)
         if not group:
@@ -92,10 +296,29 @@ class RuleStore:
         for i, rule in enumerate(group.rules):
             if rule.id == rule_id:
                 del group.rules[i]
-                self._save()
+                self._bump_revision(group, "delete", rule_id)
+                self._record({"op": "delete_rule", "group_id": group_id, "rule_id": rule_id})
                 return True
         return False
 
+    def delete_rules(self, group_id: str, rule_ids: list[str]) -> list[str] | None:
+        """Delete all *rule_ids* as one mutation, or none of them if any is unknown."""
+        group = self.get_group(group_id)
+        if not group:
+            return None
+        rule_ids = list(dict.fromkeys(rule_ids))
+        existing = {rule.id for rule in group.rules}
+        missing = [rule_id for rule_id in rule_ids if rule_id not in existing]
+        if missing:
+            raise ValueError(f"Rule(s) not found: {', '.join(missing)}")
+        if not rule_ids:
+            return rule_ids
+        doomed = set(rule_ids)
+        group.rules = [rule for rule in group.rules if rule.id not in doomed]
+        self._bump_revision(group)
+        self._record({"op": "delete_rules", "group_id": group_id, "rule_ids": rule_ids})
+        return rule_ids
+
     def update_rule(self, group_id: str, rule_id: str, rule_update: CreateRule) -> BusinessRule | None:
         group = self.get_group(group_id)
         if not group:
@@ -112,7 +335,8 @@ class RuleStore:
                 group.rules[i].edge_cases_json = rule_update.edge_cases_json
                 group.rules[i].rule_logic = rule_update.rule_logic
                 group.rules[i].rule_logic_json = rule_update.rule_logic_json
-                self._save()
+                self._bump_revision(group, "update", rule_id)
+                self._record({"op": "put_rule", "group_id": group_id, "rule": group.rules[i].model_dump(mode="json")})
                 return group.rules[i]
         
         return None
@@ -125,5 +349,10 @@ class RuleStore:
         for definition in definitions:
             existing[definition.name] = definition
         group.datapoint_definitions = list(existing.values())
-        self._save()
+        self._bump_revision(group)
+        self._record({
+            "op": "put_datapoints",
+            "group_id": group_id,
+            "definitions": [definition.model_dump(mode="json") for definition in group.datapoint_definitions],
+        })
         return group
@@ -93,7 +93,7 @@ def test_update_rule_api_persists_deactivation_on_refetch(populated_client):
     assert stored_rule["active"] is False
 
 
-def test_group_reads_disable_http_caching(populated_client):
+def test_group_reads_require_revalidation(populated_client):
     client, group_id, _ = populated_client
 
     list_resp = client.get("/v1/groups")
@@ -102,7 +102,27 @@ def test_group_reads_disable_http_caching(populated_client):
 
     group_resp = client.get(f"/v1/groups/{group_id}")
     assert group_resp.status_code == 200
-    assert group_resp.headers["cache-control"] == "no-store"
+    assert group_resp.headers["cache-control"] == "no-cache"
+    assert group_resp.headers["etag"] == f'"{group_id}.{group_resp.json()["revision"]}"'
+
+
+def test_get_group_if_none_match_returns_304_until_mutated(populated_client):
+    client, group_id, rule_id = populated_client
+    etag = client.get(f"/v1/groups/{group_id}").headers["etag"]
+
+    not_modified = client.get(f"/v1/groups/{group_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    weak_list = client.get(f"/v1/groups/{group_id}", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert weak_list.status_code == 304
+
+    client.delete(f"/v1/groups/{group_id}/rules/{rule_id}")
+    changed = client.get(f"/v1/groups/{group_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["rules"] == []
 
 
 def test_delete_group_requires_admin_token_when_configured(client, store, monkeypatch):
@@ -157,3 +177,66 @@ def test_update_rule_api_not_found(populated_client):
     # Invalid Group ID
     resp = client.put(f"/v1/groups/invalid_id/rules/{rule_id}", json=update_payload)
     assert resp.status_code == 404
+
+
+def test_changes_feed_lists_mutations_since_revision(client, store):
+    start = client.get("/v1/changes").json()
+    assert start["changes"] == []
+    assert start["reset"] is False
+
+    group_id = client.post("/v1/groups", json={"name": "Feed"}).json()["id"]
+    resp = client.get("/v1/changes", params={"since": start["revision"]})
+
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "no-store"
+    body = resp.json()
+    assert body["revision"] == start["revision"] + 1
+    assert body["changes"] == [
+        {"revision": body["revision"], "group_id": group_id, "rule_id": None, "op": "create"},
+    ]
+    assert client.get("/v1/changes", params={"since": body["revision"] + 5}).json()["reset"] is True
+
+
+def _rule_payload(name):
+    return {"name": name, "feature": "f", "datapoints": ["amount"], "edge_cases": [], "rule_logic": "APPROVE"}
+
+
+def test_bulk_create_and_delete_rules(client, store, monkeypatch):
+    from rule_engine import app as app_module
+
+    notified = []
+
+    async def fake_notify(group_id, rules, group_name):
+        notified.append((group_id, [rule.id for rule in rules], group_name))
+
+    monkeypatch.setattr(app_module, "_notify_tool_agent_bulk", fake_notify)
+    group_id = client.post("/v1/groups", json={"name": "Pack"}).json()["id"]
+    before = store.get_group(group_id).revision
+
+    resp = client.post(f"/v1/groups/{group_id}/rules:bulk", json=[_rule_payload(f"R{i}") for i in range(3)])
+    assert resp.status_code == 201
+    body = resp.json()
+    assert len(body["rule_ids"]) == 3
+    # One mutation: a single revision bump and a single notification.
+    assert body["revision"] == before + 1
+    assert notified == [(group_id, body["rule_ids"], "Pack")]
+    assert [rule["id"] for rule in client.get(f"/v1/groups/{group_id}").json()["rules"]] == body["rule_ids"]
+
+    resp = client.post(f"/v1/groups/{group_id}/rules:bulk-delete", json=body["rule_ids"][:2])
+    assert resp.status_code == 200
+    assert resp.json()["rule_ids"] == body["rule_ids"][:2]
+    assert [rule["id"] for rule in client.get(f"/v1/groups/{group_id}").json()["rules"]] == body["rule_ids"][2:]
+
+
+def test_bulk_requests_are_all_or_nothing(client, store):
+    group_id = client.post("/v1/groups", json={"name": "Pack"}).json()["id"]
+    rule_id = client.post(f"/v1/groups/{group_id}/rules", json=_rule_payload("Keep")).json()["id"]
+
+    invalid = client.post(f"/v1/groups/{group_id}/rules:bulk", json=[_rule_payload("Ok"), {"name": "Missing fields"}])
+    assert invalid.status_code == 422
+    unknown = client.post(f"/v1/groups/{group_id}/rules:bulk-delete", json=[rule_id, "nope"])
+    assert unknown.status_code == 404
+    assert "nope" in unknown.json()["detail"]
+
+    assert [rule["id"] for rule in client.get(f"/v1/groups/{group_id}").json()["rules"]] == [rule_id]
+    assert client.post("/v1/groups/missing/rules:bulk", json=[_rule_payload("X")]).status_code == 404
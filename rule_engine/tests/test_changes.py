@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import pytest
+
+from rule_engine.changes import ChangeLog, poll_changes, sse_changes
+
+
+def _frames(text):
+    frames = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        frames.append(fields)
+    return frames
+
+
+def test_since_returns_changes_after_revision():
+    log = ChangeLog(size=10, revision=5)
+    for revision in range(6, 9):
+        log.record(revision, "g1", f"r{revision}", "update")
+
+    changes, complete = log.since(6)
+    assert complete
+    assert [change.revision for change in changes] == [7, 8]
+    assert log.since(8) == ([], True)
+
+
+def test_since_reports_reset_once_revision_left_the_log():
+    log = ChangeLog(size=2)
+    for revision in range(1, 5):
+        log.record(revision, "g1", None, "update")
+
+    assert log.since(1) == ([], False)
+    assert [change.revision for change in log.since(2)[0]] == [3, 4]
+    # Ahead of the log, e.g. a client that saw revisions from before a restart.
+    assert log.since(9) == ([], False)
+
+
+@pytest.mark.asyncio
+async def test_poll_waits_for_next_change():
+    log = ChangeLog()
+    poll = asyncio.ensure_future(poll_changes(log, 0, timeout=5))
+    await asyncio.sleep(0)
+    assert not poll.done()
+
+    log.record(1, "g1", "r1", "create")
+    result = await asyncio.wait_for(poll, 1)
+
+    assert result == {
+        "revision": 1,
+        "reset": False,
+        "changes": [{"revision": 1, "group_id": "g1", "rule_id": "r1", "op": "create"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_poll_times_out_without_changes():
+    result = await poll_changes(ChangeLog(revision=3), 3, timeout=0.01)
+    assert result == {"revision": 3, "reset": False, "changes": []}
+
+
+@pytest.mark.asyncio
+async def test_sse_streams_changes_and_resets():
+    log = ChangeLog(size=1)
+    log.record(1, "g1", None, "create")
+    log.record(2, "g1", "r1", "create")
+    stream = sse_changes(log, 0, heartbeat_seconds=5)
+    assert await stream.__anext__() == "retry: 3000\n\n"
+
+    reset = _frames(await stream.__anext__())[0]
+    assert reset == {"id": "2", "event": "reset", "data": '{"revision": 2}'}
+
+    next_frame = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    log.record(3, "g1", "r1", "delete")
+    frame = _frames(await asyncio.wait_for(next_frame, 1))[0]
+    assert frame["id"] == "3"
+    assert frame["event"] == "change"
+    assert json.loads(frame["data"]) == {"revision": 3, "group_id": "g1", "rule_id": "r1", "op": "delete"}
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sse_sends_keep_alive_when_idle():
+    stream = sse_changes(ChangeLog(), 0, heartbeat_seconds=0.01)
+    await stream.__anext__()
+    assert await asyncio.wait_for(stream.__anext__(), 1) == ": keep-alive\n\n"
+    await stream.aclose()
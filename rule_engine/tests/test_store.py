@@ -131,3 +131,129 @@ def test_corrupted_persistence_file_raises(tmp_path):
 
     with pytest.raises(RuntimeError, match="Failed to parse rule store"):
         RuleStore(persistence_path=path)
+
+
+def test_mutations_bump_group_revision(populated_store):
+    store, group_id, rule_id = populated_store
+    before = store.get_group(group_id).revision
+
+    store.update_datapoints(group_id, [DatapointDefinition(name="dp1", type="number")])
+    after_datapoints = store.get_group(group_id).revision
+    store.delete_rule(group_id, rule_id)
+    after_delete = store.get_group(group_id).revision
+
+    assert before < after_datapoints < after_delete
+
+
+def test_revision_counter_survives_restart(tmp_path):
+    path = tmp_path / "rule_engine_store.json"
+    store = RuleStore(persistence_path=path)
+    group = store.create_group(CreateRuleGroup(name="Revisions"))
+    store.update_datapoints(group.id, [DatapointDefinition(name="volume", type="number")])
+
+    restored = RuleStore(persistence_path=path)
+    assert restored.get_group(group.id).revision == store.get_group(group.id).revision
+    other = restored.create_group(CreateRuleGroup(name="Other"))
+    assert other.revision > store.get_group(group.id).revision
+
+
+def test_mutations_are_recorded_in_change_log(populated_store):
+    store, group_id, rule_id = populated_store
+    store.update_rule(group_id, rule_id, CreateRule(
+        name="Renamed", feature="Test Feature", datapoints=["dp1"], edge_cases=[], rule_logic="APPROVE",
+    ))
+    store.delete_group(group_id)
+
+    changes, complete = store.changes.since(0)
+    assert complete
+    assert [(c.revision, c.group_id, c.rule_id, c.op) for c in changes] == [
+        (1, group_id, None, "create"),
+        (2, group_id, rule_id, "create"),
+        (3, group_id, rule_id, "update"),
+        (4, group_id, None, "delete"),
+    ]
+    assert store.revision == 4
+
+
+def test_deleted_groups_keep_revision_counter_after_restart(tmp_path):
+    path = tmp_path / "rule_engine_store.json"
+    store = RuleStore(persistence_path=path)
+    group = store.create_group(CreateRuleGroup(name="Short-lived"))
+    store.delete_group(group.id)
+
+    restored = RuleStore(persistence_path=path)
+    assert restored.revision == 2
+    # The feed restarts empty: anything before the restart must be re-fetched.
+    assert restored.changes.since(1) == ([], False)
+    assert restored.changes.since(2) == ([], True)
+
+
+def _rule(name="Rule"):
+    return CreateRule(name=name, feature="f", datapoints=["amount"], edge_cases=[], rule_logic="IF amount > 1 THEN REJECT")
+
+
+def test_mutations_are_journaled_and_replayed(tmp_path):
+    path = tmp_path / "rule_engine_store.json"
+    store = RuleStore(persistence_path=path)
+    group = store.create_group(CreateRuleGroup(name="Journaled"))
+    first = store.add_rule(group.id, _rule("First"))
+    second = store.add_rule(group.id, _rule("Second"))
+    store.update_rule(group.id, first.id, _rule("First v2"))
+    store.delete_rule(group.id, second.id)
+    store.update_datapoints(group.id, [DatapointDefinition(name="amount", type="number")])
+
+    # Nothing rewrote the full store; every mutation is one journal line.
+    assert not path.exists()
+    assert len(store.journal_path.read_text().splitlines()) == 6
+
+    restored = RuleStore(persistence_path=path)
+    assert restored.get_group(group.id).model_dump() == store.get_group(group.id).model_dump()
+    assert restored.revision == store.revision
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path):
+    path = tmp_path / "rule_engine_store.json"
+    store = RuleStore(persistence_path=path, compact_every=3)
+    group = store.create_group(CreateRuleGroup(name="Compacted"))
+    store.add_rule(group.id, _rule("One"))
+    store.add_rule(group.id, _rule("Two"))
+
+    assert path.exists()
+    assert not store.journal_path.exists()
+    store.add_rule(group.id, _rule("Three"))
+
+    restored = RuleStore(persistence_path=path)
+    assert [rule.name for rule in restored.get_group(group.id).rules] == ["One", "Two", "Three"]
+    assert restored.revision == store.revision
+
+
+def test_batch_writes_one_flush_and_torn_tail_is_dropped(tmp_path):
+    path = tmp_path / "rule_engine_store.json"
+    store = RuleStore(persistence_path=path)
+    group = store.create_group(CreateRuleGroup(name="Batched"))
+    with store.batch():
+        for i in range(3):
+            store.add_rule(group.id, _rule(f"Rule {i}"))
+        assert len(store.journal_path.read_text().splitlines()) == 1
+    assert len(store.journal_path.read_text().splitlines()) == 4
+
+    with store.journal_path.open("a") as fh:
+        fh.write('{"op":"put_rule","group_id"')
+    restored = RuleStore(persistence_path=path)
+    assert len(restored.get_group(group.id).rules) == 3
+    assert store.journal_path.read_text().endswith("\n")
+
+
+def test_bulk_mutations_are_one_journal_record_each(tmp_path):
+    path = tmp_path / "rule_engine_store.json"
+    store = RuleStore(persistence_path=path)
+    group = store.create_group(CreateRuleGroup(name="Bulk"))
+    rules = store.add_rules(group.id, [_rule(f"Rule {i}") for i in range(4)])
+    assert store.delete_rules(group.id, [rules[0].id, rules[2].id]) == [rules[0].id, rules[2].id]
+    with pytest.raises(ValueError, match="missing"):
+        store.delete_rules(group.id, [rules[1].id, "missing"])
+
+    assert len(store.journal_path.read_text().splitlines()) == 3
+    restored = RuleStore(persistence_path=path)
+    assert [rule.id for rule in restored.get_group(group.id).rules] == [rules[1].id, rules[3].id]
+    assert restored.revision == store.revision == 3
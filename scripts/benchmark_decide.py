@@ -0,0 +1,135 @@
+"""Benchmark Decision Center decide latency for growing rule groups.
+
+Runs ``evaluate_request`` in-process against a local RuleStore (the same
+path the combined backend uses) and compares it with interpreting every
+rule's raw JSON Logic through ``jsonLogic()``.
+
+Usage:
+    python scripts/benchmark_decide.py
+    python scripts/benchmark_decide.py --sizes 10 100 1000 --iterations 200
+    python scripts/benchmark_decide.py --context-width 60   # wide contexts
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from json_logic import jsonLogic  # noqa: E402
+
+from decision_center import evaluator  # noqa: E402
+from decision_center.compiler import required_vars  # noqa: E402
+from rule_engine.models import CreateRule, CreateRuleGroup  # noqa: E402
+from rule_engine.store import RuleStore  # noqa: E402
+
+CASE_TYPES = ["account_update", "refund_request", "sensitive_change", "fraud_review", "billing_dispute"]
+
+
+def _build_group(store: RuleStore, size: int) -> str:
+    group = store.create_group(CreateRuleGroup(name=f"bench-{size}"))
+    for i in range(size):
+        case_type = CASE_TYPES[i % len(CASE_TYPES)]
+        threshold = 50 + (i * 37) % 950
+        store.add_rule(group.id, CreateRule(
+            name=f"rule-{i}",
+            feature=case_type,
+            datapoints=["case_type", "amount", "risk_score"],
+            edge_cases=[f"IF case_type == '{case_type}' AND risk_score > 90 THEN REJECT"],
+            edge_cases_json=[{"if": [
+                {"and": [{"==": [{"var": "case_type"}, case_type]}, {">": [{"var": "risk_score"}, 90]}]},
+                "REJECT",
+                None,
+            ]}],
+            rule_logic=f"IF case_type == '{case_type}' AND amount > {threshold} THEN ASK_FOR_APPROVAL",
+            rule_logic_json={"if": [
+                {"and": [{"==": [{"var": "case_type"}, case_type]}, {">": [{"var": "amount"}, threshold]}]},
+                "ASK_FOR_APPROVAL",
+                None,
+            ]},
+        ))
+    return group.id
+
+
+def _interpret(rule_json: dict, context: dict) -> None:
+    ctx = dict(context)
+    evaluator._coerce_bool_strings(ctx)
+    evaluator._coerce_numeric_strings(ctx)
+    # Uncached alias resolution, as before required vars were precomputed.
+    rule_vars = required_vars(rule_json)
+    for req_var, alias in evaluator.resolve_variable_aliases.__wrapped__(rule_vars, frozenset(ctx)):
+        ctx[req_var] = ctx[alias]
+    try:
+        jsonLogic(rule_json, ctx)
+    except (ValueError, TypeError):
+        pass
+
+
+def _interpreted_decide(group: dict, context: dict) -> None:
+    """The pre-compilation evaluation loop: jsonLogic() over raw rule dicts."""
+    for rule in group["rules"]:
+        for ec_json in rule["edge_cases_json"]:
+            _interpret(ec_json, context)
+        _interpret(rule["rule_logic_json"], context)
+
+
+def _summarize(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50={p50 * 1000:8.3f} ms  p99={p99 * 1000:8.3f} ms"
+
+
+async def _run(sizes: list[int], iterations: int, context_width: int) -> None:
+    store = RuleStore()
+    evaluator.use_local_rule_store(store)
+    # Rules read ``amount``; the fuzzy variable mapper aliases it to ``refund_amount``.
+    context = {"case_type": "refund_request", "refund_amount": "420", "risk_score": 35}
+    # Pad with string values of every coercible shape, as agents send them.
+    padding = ["17", "3.5", "true", "FALSE", "customer note", "DE"]
+    for i in range(max(0, context_width - len(context))):
+        context[f"extra_field_{i}"] = padding[i % len(padding)]
+
+    for size in sizes:
+        group_id = _build_group(store, size)
+
+        evaluator.invalidate_compiled_groups(group_id)
+        start = time.perf_counter()
+        await evaluator.evaluate_request(context, group_id)
+        cold = time.perf_counter() - start
+
+        compiled = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await evaluator.evaluate_request(context, group_id)
+            compiled.append(time.perf_counter() - start)
+
+        interpreted = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            _interpreted_decide(store.get_group(group_id).model_dump(mode="json"), context)
+            interpreted.append(time.perf_counter() - start)
+
+        print(f"rules={size}  context_keys={len(context)}")
+        print(f"  decide (compiled, cold) {cold * 1000:8.3f} ms")
+        print(f"  decide (compiled, warm) {_summarize(compiled)}")
+        print(f"  jsonLogic interpreter   {_summarize(interpreted)}")
+        print(f"  alias cache             {evaluator.alias_cache_stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--context-width", type=int, default=3, help="Number of keys in the decide context")
+    args = parser.parse_args()
+    asyncio.run(_run(args.sizes, args.iterations, args.context_width))
+
+
+if __name__ == "__main__":
+    main()
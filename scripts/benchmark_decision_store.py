@@ -0,0 +1,128 @@
+"""Benchmark Decision Center store memory and disk use with and without context interning.
+
+Logs N decisions the way the decide and approve handlers do (atomic entry,
+REQUEST and EVALUATION chain events, a pending entry, then an approval that
+logs a second atomic entry) and reports the memory retained by the store
+(tracemalloc), the bytes persisted after a reload, and the elapsed time.
+The store is reloaded from disk before measuring, so contexts are not
+shared by accident through the objects the benchmark created.
+
+Usage:
+    python scripts/benchmark_decision_store.py
+    python scripts/benchmark_decision_store.py --decisions 10000 --context-kb 50
+    python scripts/benchmark_decision_store.py --backend sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from decision_center.models import AtomicLogEntry, DecisionState  # noqa: E402
+from decision_center.sqlite_store import SQLiteDecisionStore  # noqa: E402
+from decision_center.store import DecisionStore  # noqa: E402
+
+
+def _context(i: int, context_kb: int) -> dict:
+    return {
+        "case_type": "refund_request",
+        "amount": 100 + i,
+        "customer_note": "n" * (context_kb * 1024),
+        "order_lines": [{"sku": f"sku-{n}", "qty": n % 3 + 1} for n in range(10)],
+    }
+
+
+def _open(backend: str, directory: Path, intern: bool, decisions: int):
+    limits = {"max_atomic_logs": decisions * 2, "max_chains": decisions, "max_pending": decisions}
+    if backend == "sqlite":
+        return SQLiteDecisionStore(directory / "store.sqlite3", intern_contexts=intern, **limits)
+    return DecisionStore(
+        persistence_path=directory / "store.json",
+        intern_contexts=intern,
+        compact_every=decisions * 10,
+        **limits,
+    )
+
+
+def _log(store, decisions: int, context_kb: int) -> None:
+    for i in range(decisions):
+        request_id = f"req-{i}"
+        context = _context(i, context_kb)
+        identity = {"agent_id": "agt_bench", "user_id": f"user_{i % 50}", "effective_group_id": "g1"}
+        with store.batch():
+            store.log_atomic(AtomicLogEntry(
+                request_id=request_id, request_description="Refund", context=context,
+                decision=DecisionState.APPROVAL_REQUIRED, **identity,
+            ))
+            store.log_chain_event(request_id, "REQUEST", details={
+                "description": "Refund", "context": context, **identity,
+            })
+            store.log_chain_event(request_id, "EVALUATION", details={
+                "outcome": "ASK_FOR_APPROVAL", "matched_rules": ["r1"], **identity,
+            })
+            store.add_pending(request_id, {"description": "Refund", "context": context, **identity})
+        if i % 2 == 0:
+            pending = store.resolve_pending(request_id)
+            store.log_chain_event(request_id, "APPROVAL_STATUS", details={"status": "APPROVED", **identity})
+            store.log_atomic(AtomicLogEntry(
+                request_id=request_id, request_description="Refund", context=pending["context"],
+                decision=DecisionState.APPROVED, **identity,
+            ))
+
+
+def _disk_bytes(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.iterdir())
+
+
+def _run(backend: str, intern: bool, decisions: int, context_kb: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        store = _open(backend, directory, intern, decisions)
+        start = time.perf_counter()
+        _log(store, decisions, context_kb)
+        elapsed = time.perf_counter() - start
+        if backend == "memory":
+            store.compact()
+        else:
+            store._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            store.close()
+        disk = _disk_bytes(directory)
+        del store
+        gc.collect()
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        store = _open(backend, directory, intern, decisions)
+        if backend == "sqlite":
+            logs = store.get_atomic_logs()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+    label = f"{backend:6s} intern={'on ' if intern else 'off'}"
+    what = "store" if backend == "memory" else "get_atomic_logs()"
+    print(
+        f"{label}  log {elapsed:7.2f} s  disk {disk / 2**20:8.1f} MiB  "
+        f"{what} retained {retained / 2**20:8.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--decisions", type=int, default=10_000)
+    parser.add_argument("--context-kb", type=int, default=5, help="Approximate size of each decision context")
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+    print(f"decisions={args.decisions}  context≈{args.context_kb} KiB")
+    for intern in (False, True):
+        _run(args.backend, intern, args.decisions, args.context_kb)
+
+
+if __name__ == "__main__":
+    main()
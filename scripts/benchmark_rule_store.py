@@ -0,0 +1,106 @@
+"""Benchmark Rule Engine store persistence for a large rule import.
+
+Imports N rules into one group through ``RuleStore.add_rule`` (one journal
+record each, or one flush for the whole import with ``--batch``), or with a
+single ``add_rules`` mutation as ``POST .../rules:bulk`` does (``--bulk``),
+and reports the elapsed time, the bytes written, and how long a restart
+takes to reload the store.  ``--legacy`` rewrites the full snapshot after every rule, as the
+store did before it kept a journal; it is only practical for a few thousand
+rules.
+
+Usage:
+    python scripts/benchmark_rule_store.py
+    python scripts/benchmark_rule_store.py --rules 10000 --batch
+    python scripts/benchmark_rule_store.py --rules 10000 --bulk
+    python scripts/benchmark_rule_store.py --rules 2000 --legacy
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rule_engine.models import CreateRule, CreateRuleGroup  # noqa: E402
+from rule_engine.store import RuleStore  # noqa: E402
+
+
+def _rule(i: int) -> CreateRule:
+    return CreateRule(
+        name=f"Refund cap {i}",
+        feature="refunds",
+        datapoints=["amount", "risk_score"],
+        edge_cases=[f"IF risk_score > {50 + i % 50} THEN ASK_FOR_APPROVAL"],
+        edge_cases_json=[{"if": [{">": [{"var": "risk_score"}, 50 + i % 50]}, "ASK_FOR_APPROVAL", None]}],
+        rule_logic=f"IF amount > {1000 + i} THEN REJECT",
+        rule_logic_json={"if": [{">": [{"var": "amount"}, 1000 + i]}, "REJECT", None]},
+    )
+
+
+class _CountingStore(RuleStore):
+    """RuleStore that tallies the bytes it writes (journal and snapshots)."""
+
+    written = 0
+
+    def _flush(self) -> None:
+        self.written += sum(len(record) + 1 for record in self._pending_records)
+        super()._flush()
+
+    def compact(self) -> None:
+        super().compact()
+        if self.persistence_path is not None and self.persistence_path.exists():
+            self.written += self.persistence_path.stat().st_size
+
+
+def _run(rules: int, batch: bool, bulk: bool, legacy: bool, fsync: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rule_engine_store.json"
+        store = _CountingStore(persistence_path=path, fsync=fsync)
+        group = store.create_group(CreateRuleGroup(name="Import"))
+        payloads = [_rule(i) for i in range(rules)]
+
+        start = time.perf_counter()
+        if bulk:
+            store.add_rules(group.id, payloads)
+        elif batch:
+            with store.batch():
+                for payload in payloads:
+                    store.add_rule(group.id, payload)
+        else:
+            for payload in payloads:
+                store.add_rule(group.id, payload)
+                if legacy:
+                    store.compact()
+        elapsed = time.perf_counter() - start
+        on_disk = sum(p.stat().st_size for p in Path(tmp).iterdir())
+
+        start = time.perf_counter()
+        restored = RuleStore(persistence_path=path)
+        reload = time.perf_counter() - start
+        assert len(restored.get_group(group.id).rules) == rules
+
+    mode = "legacy" if legacy else "bulk" if bulk else "batch" if batch else "journal"
+    print(
+        f"{mode:7s} fsync={fsync:6s}  import {elapsed:7.2f} s  written {store.written / 2**20:9.1f} MiB  "
+        f"on disk {on_disk / 2**20:6.1f} MiB  reload {reload:6.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=10_000)
+    parser.add_argument("--batch", action="store_true", help="Import all rules in one RuleStore.batch()")
+    parser.add_argument("--bulk", action="store_true", help="Import all rules with one RuleStore.add_rules()")
+    parser.add_argument("--legacy", action="store_true", help="Rewrite the full snapshot after every rule")
+    parser.add_argument("--fsync", choices=["always", "never"], default="always")
+    args = parser.parse_args()
+    print(f"rules={args.rules}")
+    _run(args.rules, args.batch, args.bulk, args.legacy, args.fsync)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import type {
   AgentRecord,
   AtomicLogEntry,
+  AtomicLogPage,
+  AtomicLogQuery,
   CredentialRecord,
   DatapointDefinition,
   DecisionChain,
@@ -313,10 +315,14 @@ export const saveSchema = async (proposal: Omit<SchemaProposal, 'message'> & { f
   return res.json();
 };
 
-export const fetchAtomicLogs = async (): Promise<AtomicLogEntry[]> => {
-  const res = await fetch(`${DECISION_BASE}/logs/atomic`, { cache: 'no-store' });
+export const fetchAtomicLogPage = async (query: AtomicLogQuery): Promise<AtomicLogPage> => {
+  const params = new URLSearchParams();
+  for (const [key, value] of Object.entries(query)) {
+    if (value !== undefined && value !== null && value !== '') params.set(key, String(value));
+  }
+  const res = await fetch(`${DECISION_BASE}/logs/atomic?${params}`, { cache: 'no-store' });
   if (!res.ok) throw new Error('Failed to fetch decision logs');
-  return res.json();
+  return { items: await res.json(), nextCursor: res.headers.get('X-Next-Cursor') };
 };
 
 export const fetchDecisionChain = async (requestId: string): Promise<DecisionChain> => {
@@ -354,6 +360,8 @@ export interface PendingApproval {
   credential_id?: string | null;
   user_id?: string | null;
   effective_group_id?: string | null;
+  created_at?: string;
+  escalated_at?: string;
 }
 
 export const fetchRuleEngineHealth = async (): Promise<boolean> => {
@@ -386,6 +394,30 @@ export const fetchPendingApprovals = async (): Promise<PendingApproval[]> => {
   return res.json();
 };
 
+export interface DecisionEventHandlers {
+  onAtomicLog?: (entry: AtomicLogEntry) => void;
+  onPendingAdded?: (pending: PendingApproval) => void;
+  onPendingResolved?: (requestId: string) => void;
+  /** Events were missed (overflow or unresumable reconnect); reload state. */
+  onResync?: () => void;
+}
+
+/**
+ * Subscribe to the Decision Center's live event stream. EventSource
+ * reconnects on its own and resumes from the last event id it saw.
+ * Returns a function that closes the stream.
+ */
+export const subscribeDecisionEvents = (handlers: DecisionEventHandlers): (() => void) => {
+  const source = new EventSource(`${DECISION_BASE}/events/stream`);
+  const parse = (event: Event) => JSON.parse((event as MessageEvent<string>).data);
+  source.addEventListener('atomic_log', (event) => handlers.onAtomicLog?.(parse(event)));
+  source.addEventListener('pending_added', (event) => handlers.onPendingAdded?.(parse(event)));
+  source.addEventListener('pending_resolved', (event) => handlers.onPendingResolved?.(parse(event).request_id));
+  source.addEventListener('overflow', () => handlers.onResync?.());
+  source.addEventListener('reset', () => handlers.onResync?.());
+  return () => source.close();
+};
+
 export const submitApprovalDecision = async (
   requestId: string,
   approved: boolean,
@@ -398,3 +430,38 @@ export const submitApprovalDecision = async (
   });
   if (!res.ok) throw new Error('Failed to submit approval decision');
 };
+
+export type AnalyticsRollup = 'outcomes' | 'rules' | 'approvals';
+
+export interface AnalyticsRow {
+  bucket: string | null;
+  group_id?: string | null;
+  agent_id?: string | null;
+  rule_id?: string | null;
+  approver?: string | null;
+  counts: Record<string, number>;
+  total: number;
+}
+
+export const getAnalytics = async (
+  rollup: AnalyticsRollup,
+  params: {
+    by?: string[];
+    granularity?: 'hour' | 'day' | 'total';
+    since?: string;
+    until?: string;
+    group_id?: string;
+    agent_id?: string;
+    rule_id?: string;
+    approver?: string;
+  } = {},
+): Promise<AnalyticsRow[]> => {
+  const query = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (Array.isArray(value)) value.forEach((item) => query.append(key, item));
+    else if (value) query.set(key, value);
+  }
+  const res = await fetch(`${DECISION_BASE}/analytics/${rollup}?${query}`);
+  if (!res.ok) throw new Error('Failed to fetch analytics');
+  return res.json();
+};
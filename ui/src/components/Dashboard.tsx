@@ -9,15 +9,23 @@ import {
   XCircle,
 } from 'lucide-react';
 import {
-  fetchAtomicLogs,
+  fetchAtomicLogPage,
   fetchDecisionCenterHealth,
   fetchGroups,
   fetchPendingApprovals,
   fetchRuleEngineHealth,
+  getAnalytics,
   submitApprovalDecision,
+  subscribeDecisionEvents,
 } from '../api';
 import type { AtomicLogEntry, DecisionState, RuleGroup } from '../types';
-import type { PendingApproval } from '../api';
+import type { AnalyticsRow, PendingApproval } from '../api';
+
+// The dashboard only lists the newest decisions of the last hour; the full
+// log is paged in the Decision Log view.
+const RECENT_LOGS = 10;
+const RECENT_WINDOW_MS = 60 * 60 * 1000;
+const LOG_PAGE_SIZE = 500;
 
 interface DashboardProps {
   onNavigateToDecisionLog: () => void;
@@ -44,6 +52,34 @@ function isToday(ts: string): boolean {
   );
 }
 
+function startOfToday(): Date {
+  const d = new Date();
+  d.setHours(0, 0, 0, 0);
+  return d;
+}
+
+function sumCounts(rows: AnalyticsRow[]): Record<string, number> {
+  const counts: Record<string, number> = {};
+  for (const row of rows) {
+    for (const [decision, count] of Object.entries(row.counts)) {
+      counts[decision] = (counts[decision] ?? 0) + count;
+    }
+  }
+  return counts;
+}
+
+async function fetchRecentLogs(): Promise<AtomicLogEntry[]> {
+  const since = new Date(Date.now() - RECENT_WINDOW_MS).toISOString();
+  let logs: AtomicLogEntry[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await fetchAtomicLogPage({ since, cursor, limit: LOG_PAGE_SIZE });
+    logs = [...logs, ...page.items].slice(-RECENT_LOGS);
+    cursor = page.nextCursor ?? undefined;
+  } while (cursor);
+  return logs;
+}
+
 function DecisionBadge({ decision }: { decision: DecisionState }) {
   if (decision === 'APPROVED')
     return (
@@ -169,35 +205,77 @@ export const Dashboard: React.FC<DashboardProps> = ({ onNavigateToDecisionLog })
   const [decisionCenterOnline, setDecisionCenterOnline] = useState<boolean | null>(null);
   const [groups, setGroups] = useState<RuleGroup[]>([]);
   const [logs, setLogs] = useState<AtomicLogEntry[]>([]);
+  const [outcomes, setOutcomes] = useState<Record<string, number>>({});
+  const [todayCount, setTodayCount] = useState(0);
   const [pending, setPending] = useState<PendingApproval[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [lastRefresh, setLastRefresh] = useState<Date>(new Date());
   const [approvingId, setApprovingId] = useState<string | null>(null);
 
   const load = useCallback(async () => {
-    const [reHealth, dcHealth, groupsData, logsData, pendingData] = await Promise.allSettled([
+    const [reHealth, dcHealth, groupsData, logsData, pendingData, outcomesData, todayData] = await Promise.allSettled([
       fetchRuleEngineHealth(),
       fetchDecisionCenterHealth(),
       fetchGroups(),
-      fetchAtomicLogs(),
+      fetchRecentLogs(),
       fetchPendingApprovals(),
+      // Not by group: a decision for several groups is counted under each.
+      getAnalytics('outcomes', { by: ['agent_id'], granularity: 'total' }),
+      getAnalytics('outcomes', { by: ['agent_id'], granularity: 'total', since: startOfToday().toISOString() }),
     ]);
 
     setRuleEngineOnline(reHealth.status === 'fulfilled' ? reHealth.value : false);
     setDecisionCenterOnline(dcHealth.status === 'fulfilled' ? dcHealth.value : false);
     if (groupsData.status === 'fulfilled') setGroups(groupsData.value);
     if (logsData.status === 'fulfilled') setLogs(logsData.value);
+    if (outcomesData.status === 'fulfilled') setOutcomes(sumCounts(outcomesData.value));
+    if (todayData.status === 'fulfilled') {
+      setTodayCount(Object.values(sumCounts(todayData.value)).reduce((sum, n) => sum + n, 0));
+    }
     setPending(pendingData.status === 'fulfilled' ? pendingData.value : []);
 
     setLastRefresh(new Date());
     setIsLoading(false);
   }, []);
 
+  const refreshStatus = useCallback(async () => {
+    const [reHealth, dcHealth, groupsData] = await Promise.allSettled([
+      fetchRuleEngineHealth(),
+      fetchDecisionCenterHealth(),
+      fetchGroups(),
+    ]);
+
+    setRuleEngineOnline(reHealth.status === 'fulfilled' ? reHealth.value : false);
+    setDecisionCenterOnline(dcHealth.status === 'fulfilled' ? dcHealth.value : false);
+    if (groupsData.status === 'fulfilled') setGroups(groupsData.value);
+    setLastRefresh(new Date());
+  }, []);
+
   useEffect(() => {
     load();
-    const interval = setInterval(load, 30_000);
-    return () => clearInterval(interval);
-  }, [load]);
+    // Logs and the pending queue arrive over the event stream; only service
+    // health and rule groups are still polled.
+    const unsubscribe = subscribeDecisionEvents({
+      onAtomicLog: (entry) => {
+        setLogs((prev) => [...prev, entry].slice(-RECENT_LOGS));
+        setOutcomes((prev) => ({ ...prev, [entry.decision]: (prev[entry.decision] ?? 0) + 1 }));
+        if (isToday(entry.timestamp)) setTodayCount((prev) => prev + 1);
+        setLastRefresh(new Date());
+      },
+      onPendingAdded: (item) => {
+        setPending((prev) => (prev.some((p) => p.request_id === item.request_id) ? prev : [...prev, item]));
+      },
+      onPendingResolved: (requestId) => {
+        setPending((prev) => prev.filter((p) => p.request_id !== requestId));
+      },
+      onResync: load,
+    });
+    const interval = setInterval(refreshStatus, 30_000);
+    return () => {
+      unsubscribe();
+      clearInterval(interval);
+    };
+  }, [load, refreshStatus]);
 
   const handleApprove = async (requestId: string, approved: boolean) => {
     setApprovingId(requestId);
@@ -213,16 +291,15 @@ export const Dashboard: React.FC<DashboardProps> = ({ onNavigateToDecisionLog })
 
   const totalRules = groups.reduce((sum, g) => sum + g.rules.length, 0);
   const activeRules = groups.reduce((sum, g) => sum + g.rules.filter((r) => r.active).length, 0);
-  const todayCount = logs.filter((l) => isToday(l.timestamp)).length;
 
-  const approvedCount = logs.filter((l) => l.decision === 'APPROVED').length;
-  const rejectedCount = logs.filter((l) => l.decision === 'REJECTED').length;
-  const awaitingCount = logs.filter((l) => l.decision === 'APPROVAL_REQUIRED').length;
-  const total = approvedCount + rejectedCount + awaitingCount || 1;
+  const approvedCount = outcomes.APPROVED ?? 0;
+  const rejectedCount = outcomes.REJECTED ?? 0;
+  const awaitingCount = outcomes.APPROVAL_REQUIRED ?? 0;
+  const decisionCount = approvedCount + rejectedCount + awaitingCount;
+  const total = decisionCount || 1;
 
   const recentLogs = [...logs]
-    .sort((a, b) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime())
-    .slice(0, 10);
+    .sort((a, b) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime());
 
   if (isLoading) {
     return (
@@ -307,7 +384,7 @@ export const Dashboard: React.FC<DashboardProps> = ({ onNavigateToDecisionLog })
             <h2 className="mb-4 text-sm font-semibold text-gray-700 dark:text-gray-300">
               Decision Outcomes
             </h2>
-            {logs.length === 0 ? (
+            {decisionCount === 0 ? (
               <p className="py-4 text-center text-sm text-gray-400">No decisions recorded yet.</p>
             ) : (
               <div className="space-y-4">
@@ -409,7 +486,7 @@ export const Dashboard: React.FC<DashboardProps> = ({ onNavigateToDecisionLog })
 
           {recentLogs.length === 0 ? (
             <div className="px-5 py-8 text-center text-sm text-gray-400">
-              No decisions recorded yet.
+              No decisions in the last hour.
             </div>
           ) : (
             <>
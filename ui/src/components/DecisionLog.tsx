@@ -1,8 +1,10 @@
 import { useCallback, useEffect, useRef, useState } from 'react';
 import { ChevronDown, ChevronRight, Download, RefreshCw, ScrollText } from 'lucide-react';
-import { downloadDecisionLog, fetchAtomicLogs, fetchDecisionChain } from '../api';
+import { downloadDecisionLog, fetchAtomicLogPage, fetchDecisionChain } from '../api';
 import type { AtomicLogEntry, DecisionChain, DecisionState } from '../types';
 
+const PAGE_SIZE = 100;
+
 const DECISION_COLORS: Record<DecisionState, { badge: string; dot: string }> = {
   APPROVED: {
     badge: 'bg-emerald-100 text-emerald-700 dark:bg-emerald-900/30 dark:text-emerald-300',
@@ -32,6 +34,7 @@ function truncateId(id: string) {
 
 export function DecisionLog() {
   const [logs, setLogs] = useState<AtomicLogEntry[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [expandedId, setExpandedId] = useState<string | null>(null);
@@ -44,14 +47,13 @@ export function DecisionLog() {
     expandedIdRef.current = expandedId;
   }, [expandedId]);
 
-  const refresh = useCallback(async () => {
+  const loadPage = useCallback(async (cursor?: string) => {
     setIsLoading(true);
     setError(null);
     try {
-      const data = await fetchAtomicLogs();
-      setLogs(data.slice().sort((a, b) =>
-        new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime()
-      ));
+      const page = await fetchAtomicLogPage({ cursor, limit: PAGE_SIZE });
+      setLogs((prev) => (cursor ? [...prev, ...page.items] : page.items));
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load logs');
     } finally {
@@ -59,6 +61,8 @@ export function DecisionLog() {
     }
   }, []);
 
+  const refresh = useCallback(() => loadPage(), [loadPage]);
+
   useEffect(() => {
     refresh();
   }, [refresh]);
@@ -139,7 +143,7 @@ export function DecisionLog() {
         </div>
       </div>
       <p className="text-sm text-gray-500 dark:text-gray-400">
-        Audit trail of all evaluated decisions. Click an entry to view its full event chain.
+        Audit trail of all evaluated decisions, oldest first. Click an entry to view its full event chain.
       </p>
 
       {error && (
@@ -239,6 +243,18 @@ export function DecisionLog() {
           );
         })}
       </div>
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={() => loadPage(nextCursor)}
+            disabled={isLoading}
+            className="inline-flex items-center gap-2 rounded-lg border border-gray-300 px-3 py-1.5 text-sm font-medium text-gray-700 transition-colors hover:bg-gray-100 disabled:opacity-50 dark:border-gray-700 dark:text-gray-200 dark:hover:bg-gray-800"
+          >
+            Load more
+          </button>
+        </div>
+      )}
     </section>
   );
 }
@@ -136,6 +136,22 @@ export interface AtomicLogEntry {
   effective_group_id?: string | null;
 }
 
+export interface AtomicLogQuery {
+  limit?: number;
+  cursor?: string;
+  agent_id?: string;
+  user_id?: string;
+  effective_group_id?: string;
+  decision?: DecisionState;
+  since?: string;
+  until?: string;
+}
+
+export interface AtomicLogPage {
+  items: AtomicLogEntry[];
+  nextCursor: string | null;
+}
+
 export interface ChainEvent {
   timestamp: string;
   event_type: string;